@@ -0,0 +1,86 @@
+"""
+JWT authentication that trusts the authorization claims in the access token.
+
+Tokens issued by ``ClaimsRefreshToken`` carry ``role``, ``is_staff`` and
+``is_active``. For those, ``request.user`` is a ``User`` built from the claims
+without a query; any other field is loaded from the database on first access.
+
+The claims are only trusted while they can't be stale. Saving or deleting a
+user records the time in the cache (see ``accounts.signals``), and tokens
+issued before that fall back to a database lookup, itself cached for
+``AUTH_USER_CACHE_TIMEOUT`` seconds. Tokens without the claims always use
+the lookup. Across processes this relies on a shared cache (``REDIS_URL``);
+with the per-process default, another worker can keep trusting old claims
+until the access token expires.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+from .tokens import CLAIM_FIELDS
+
+CHANGED_KEY = 'auth:user-changed:{}'
+USER_KEY = 'auth:user:{}'
+
+
+def mark_user_changed(user_id):
+    """Stop trusting claims issued to ``user_id`` before now."""
+    timeout = int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+    cache.set(CHANGED_KEY.format(user_id), time.time(), timeout)
+    cache.delete(USER_KEY.format(user_id))
+
+
+def claims_are_current(user_id, token):
+    changed_at = cache.get(CHANGED_KEY.format(user_id))
+    return changed_at is None or token.get('iat', 0) > changed_at
+
+
+def load_claims(user_id):
+    """The user's claim fields from the database, cached briefly; None if gone."""
+    key = USER_KEY.format(user_id)
+    claims = cache.get(key)
+    if claims is None:
+        row = User.objects.filter(pk=user_id).values(*CLAIM_FIELDS).first()
+        if row is None:
+            return None
+        claims = tuple(row[field] for field in CLAIM_FIELDS)
+        cache.set(key, claims, settings.AUTH_USER_CACHE_TIMEOUT)
+    return dict(zip(CLAIM_FIELDS, claims))
+
+
+def claims_user(user_id, claims):
+    """
+    A persisted-looking ``User`` holding only the pk and claim fields. Other
+    fields are deferred, so reading them (or saving) behaves like a ``.only()``
+    instance.
+    """
+    values = {'id': user_id, **claims}
+    # from_db() expects the loaded values in model field order.
+    field_names = [f.attname for f in User._meta.concrete_fields if f.attname in values]
+    return User.from_db('default', field_names, [values[name] for name in field_names])
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        has_claims = all(field in validated_token for field in CLAIM_FIELDS)
+        if has_claims and claims_are_current(user_id, validated_token):
+            claims = {field: validated_token[field] for field in CLAIM_FIELDS}
+        else:
+            claims = load_claims(user_id)
+            if claims is None:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        if not claims['is_active']:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return claims_user(user_id, claims)
@@ -0,0 +1,157 @@
+"""
+Refresh-token revocation.
+
+Revoked tokens are stored in ``RevokedToken`` (unique on ``jti``, indexed on
+``expires_at`` for pruning). Every refresh has to check that table, so each
+process keeps a Bloom filter of the revoked ``jti`` values in front of it:
+a token the filter has never seen can't be revoked and skips the query, and
+only filter hits (real revocations plus ~``AUTH_BLACKLIST_ERROR_RATE`` false
+positives) go to the database.
+
+The filter is loaded from the table on first use, topped up with rows
+revoked since the last sync, and rebuilt from the unexpired rows every
+``REBUILD_INTERVAL`` so pruned tokens drop out of it. A revocation in this
+process is added immediately. Others are picked up when the shared
+generation counter in the cache moves (immediately with a shared cache) or
+at the latest after ``AUTH_BLACKLIST_SYNC_INTERVAL`` seconds.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import RevokedToken
+
+GENERATION_KEY = 'auth:revoked:generation'
+
+REBUILD_INTERVAL = 3600
+
+# Incremental syncs re-read rows revoked this long before the previous sync,
+# so revocations committed late by a slow transaction aren't missed.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class BloomFilter:
+    """A fixed-size Bloom filter over strings using double hashing."""
+
+    def __init__(self, capacity, error_rate):
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+class RevocationList:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.filter = None
+        self.generation = None
+        self.synced_at = None
+        self.checked_at = 0.0
+        self.built_at = 0.0
+
+    def _rebuild(self):
+        now = timezone.now()
+        jtis = list(
+            RevokedToken.objects.filter(expires_at__gt=now).values_list('jti', flat=True).iterator()
+        )
+        bloom = BloomFilter(
+            max(settings.AUTH_BLACKLIST_CAPACITY, 2 * len(jtis)),
+            settings.AUTH_BLACKLIST_ERROR_RATE,
+        )
+        for jti in jtis:
+            bloom.add(jti)
+        self.filter = bloom
+        self.synced_at = now
+        self.built_at = time.monotonic()
+
+    def _top_up(self):
+        now = timezone.now()
+        new = RevokedToken.objects.filter(
+            revoked_at__gte=self.synced_at - SYNC_OVERLAP
+        ).values_list('jti', flat=True)
+        for jti in new.iterator():
+            self.filter.add(jti)
+        self.synced_at = now
+
+    def sync(self, force=False):
+        """Bring the filter up to date if it may be missing revocations."""
+        monotonic = time.monotonic()
+        generation = cache.get(GENERATION_KEY)
+        if not force and self.filter is not None and generation == self.generation and (
+            monotonic - self.checked_at < settings.AUTH_BLACKLIST_SYNC_INTERVAL
+        ):
+            return
+        with self._lock:
+            if self.filter is None or monotonic - self.built_at >= REBUILD_INTERVAL:
+                self._rebuild()
+            else:
+                self._top_up()
+            self.generation = generation
+            self.checked_at = monotonic
+
+    def add(self, jti):
+        with self._lock:
+            if self.filter is not None:
+                self.filter.add(jti)
+
+    def reset(self):
+        with self._lock:
+            self.filter = None
+
+
+revocations = RevocationList()
+
+
+def is_revoked(jti):
+    revocations.sync()
+    if jti not in revocations.filter:
+        return False
+    return RevokedToken.objects.filter(jti=jti).exists()
+
+
+def revoke(jti, expires_at):
+    RevokedToken.objects.bulk_create(
+        [RevokedToken(jti=jti, expires_at=expires_at)], ignore_conflicts=True
+    )
+    revocations.add(jti)
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, 1, None)
+
+
+def prune(batch_size=5000, now=None):
+    """Delete expired revocations in batches; returns the number deleted."""
+    now = now or timezone.now()
+    deleted = 0
+    while True:
+        batch = list(
+            RevokedToken.objects.filter(expires_at__lte=now)
+            .order_by('expires_at')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch:
+            return deleted
+        deleted += RevokedToken.objects.filter(pk__in=batch).delete()[0]
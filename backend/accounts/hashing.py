@@ -0,0 +1,62 @@
+"""
+Bounded pool for password hashing.
+
+Hashing a password (PBKDF2 with several hundred thousand iterations) is the
+most CPU-expensive thing the service does, and every login, registration and
+password change does it. Running it on the request thread lets a burst of
+logins occupy every worker. Instead, ``PooledPBKDF2PasswordHasher`` hands
+each hash to a small thread pool (``AUTH_HASHING_WORKERS`` threads) with at
+most ``AUTH_HASHING_QUEUE_DEPTH`` hashes waiting. When both are full the
+request fails straight away with a 503 and ``Retry-After`` instead of
+queueing behind the burst.
+
+Only the hash computation runs in the pool; database access stays on the
+request thread.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many sign-in attempts are being processed. Try again shortly.'
+    default_code = 'hashing_busy'
+    # Picked up by DRF's exception handler as the Retry-After header.
+    wait = 1
+
+
+class HashingPool:
+    def __init__(self, workers, queue_depth):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hashing')
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+
+    def run(self, func, *args):
+        """Run ``func(*args)`` on the pool and wait for it; raise HashingBusy if full."""
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the hash finishes, even if the caller gives up.
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+
+pool = HashingPool(settings.AUTH_HASHING_WORKERS, settings.AUTH_HASHING_QUEUE_DEPTH)
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    Django's default hasher, computed on ``pool``. ``verify()`` and
+    ``harden_runtime()`` both go through ``encode()``, so every hash does.
+    """
+
+    def encode(self, password, salt, iterations=None):
+        return pool.run(super().encode, password, salt, iterations)
@@ -0,0 +1,113 @@
+import math
+import statistics
+import time
+import tracemalloc
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts import blacklist
+from accounts.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark refresh-token revocation checks against a table of "
+        "synthetic revoked tokens. All rows are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--revoked', type=int, default=2_000_000)
+        parser.add_argument('--expired-share', type=float, default=0.5)
+        parser.add_argument('--lookups', type=int, default=20_000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            revoked = self.populate(options)
+            self.compare(revoked, options)
+            self.prune(options)
+            transaction.set_rollback(True)
+        blacklist.revocations.reset()
+
+    def populate(self, options):
+        started = time.perf_counter()
+        now = timezone.now()
+        total = options['revoked']
+        expired = int(total * options['expired_share'])
+        jtis = []
+        for start in range(0, total, options['batch_size']):
+            rows = []
+            for i in range(start, min(total, start + options['batch_size'])):
+                jti = uuid.uuid4().hex
+                offset = -timedelta(hours=1) if i < expired else timedelta(days=1)
+                rows.append(RevokedToken(jti=jti, expires_at=now + offset))
+                if i >= expired:
+                    jtis.append(jti)
+            RevokedToken.objects.bulk_create(rows)
+        self.stdout.write(
+            f"Inserted {total} revoked tokens ({expired} expired) "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+        return jtis
+
+    def compare(self, revoked, options):
+        started = time.perf_counter()
+        blacklist.revocations.reset()
+        blacklist.revocations.sync()
+        elapsed = time.perf_counter() - started
+
+        # Measured on a second build: tracing slows the first one down a lot.
+        tracemalloc.start()
+        blacklist.revocations.reset()
+        blacklist.revocations.sync()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        bloom = blacklist.revocations.filter
+        self.stdout.write(
+            f"Built filter in {elapsed:.1f}s: "
+            f"{len(bloom.bits) / 2 ** 20:.1f} MiB, {bloom.hashes} hashes, "
+            f"peak {peak / 2 ** 20:.1f} MiB while loading"
+        )
+
+        fresh = [uuid.uuid4().hex for _ in range(options['lookups'])]
+        hits = revoked[:options['lookups']]
+
+        false_positives = sum(jti in bloom for jti in fresh)
+        self.stdout.write(
+            f"False positives: {false_positives}/{len(fresh)} "
+            f"({false_positives / len(fresh):.4%})"
+        )
+        if not all(jti in bloom for jti in hits):
+            self.stderr.write("Filter is missing revoked tokens!")
+
+        def db_check(jti):
+            return RevokedToken.objects.filter(jti=jti).exists()
+
+        rows = [
+            ('db, not revoked', db_check, fresh),
+            ('db, revoked', db_check, hits),
+            ('filter+db, not revoked', blacklist.is_revoked, fresh),
+            ('filter+db, revoked', blacklist.is_revoked, hits),
+        ]
+        for label, check, sample in rows:
+            samples = []
+            for jti in sample:
+                started = time.perf_counter()
+                check(jti)
+                samples.append((time.perf_counter() - started) * 1_000_000)
+            samples.sort()
+            self.stdout.write(
+                f"{label:<24} p50 {statistics.median(samples):8.1f}us "
+                f"p99 {samples[math.ceil(len(samples) * 0.99) - 1]:8.1f}us"
+            )
+
+    def prune(self, options):
+        started = time.perf_counter()
+        deleted = blacklist.prune(batch_size=options['batch_size'])
+        self.stdout.write(
+            f"Pruned {deleted} expired tokens in {time.perf_counter() - started:.1f}s"
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from accounts import blacklist
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete revoked refresh tokens that have expired (they can't be used "
+        "anyway), in batches so the table is never locked for long."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        deleted = blacklist.prune(batch_size=options['batch_size'])
+        self.stdout.write(f"Deleted {deleted} expired revoked tokens.")
@@ -47,3 +47,18 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return f"{self.email} ({self.role})"
+
+
+# --- Revoked refresh tokens ---
+class RevokedToken(models.Model):
+    """
+    A refresh token that can no longer be used, keyed by its ``jti``. Rows are
+    only needed until the token would have expired anyway; see the
+    ``prune_revoked_tokens`` command.
+    """
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.jti
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from .models import User
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
+from .tokens import ClaimsRefreshToken
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
 
@@ -45,10 +46,12 @@ class LogoutSerializer(serializers.Serializer):
 
     def save(self, **kwargs):
         try:
-            token = RefreshToken(self.token)
+            token = ClaimsRefreshToken(self.token)
             token.blacklist()
         except Exception:
             raise serializers.ValidationError("Invalid or expired token")
 
 
-
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """Refuses revoked refresh tokens."""
+    token_class = ClaimsRefreshToken
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import mark_user_changed
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_token_claims(sender, instance, created=False, **kwargs):
+    if not created:
+        mark_user_changed(instance.pk)
@@ -1,3 +1,210 @@
+import io
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import blacklist, hashing
+from .models import RevokedToken, User
+from .tokens import ClaimsRefreshToken
+
+USER_TABLE = User._meta.db_table
+REVOKED_TABLE = RevokedToken._meta.db_table
+
+
+class ClaimsAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(
+            email='acme@example.com', password='pass12345', full_name='Acme Corp'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post(
+            '/api/login/', {'email': 'acme@example.com', 'password': 'pass12345'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def user_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, [q['sql'] for q in queries if f'"{USER_TABLE}"' in q['sql']]
+
+    def test_claims_skip_user_lookup(self):
+        self.login()
+        response, queries = self.user_queries('/api/company/jobs/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+
+    def test_user_change_falls_back_to_cached_lookup(self):
+        self.login()
+        User.objects.filter(pk=self.company.pk).update(role='admin', is_staff=True)
+        self.company.refresh_from_db()
+        self.company.save()
+
+        response, queries = self.user_queries('/api/admin/jobs/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+        response, queries = self.user_queries('/api/admin/jobs/')
+        self.assertEqual(queries, [])
+
+    def test_deactivated_user_is_rejected(self):
+        self.login()
+        self.company.is_active = False
+        self.company.save()
+        self.assertEqual(self.client.get('/api/company/jobs/').status_code, 401)
+
+    def test_token_without_claims_uses_database(self):
+        token = RefreshToken.for_user(self.company).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response, queries = self.user_queries('/api/company/jobs/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+
+    def test_profile_reads_full_user(self):
+        self.login()
+        response = self.client.get('/api/profile/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['full_name'], 'Acme Corp')
+        self.assertEqual(response.data['email'], 'acme@example.com')
+
+
+class TokenRevocationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(
+            email='acme@example.com', password='pass12345', full_name='Acme Corp'
+        )
+
+    def setUp(self):
+        cache.clear()
+        blacklist.revocations.reset()
+        self.client = APIClient()
+        response = self.client.post(
+            '/api/login/', {'email': 'acme@example.com', 'password': 'pass12345'}
+        )
+        self.refresh = response.data['refresh']
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def refresh_status(self):
+        return self.client.post('/api/token/refresh/', {'refresh': self.refresh}).status_code
+
+    def test_logout_revokes_refresh_token(self):
+        self.assertEqual(self.refresh_status(), 200)
+        response = self.client.post('/api/logout/', {'refresh': self.refresh})
+        self.assertEqual(response.status_code, 205)
+        self.assertTrue(RevokedToken.objects.exists())
+        self.assertEqual(self.refresh_status(), 401)
+        self.assertEqual(self.client.post('/api/logout/', {'refresh': self.refresh}).status_code, 400)
+
+    def test_unrevoked_refresh_skips_database(self):
+        blacklist.revoke('some-other-jti', timezone.now() + timedelta(days=1))
+        self.assertEqual(self.refresh_status(), 200)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.refresh_status(), 200)
+        self.assertFalse([q for q in queries if REVOKED_TABLE in q['sql']])
+
+    def test_revocations_from_other_processes_are_picked_up(self):
+        self.assertEqual(self.refresh_status(), 200)
+        jti = ClaimsRefreshToken(self.refresh)['jti']
+        # As another process would: write the row and bump the generation.
+        RevokedToken.objects.create(jti=jti, expires_at=timezone.now() + timedelta(days=1))
+        cache.set(blacklist.GENERATION_KEY, 99)
+        self.assertEqual(self.refresh_status(), 401)
+
+    def test_prune_deletes_only_expired(self):
+        now = timezone.now()
+        RevokedToken.objects.create(jti='expired', expires_at=now - timedelta(minutes=1))
+        RevokedToken.objects.create(jti='live', expires_at=now + timedelta(days=1))
+        call_command('prune_revoked_tokens', batch_size=1, stdout=io.StringIO())
+        self.assertEqual(list(RevokedToken.objects.values_list('jti', flat=True)), ['live'])
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = blacklist.BloomFilter(1000, 0.01)
+        values = [f'jti-{i}' for i in range(1000)]
+        for value in values:
+            bloom.add(value)
+        self.assertTrue(all(value in bloom for value in values))
+        misses = sum(f'other-{i}' in bloom for i in range(1000))
+        self.assertLess(misses, 50)
+
+
+class PasswordHashingPoolTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(
+            email='acme@example.com', password='pass12345', full_name='Acme Corp'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def login(self, email='acme@example.com', password='pass12345', **extra):
+        return self.client.post('/api/login/', {'email': email, 'password': password}, **extra)
+
+    def saturated_pool(self):
+        pool = hashing.HashingPool(workers=1, queue_depth=0)
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        worker = threading.Thread(target=pool.run, args=(block,))
+        worker.start()
+        started.wait(5)
+        self.addCleanup(worker.join)
+        self.addCleanup(release.set)
+        return pool
+
+    def test_full_pool_fails_fast(self):
+        pool = self.saturated_pool()
+        with self.assertRaises(hashing.HashingBusy):
+            pool.run(lambda: None)
+
+    def test_login_returns_503_when_pool_is_full(self):
+        with mock.patch.object(hashing, 'pool', self.saturated_pool()):
+            response = self.login()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(self.login().status_code, 200)
+
+    def test_login_hashes_on_pool(self):
+        with mock.patch.object(hashing.pool, 'run', wraps=hashing.pool.run) as run:
+            self.assertEqual(self.login().status_code, 200)
+            self.assertEqual(self.login(email='nobody@example.com').status_code, 400)
+        # One verification each; unknown emails still hash to hide whether they exist.
+        self.assertEqual(run.call_count, 2)
+
+    def fail_logins(self, count, **kwargs):
+        # Skip the real hashing: only the throttle counts matter here.
+        with mock.patch.object(hashing.pool, 'run', return_value='!'):
+            for i in range(count):
+                params = {key: value.format(i) for key, value in kwargs.items()}
+                self.assertEqual(self.login(**params).status_code, 400)
+
+    def test_email_throttle_rejects_before_hashing(self):
+        self.fail_logins(10, password='wrong', REMOTE_ADDR='10.0.0.{}')
+        with mock.patch.object(hashing.pool, 'run') as run:
+            response = self.login(email='ACME@example.com', REMOTE_ADDR='10.0.1.1')
+        self.assertEqual(response.status_code, 429)
+        run.assert_not_called()
 
-# Create your tests here.
+    def test_ip_throttle(self):
+        self.fail_logins(30, email='user{}@example.com')
+        self.assertEqual(self.login().status_code, 429)
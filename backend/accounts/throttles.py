@@ -0,0 +1,27 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+from .models import User
+
+
+class LoginIPRateThrottle(SimpleRateThrottle):
+    """Sign-in attempts per client IP."""
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginEmailRateThrottle(SimpleRateThrottle):
+    """Sign-in attempts per account, whichever IPs they come from."""
+    scope = 'login_email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        ident = User.objects.normalize_email(email.strip()).lower()
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class RegisterIPRateThrottle(LoginIPRateThrottle):
+    scope = 'register_ip'
@@ -0,0 +1,36 @@
+"""
+JWTs that carry the user's authorization attributes.
+
+``role``, ``is_staff`` and ``is_active`` are copied into the refresh token and
+from there into every access token minted from it, so that
+``ClaimsJWTAuthentication`` can authorize requests without loading the user.
+
+Refresh tokens can be revoked (``blacklist()``); a revoked token fails
+verification, so it can no longer be refreshed.
+"""
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from . import blacklist
+
+CLAIM_FIELDS = ('role', 'is_staff', 'is_active')
+
+
+class ClaimsRefreshToken(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for field in CLAIM_FIELDS:
+            token[field] = getattr(user, field)
+        return token
+
+    def verify(self):
+        super().verify()
+        if blacklist.is_revoked(self[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        blacklist.revoke(self[api_settings.JTI_CLAIM], datetime_from_epoch(self['exp']))
@@ -30,9 +30,13 @@
 #             }
 #         })
 from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from core import metrics
 from .serializers import RegisterSerializer, LoginSerializer, UserProfileSerializer
+from .models import User
+from .throttles import LoginEmailRateThrottle, LoginIPRateThrottle, RegisterIPRateThrottle
+from .tokens import ClaimsRefreshToken
 
 # Permissions
 class IsAdmin(permissions.BasePermission):
@@ -47,16 +51,23 @@ class IsCompany(permissions.BasePermission):
 class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [RegisterIPRateThrottle]
 
 class LoginView(generics.GenericAPIView):
     serializer_class = LoginSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [LoginIPRateThrottle, LoginEmailRateThrottle]
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except ValidationError:
+            metrics.logins.inc(outcome='failure')
+            raise
+        metrics.logins.inc(outcome='success')
         user = serializer.validated_data
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         return Response({
             'refresh': str(refresh),
             'access': str(refresh.access_token),
@@ -73,7 +84,8 @@ class ProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        # request.user only holds the token claims; load the full row.
+        return User.objects.get(pk=self.request.user.pk)
 
 
 # accounts/views.py
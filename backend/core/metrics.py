@@ -0,0 +1,309 @@
+"""
+Application metrics in the Prometheus text format.
+
+``MetricsMiddleware`` records a request counter (by view, method and status)
+and a latency histogram (by view and method) for every request; the business
+counters below are incremented by the views. ``/metrics/`` renders them all
+for scrapers sending ``Authorization: Bearer <METRICS_TOKEN>``; with no
+token configured it answers 403.
+
+Samples live in a store chosen by ``METRICS_DIR``:
+
+* unset: a dict in this process. Fine for ``runserver`` and a single worker,
+  but each gunicorn worker would report only its own share;
+* a directory: every process owns one memory-mapped file in it and updates
+  its samples in place, without locks shared between processes. ``/metrics/``
+  reads and sums all the files, so any worker can answer the scrape. Empty
+  the directory before starting the server so samples from an earlier run
+  aren't added in; files of workers that exit are kept, so counters never
+  go backwards.
+"""
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Any other request method is recorded as "other": clients pick the method,
+# so it mustn't add series.
+METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+
+
+class MemoryStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, key, amount):
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            return dict(self._values)
+
+    def clear(self):
+        with self._lock:
+            self._values = {}
+
+
+class FileStore:
+    """
+    One file per process. Layout: an 8-byte header holding the number of
+    bytes in use, then entries of ``<key length: uint32><key><padding>
+    <value: float64>`` with the value 8-byte aligned. New entries are written
+    before the header is bumped, so readers never see half an entry.
+    """
+    INITIAL_SIZE = 64 * 1024
+    HEADER = struct.Struct('<Q')
+    KEY_LENGTH = struct.Struct('<I')
+    VALUE = struct.Struct('<d')
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def _open(self):
+        # Forked workers inherit the parent's state; each gets its own file.
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f'metrics_{pid}.db')
+        self._file = open(path, 'a+b')
+        size = max(os.fstat(self._file.fileno()).st_size, self.INITIAL_SIZE)
+        self._map(size)
+        self._used = self.HEADER.unpack_from(self._mmap, 0)[0] or self.HEADER.size
+        self._positions = {
+            key: position for key, position, _ in self._entries(self._mmap, self._used)
+        }
+        self._pid = pid
+
+    def _map(self, size):
+        self._file.truncate(size)
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+
+    @classmethod
+    def _entries(cls, data, used):
+        offset = cls.HEADER.size
+        while offset < used:
+            length = cls.KEY_LENGTH.unpack_from(data, offset)[0]
+            key = bytes(data[offset + 4:offset + 4 + length]).decode()
+            position = cls._value_position(offset, length)
+            yield key, position, cls.VALUE.unpack_from(data, position)[0]
+            offset = position + cls.VALUE.size
+
+    @staticmethod
+    def _value_position(offset, key_length):
+        end = offset + 4 + key_length
+        return end + (-end % 8)
+
+    def _append(self, key):
+        encoded = key.encode()
+        position = self._value_position(self._used, len(encoded))
+        end = position + self.VALUE.size
+        if end > len(self._mmap):
+            size = max(2 * len(self._mmap), end)
+            self._mmap.close()
+            self._map(size)
+        self.KEY_LENGTH.pack_into(self._mmap, self._used, len(encoded))
+        self._mmap[self._used + 4:self._used + 4 + len(encoded)] = encoded
+        self.VALUE.pack_into(self._mmap, position, 0.0)
+        self._used = end
+        self.HEADER.pack_into(self._mmap, 0, end)
+        self._positions[key] = position
+        return position
+
+    def inc(self, key, amount):
+        with self._lock:
+            self._open()
+            position = self._positions.get(key)
+            if position is None:
+                position = self._append(key)
+            value = self.VALUE.unpack_from(self._mmap, position)[0]
+            self.VALUE.pack_into(self._mmap, position, value + amount)
+
+    def samples(self):
+        totals = {}
+        for path in glob.glob(os.path.join(self.directory, 'metrics_*.db')):
+            with open(path, 'rb') as f:
+                data = f.read()
+            if len(data) < self.HEADER.size:
+                continue
+            used = self.HEADER.unpack_from(data, 0)[0]
+            for key, _, value in self._entries(data, used):
+                totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+    def clear(self):
+        with self._lock:
+            for path in glob.glob(os.path.join(self.directory, 'metrics_*.db')):
+                os.remove(path)
+            self._pid = None
+
+
+store = FileStore(settings.METRICS_DIR) if settings.METRICS_DIR else MemoryStore()
+
+registry = []
+
+
+def _key(name, labels):
+    return json.dumps([name, sorted(labels.items())])
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        registry.append(self)
+
+    def _labels(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} takes labels {self.labelnames}, got {tuple(labels)}.')
+        return {name: str(value) for name, value in labels.items()}
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        store.inc(_key(self.name, self._labels(labels)), amount)
+
+
+class Histogram(Metric):
+    """Bucket counts are stored per bucket and made cumulative when rendered."""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        labels = self._labels(labels)
+        bucket = next((bound for bound in self.buckets if value <= bound), '+Inf')
+        store.inc(_key(f'{self.name}_bucket', {**labels, 'le': str(bucket)}), 1)
+        store.inc(_key(f'{self.name}_sum', labels), value)
+        store.inc(_key(f'{self.name}_count', labels), 1)
+
+
+http_requests = Counter(
+    'http_requests_total', 'HTTP requests by view, method and status.',
+    ['view', 'method', 'status'],
+)
+http_request_duration = Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by view and method.',
+    ['view', 'method'],
+)
+jobs_created = Counter('jobs_created_total', 'Jobs posted by companies.')
+jobs_moderated = Counter(
+    'jobs_moderated_total', 'Jobs approved or rejected by admins.', ['action'],
+)
+logins = Counter('logins_total', 'Login attempts by outcome.', ['outcome'])
+
+
+def _escape(value):
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format(name, labels, value):
+    if labels:
+        name += '{' + ','.join(f'{label}="{_escape(v)}"' for label, v in labels) + '}'
+    return f'{name} {float(value)!r}'
+
+
+def render():
+    """Every registered metric in the Prometheus text exposition format."""
+    by_name = {}
+    for key, value in store.samples().items():
+        name, labels = json.loads(key)
+        by_name.setdefault(name, []).append((tuple(map(tuple, labels)), value))
+
+    lines = []
+    for metric in registry:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        if isinstance(metric, Histogram):
+            lines.extend(_render_histogram(metric, by_name))
+            continue
+        samples = sorted(by_name.get(metric.name, []))
+        if not samples and not metric.labelnames:
+            samples = [((), 0.0)]
+        lines.extend(_format(metric.name, labels, value) for labels, value in samples)
+    return '\n'.join(lines) + '\n'
+
+
+def _render_histogram(metric, by_name):
+    counts = {}
+    for labels, value in by_name.get(f'{metric.name}_bucket', []):
+        labels = dict(labels)
+        bound = labels.pop('le')
+        counts.setdefault(tuple(sorted(labels.items())), {})[bound] = value
+    sums = dict(by_name.get(f'{metric.name}_sum', []))
+    totals = dict(by_name.get(f'{metric.name}_count', []))
+
+    for labels in sorted(totals):
+        cumulative = 0.0
+        for bound in [*map(str, metric.buckets), '+Inf']:
+            cumulative += counts.get(labels, {}).get(bound, 0.0)
+            yield _format(f'{metric.name}_bucket', (*labels, ('le', bound)), cumulative)
+        yield _format(f'{metric.name}_sum', labels, sums.get(labels, 0.0))
+        yield _format(f'{metric.name}_count', labels, totals[labels])
+
+
+class MetricsMiddleware:
+    # Async-capable so the async views keep running on the event loop under ASGI.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - start)
+        return response
+
+    def record(self, request, response, elapsed):
+        match = getattr(request, 'resolver_match', None)
+        # Unmatched paths share one label so scanners can't blow up the series count.
+        view = match.view_name if match is not None else '<unmatched>'
+        method = request.method if request.method in METHODS else 'other'
+        http_requests.inc(view=view, method=method, status=response.status_code)
+        http_request_duration.observe(elapsed, view=view, method=method)
+
+
+def metrics_view(request):
+    # Closed until METRICS_TOKEN is set: the metrics expose every route and
+    # its traffic.
+    token = settings.METRICS_TOKEN
+    if not token or not constant_time_compare(
+        request.headers.get('Authorization', ''), f'Bearer {token}'
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
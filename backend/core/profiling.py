@@ -0,0 +1,177 @@
+"""
+Opt-in per-request SQL profiling.
+
+``QueryProfilingMiddleware`` wraps every database connection for the
+duration of a request and records how many queries ran, how long they took,
+and two patterns worth fixing:
+
+* duplicates: the same SQL with the same parameters executed more than once;
+* N+1: the same SQL with different parameters executed at least
+  ``QUERY_PROFILING_REPEAT_THRESHOLD`` times, typically a query per row.
+
+The totals go out in a ``Server-Timing`` header, which browser dev tools
+show next to the request, and each process keeps the slowest requests per
+view in ``slowest`` for the admin endpoint in ``core.views``.
+
+Enable it with ``QUERY_PROFILING=True``. When it is off the middleware
+raises ``MiddlewareNotUsed`` at startup, so Django drops it from the chain
+and requests don't pay for it at all.
+
+Queries run while a streaming response is being consumed happen after the
+middleware has returned and aren't counted.
+"""
+import heapq
+import itertools
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# "IN (%s, %s, %s)" -> "IN (...)", so batches of different sizes count as
+# one pattern.
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+def normalize_sql(sql):
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+class QueryRecorder:
+    """``execute_wrapper`` callable that records every query it sees."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, params, time.perf_counter() - start))
+
+    @property
+    def duration(self):
+        return sum(duration for _, _, duration in self.queries)
+
+    def duplicates(self):
+        """``[(sql, times), ...]`` for statements repeated with identical parameters."""
+        counts = Counter((sql, repr(params)) for sql, params, _ in self.queries)
+        return [(sql, times) for (sql, _), times in counts.most_common() if times > 1]
+
+    def repeated(self, threshold):
+        """``[(sql, times), ...]`` for patterns run ``threshold`` or more times with varying parameters."""
+        executions = {}
+        for sql, params, _ in self.queries:
+            executions.setdefault(normalize_sql(sql), set()).add(repr(params))
+        counts = Counter(normalize_sql(sql) for sql, _, _ in self.queries)
+        return [
+            (sql, times) for sql, times in counts.most_common()
+            if times >= threshold and len(executions[sql]) > 1
+        ]
+
+
+class SlowestRequests:
+    """The ``size`` slowest requests per view seen in the last ``window`` seconds."""
+
+    def __init__(self, size, window):
+        self.size = size
+        self.window = window
+        self._lock = threading.Lock()
+        self._views = {}
+        # Tie-breaker so heapq never compares the record dicts.
+        self._counter = itertools.count()
+
+    def _expire(self, heap, now):
+        fresh = [entry for entry in heap if now - entry[2]['timestamp'] < self.window]
+        if len(fresh) != len(heap):
+            heapq.heapify(fresh)
+        return fresh
+
+    def add(self, view, record):
+        entry = (record['duration_ms'], next(self._counter), record)
+        with self._lock:
+            heap = self._expire(self._views.get(view, []), record['timestamp'])
+            if len(heap) < self.size:
+                heapq.heappush(heap, entry)
+            elif entry[0] > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+            self._views[view] = heap
+
+    def snapshot(self):
+        """``{view: [record, ...]}``, slowest first."""
+        now = time.time()
+        with self._lock:
+            for view in list(self._views):
+                self._views[view] = self._expire(self._views[view], now)
+                if not self._views[view]:
+                    del self._views[view]
+            return {
+                view: [record for _, _, record in sorted(heap, reverse=True)]
+                for view, heap in sorted(self._views.items())
+            }
+
+    def clear(self):
+        with self._lock:
+            self._views = {}
+
+
+slowest = SlowestRequests(settings.QUERY_PROFILING_SLOWEST, settings.QUERY_PROFILING_WINDOW)
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    # The URL name when there is one, else the view's dotted path.
+    return match.view_name if match is not None else '<unresolved>'
+
+
+class QueryProfilingMiddleware:
+    def __init__(self, get_response):
+        if not settings.QUERY_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = settings.QUERY_PROFILING_REPEAT_THRESHOLD
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        duplicates = recorder.duplicates()
+        repeated = recorder.repeated(self.threshold)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={recorder.duration * 1000:.2f};desc="{len(recorder.queries)} queries"',
+            f'db-duplicates;desc="{sum(times - 1 for _, times in duplicates)}"',
+            f'db-n1;desc="{len(repeated)}"',
+            f'total;dur={elapsed * 1000:.2f}',
+        ])
+
+        view = view_name(request)
+        if repeated:
+            logger.warning(
+                'Possible N+1 in %s: %s', view,
+                '; '.join(f'{times}x {sql}' for sql, times in repeated),
+            )
+        slowest.add(view, {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'timestamp': time.time(),
+            'duration_ms': round(elapsed * 1000, 2),
+            'db_ms': round(recorder.duration * 1000, 2),
+            'queries': len(recorder.queries),
+            'duplicates': [{'sql': sql, 'count': times} for sql, times in duplicates],
+            'n_plus_one': [{'sql': sql, 'count': times} for sql, times in repeated],
+        })
+        return response
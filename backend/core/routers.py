@@ -0,0 +1,143 @@
+"""
+Primary/replica database routing.
+
+Writes, and every read by default, go to ``default`` (the primary). Views
+that only read public data opt in to a replica, either with
+``ReplicaReadMixin`` (DRF views) or ``replica_reads(alias)`` (plain and
+async views); ``PrimaryReplicaRouter`` then sends their reads to a replica
+picked at random from ``DATABASE_REPLICAS``.
+
+Replicas lag behind the primary, so after a user's write succeeds
+``PinPrimaryAfterWriteMiddleware`` pins that user to the primary for
+``DATABASE_REPLICA_PIN_SECONDS``: a company always sees the job it has just
+created. Pins are kept in the cache, so set ``REDIS_URL`` when running
+several workers.
+
+With no replicas configured everything reads from the primary and the pin
+middleware removes itself at startup.
+"""
+import contextvars
+import random
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+
+PIN_KEY = 'db:pin:{}'
+
+# The replica alias for reads in the current request, or None for the primary.
+_read_alias = contextvars.ContextVar('read_alias', default=None)
+
+
+def _pin_key(user):
+    return PIN_KEY.format(user.pk)
+
+
+def replica_for(user):
+    """A replica alias for ``user``'s reads, or None if they must use the primary."""
+    if not settings.DATABASE_REPLICAS:
+        return None
+    if user.is_authenticated and cache.get(_pin_key(user)) is not None:
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+async def areplica_for(user):
+    if not settings.DATABASE_REPLICAS:
+        return None
+    if user.is_authenticated and await cache.aget(_pin_key(user)) is not None:
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+def current_read_alias():
+    """The replica reads are routed to right now, or None for the primary."""
+    return _read_alias.get()
+
+
+def pin_to_primary(user):
+    cache.set(_pin_key(user), 1, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+@contextmanager
+def replica_reads(alias):
+    """Route reads inside the block to ``alias`` (None keeps the primary)."""
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema from the primary along with the data.
+        return db == 'default'
+
+
+class ReplicaReadMixin:
+    """
+    Serve a read-only DRF view from a replica. The replica is chosen after
+    authentication, so it can respect the user's pin.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._replica_token = _read_alias.set(replica_for(request.user))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _read_alias.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class PinPrimaryAfterWriteMiddleware:
+    # Async-capable so the async views keep running on the event loop under ASGI.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def wrote(request, response):
+        # DRF copies the authenticated user onto the Django request.
+        user = getattr(request, 'user', None)
+        return (
+            request.method not in ('GET', 'HEAD', 'OPTIONS')
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.wrote(request, response):
+            pin_to_primary(request.user)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.wrote(request, response):
+            await cache.aset(_pin_key(request.user), 1, settings.DATABASE_REPLICA_PIN_SECONDS)
+        return response
@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -72,18 +72,31 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
      "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
-    "PAGE_SIZE": 10
+    "PAGE_SIZE": 10,
+    # Checked before any password is hashed (see accounts.throttles).
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/min',
+        'login_email': '10/min',
+        'register_ip': '20/hour',
+    },
+}
+
+SIMPLE_JWT = {
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.TokenRefreshSerializer',
 }
 
 
 MIDDLEWARE = [
+    "core.metrics.MetricsMiddleware",
+    "core.profiling.QueryProfilingMiddleware",
+    "core.routers.PinPrimaryAfterWriteMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -94,22 +107,6 @@ MIDDLEWARE = [
 ]
 
 
-
-from pathlib import Path
-
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
-
-
-
-
-
 ROOT_URLCONF = "core.urls"
 
 TEMPLATES = [
@@ -141,10 +138,104 @@ DATABASES = {
     }
 }
 
+# Read replicas: comma-separated SQLite files holding copies of db.sqlite3
+# (refresh them with "manage.py sync_replicas"). They are opened read-only
+# and only serve the public read views; see core.routers. In tests they
+# mirror the test database.
+DATABASE_REPLICAS = []
+for _index, _path in enumerate(config('DATABASE_REPLICAS', default='', cast=Csv()), start=1):
+    DATABASES[f"replica{_index}"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": f"file:{BASE_DIR / _path}?mode=ro",
+        "OPTIONS": {"uri": True},
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica{_index}")
+
+DATABASE_ROUTERS = ["core.routers.PrimaryReplicaRouter"]
+
+# Seconds a user's reads stay on the primary after they write, so they see
+# their own changes while the replicas catch up.
+DATABASE_REPLICA_PIN_SECONDS = 10
+
+
+# Cache
+# Local memory per process by default; set REDIS_URL to share the cache (and
+# the public feed version) between gunicorn workers.
+
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Seconds a cached public job feed page is kept; writes invalidate it sooner.
+JOBS_FEED_CACHE_TIMEOUT = 300
+
+# Seconds a job's rendered feed JSON is kept (see jobs.fragments).
+JOBS_FRAGMENT_CACHE_TIMEOUT = 3600
+
+# Process-local LRU of normalized skill name -> Skill id.
+JOBS_SKILL_CACHE_SIZE = 4096
+
+# Longest a process's skill autocomplete index (see jobs.suggest) goes
+# without picking up changes made by other processes.
+JOBS_SKILL_SUGGEST_SYNC_INTERVAL = 5
+
+# Same for the skill-matching index (see jobs.matching).
+JOBS_MATCHING_SYNC_INTERVAL = 5
+
+# Seconds a user's role/is_staff/is_active are cached when token claims
+# can't be trusted (see accounts.authentication).
+AUTH_USER_CACHE_TIMEOUT = 30
+
+# Sizing of the per-process Bloom filter in front of RevokedToken, and the
+# longest a process goes without picking up revocations made elsewhere.
+AUTH_BLACKLIST_CAPACITY = 1_000_000
+AUTH_BLACKLIST_ERROR_RATE = 0.001
+AUTH_BLACKLIST_SYNC_INTERVAL = 5
+
+# Threads that compute password hashes per process, and how many hashes may
+# wait for one before sign-ins are refused with a 503 (see accounts.hashing).
+AUTH_HASHING_WORKERS = 2
+AUTH_HASHING_QUEUE_DEPTH = 8
+
+# Per-request SQL profiling (see core.profiling): Server-Timing headers and
+# the slowest requests per view at /api/admin/profiling/. Off by default.
+QUERY_PROFILING = config('QUERY_PROFILING', default=False, cast=bool)
+QUERY_PROFILING_SLOWEST = 20
+QUERY_PROFILING_WINDOW = 3600
+QUERY_PROFILING_REPEAT_THRESHOLD = 3
+
+# Prometheus metrics at /metrics/ (see core.metrics). Set METRICS_DIR to a
+# directory shared by the gunicorn workers so every scrape sees all of them,
+# and METRICS_TOKEN to the token scrapers send as "Authorization: Bearer
+# <token>"; the endpoint is closed while it is unset.
+METRICS_DIR = config('METRICS_DIR', default='')
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
+PASSWORD_HASHERS = [
+    "accounts.hashing.PooledPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
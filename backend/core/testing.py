@@ -0,0 +1,41 @@
+"""
+Test helpers shared by the apps' test suites.
+"""
+from contextlib import contextmanager
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    ``TestCase`` mixin for asserting how many queries a block of code runs.
+
+    Unlike ``assertNumQueries`` the budget is an upper bound, so adding a
+    cheaper query plan doesn't break the test, but an N+1 regression does::
+
+        with self.assertQueryBudget(3):
+            self.client.get('/api/jobs/')
+    """
+
+    @contextmanager
+    def assertQueryBudget(self, budget, using='default'):
+        with CaptureQueriesContext(connections[using]) as context:
+            yield context
+        executed = len(context.captured_queries)
+        if executed > budget:
+            queries = '\n'.join(
+                f"{index}. {query['sql']}"
+                for index, query in enumerate(context.captured_queries, start=1)
+            )
+            self.fail(
+                f"{executed} queries executed, budget is {budget}.\n"
+                f"Captured queries were:\n{queries}"
+            )
+
+    def assertEndpointQueryBudget(self, budget, url, data=None, method='get'):
+        """Request ``url`` with ``self.client`` and check it stays on budget."""
+        with self.assertQueryBudget(budget):
+            response = getattr(self.client, method)(url, data)
+        self.assertLess(response.status_code, 400, getattr(response, 'data', None))
+        return response
@@ -0,0 +1,272 @@
+import multiprocessing
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from accounts.tokens import ClaimsRefreshToken
+from jobs.models import Job
+from . import metrics, profiling, routers
+
+
+class QueryProfilingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(email='profiled@example.com', password='pass12345')
+        cls.admin = User.objects.create_superuser(email='profiler@example.com', password='pass12345')
+        Job.objects.create(
+            title='Profiled', company=cls.company, job_type='full_time',
+            location='Kochi', status='approved',
+        )
+
+    def setUp(self):
+        profiling.slowest.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_disabled_by_default(self):
+        response = self.client.get('/api/jobs/')
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(profiling.slowest.snapshot(), {})
+
+    @override_settings(QUERY_PROFILING=True)
+    def test_server_timing_and_slowest_requests(self):
+        response = self.client.get('/api/jobs/?location=kochi')
+        metrics = dict(
+            metric.strip().split(';', 1) for metric in response['Server-Timing'].split(',')
+        )
+        self.assertEqual(set(metrics), {'db', 'db-duplicates', 'db-n1', 'total'})
+        self.assertIn('desc="2 queries"', metrics['db'])
+
+        response = self.client.get('/api/admin/profiling/')
+        self.assertTrue(response.data['enabled'])
+        [record] = response.data['views']['jobs.views.PublicJobListView']
+        self.assertEqual(record['path'], '/api/jobs/?location=kochi')
+        self.assertEqual(record['queries'], 2)
+        self.assertEqual(record['n_plus_one'], [])
+
+        self.assertEqual(self.client.delete('/api/admin/profiling/').status_code, 204)
+        self.assertNotIn('jobs.views.PublicJobListView', profiling.slowest.snapshot())
+
+    def test_admin_endpoint_requires_admin(self):
+        self.client.force_authenticate(self.company)
+        self.assertEqual(self.client.get('/api/admin/profiling/').status_code, 403)
+
+    def test_recorder_flags_duplicates_and_n_plus_one(self):
+        recorder = profiling.QueryRecorder()
+        rows = 'SELECT * FROM jobs_job WHERE id = %s'
+        for params in [(1,), (2,), (3,), (3,)]:
+            recorder(lambda *args: None, rows, params, False, {})
+        batch = 'SELECT * FROM jobs_skill WHERE id IN (%s, %s)'
+        recorder(lambda *args: None, batch, (1, 2), False, {})
+        self.assertEqual(recorder.duplicates(), [(rows, 2)])
+        self.assertEqual(recorder.repeated(3), [(rows, 4)])
+        self.assertEqual(recorder.repeated(5), [])
+
+    def test_slowest_keeps_the_slowest_recent_requests_per_view(self):
+        slowest = profiling.SlowestRequests(size=2, window=60)
+        now = time.time()
+        for duration in [5, 1, 9, 3]:
+            slowest.add('list', {'duration_ms': duration, 'timestamp': now})
+        slowest.add('detail', {'duration_ms': 50, 'timestamp': now - 120})
+        snapshot = slowest.snapshot()
+        self.assertEqual([record['duration_ms'] for record in snapshot['list']], [9, 5])
+        self.assertNotIn('detail', snapshot)
+
+
+@override_settings(METRICS_TOKEN='scrape-secret')
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(email='metered@example.com', password='pass12345')
+        cls.admin = User.objects.create_superuser(email='meter@example.com', password='pass12345')
+        cls.job = Job.objects.create(
+            title='Metered', company=cls.company, job_type='full_time', location='Kochi',
+        )
+
+    def setUp(self):
+        metrics.store.clear()
+        self.client = APIClient()
+
+    def scrape(self):
+        response = self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE)
+        return response.content.decode().splitlines()
+
+    def test_request_counters_and_latency_histogram(self):
+        self.client.get('/api/jobs/')
+        self.client.get('/api/jobs/')
+        self.client.get('/no-such-page/')
+        lines = self.scrape()
+
+        view = 'view="jobs.views.PublicJobListView"'
+        self.assertIn(f'http_requests_total{{method="GET",status="401",{view}}} 2.0', lines)
+        self.assertIn(
+            'http_requests_total{method="GET",status="404",view="<unmatched>"} 1.0', lines
+        )
+        self.assertIn(f'http_request_duration_seconds_count{{method="GET",{view}}} 2.0', lines)
+        self.assertIn(
+            f'http_request_duration_seconds_bucket{{method="GET",{view},le="+Inf"}} 2.0', lines
+        )
+        self.assertIn('# TYPE http_request_duration_seconds histogram', lines)
+        # Counters without labels are exposed before anything happened.
+        self.assertIn('jobs_created_total 0.0', lines)
+
+    def test_business_counters(self):
+        self.client.post('/api/login/', {'email': 'metered@example.com', 'password': 'pass12345'})
+        self.client.post('/api/login/', {'email': 'metered@example.com', 'password': 'wrong'})
+
+        self.client.force_authenticate(self.company)
+        self.client.post('/api/company/jobs/create/', {
+            'title': 'New', 'job_type': 'full_time', 'location': 'Kochi', 'skills': ['Python'],
+        }, format='json')
+        self.client.force_authenticate(self.admin)
+        self.client.patch(f'/api/admin/jobs/{self.job.pk}/verify/', {'action': 'approve'})
+        self.client.force_authenticate(None)
+
+        lines = self.scrape()
+        self.assertIn('logins_total{outcome="success"} 1.0', lines)
+        self.assertIn('logins_total{outcome="failure"} 1.0', lines)
+        self.assertIn('jobs_created_total 1.0', lines)
+        self.assertIn('jobs_moderated_total{action="approve"} 1.0', lines)
+
+    def test_token_required(self):
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+        response = self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 403)
+        with override_settings(METRICS_TOKEN=''):
+            self.assertEqual(self.client.get('/metrics/').status_code, 403)
+            response = self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer ')
+            self.assertEqual(response.status_code, 403)
+
+    def test_unknown_methods_share_a_label(self):
+        for method in ('PROPFIND', 'BREW', 'X-ANYTHING'):
+            self.client.generic(method, '/api/jobs/')
+        lines = self.scrape()
+        view = 'view="jobs.views.PublicJobListView"'
+        self.assertIn(f'http_request_duration_seconds_count{{method="other",{view}}} 3.0', lines)
+        self.assertFalse([line for line in lines if 'BREW' in line])
+
+
+def _increment_in_child(directory, key):
+    metrics.FileStore(directory).inc(key, 2)
+
+
+class FileStoreTests(TestCase):
+    def test_samples_are_summed_across_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = metrics.FileStore(directory)
+            store.inc('shared', 1)
+            child = multiprocessing.get_context('fork').Process(
+                target=_increment_in_child, args=(directory, 'shared')
+            )
+            child.start()
+            child.join()
+            self.assertEqual(child.exitcode, 0)
+            store.inc('shared', 0.5)
+            self.assertEqual(store.samples(), {'shared': 3.5})
+
+    def test_file_grows_and_reopens(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = metrics.FileStore(directory)
+            keys = [f'series-{i}-' + 'x' * 40 for i in range(3000)]
+            for key in keys:
+                store.inc(key, 1)
+            # A fresh instance in the same process picks up the existing file.
+            reopened = metrics.FileStore(directory)
+            reopened.inc(keys[0], 1)
+            samples = reopened.samples()
+            self.assertEqual(len(samples), len(keys))
+            self.assertEqual(samples[keys[0]], 2)
+            self.assertEqual(samples[keys[-1]], 1)
+
+
+# The test settings have no replica databases, so "default" stands in for one:
+# what's checked is the alias the router picks, not where the rows come from.
+@override_settings(DATABASE_REPLICAS=['default'])
+class ReplicaRoutingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(email='replicated@example.com', password='pass12345')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.company)
+        self.reads = []
+        route = routers.PrimaryReplicaRouter.db_for_read
+
+        def spy(router, model, **hints):
+            alias = route(router, model, **hints)
+            self.reads.append((model.__name__, alias))
+            return alias
+
+        patcher = mock.patch.object(routers.PrimaryReplicaRouter, 'db_for_read', spy)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def read_aliases(self, url, **extra):
+        self.reads.clear()
+        self.assertEqual(self.client.get(url, **extra).status_code, 200)
+        return {alias for _, alias in self.reads}
+
+    def test_public_reads_go_to_a_replica(self):
+        self.assertEqual(self.read_aliases('/api/jobs/?q=kochi'), {'default'})
+        self.assertEqual(self.read_aliases('/api/jobs/facets/'), {'default'})
+        self.assertEqual(self.read_aliases('/api/company/jobs/'), {None})
+
+    def test_async_public_reads_go_to_a_replica(self):
+        self.client.force_authenticate(None)
+        token = ClaimsRefreshToken.for_user(self.company).access_token
+        aliases = self.read_aliases('/api/jobs/async/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(aliases, {'default'})
+
+    def test_reads_stick_to_the_primary_after_a_write(self):
+        response = self.client.post('/api/company/jobs/create/', {
+            'title': 'Fresh', 'job_type': 'full_time', 'location': 'Kochi', 'skills': [],
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.read_aliases('/api/jobs/'), {None})
+
+        # Other users aren't affected, and the pin expires. (Distinct queries
+        # keep the feed cache out of the way.)
+        other = User.objects.create_user(email='bystander@example.com', password='pass12345')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.read_aliases('/api/jobs/?location=kochi'), {'default'})
+        cache.delete(routers.PIN_KEY.format(self.company.pk))
+        self.client.force_authenticate(self.company)
+        self.assertEqual(self.read_aliases('/api/jobs/?location=pune'), {'default'})
+
+    def test_pages_read_from_a_replica_are_cached_apart(self):
+        self.assertEqual(self.client.get('/api/jobs/?q=kochi')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/jobs/?q=kochi')['X-Cache'], 'HIT')
+
+        # A replica may not have the job yet when the version is bumped, so
+        # the pinned admin doesn't get the page a user cached from one.
+        job = Job.objects.create(
+            title='Fresh', company=self.company, job_type='full_time', location='Kochi',
+            status='pending',
+        )
+        admin = User.objects.create_superuser(email='approver@example.com', password='pass12345')
+        self.client.force_authenticate(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/admin/jobs/{job.pk}/verify/', {'action': 'approve'})
+        self.client.force_authenticate(self.company)
+        self.assertEqual(self.client.get('/api/jobs/?q=kochi')['X-Cache'], 'MISS')
+        self.client.force_authenticate(admin)
+        self.assertEqual(self.client.get('/api/jobs/?q=kochi')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/jobs/?q=kochi')['X-Cache'], 'HIT')
+
+    def test_failed_writes_do_not_pin(self):
+        response = self.client.post('/api/company/jobs/create/', {}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.read_aliases('/api/jobs/'), {'default'})
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_reads_from_the_primary(self):
+        self.assertEqual(self.read_aliases('/api/jobs/'), {None})
@@ -22,6 +22,9 @@ from drf_spectacular.views import (
     SpectacularRedocView
 )
 
+from .metrics import metrics_view
+from .views import AdminQueryProfileView
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -30,6 +33,8 @@ urlpatterns = [
      path('api/redoc/', SpectacularRedocView.as_view(url_name='schema')),
     path('api/', include('accounts.urls')),
     path('api/', include('jobs.urls')),
+    path('api/admin/profiling/', AdminQueryProfileView.as_view()),
+    path('metrics/', metrics_view),
 
 
 
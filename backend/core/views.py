@@ -0,0 +1,27 @@
+from django.conf import settings
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from jobs.permissions import IsAdminUserRole
+
+from . import profiling
+
+
+class AdminQueryProfileView(APIView):
+    """
+    The slowest recent requests per view recorded by
+    ``QueryProfilingMiddleware`` in this process. ``DELETE`` clears them.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUserRole]
+
+    def get(self, request):
+        return Response({
+            'enabled': settings.QUERY_PROFILING,
+            'views': profiling.slowest.snapshot(),
+        })
+
+    def delete(self, request):
+        profiling.slowest.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
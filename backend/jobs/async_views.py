@@ -0,0 +1,147 @@
+"""
+Async read path for the public job feed.
+
+These are plain Django ``async def`` views rather than DRF generics (DRF
+views are synchronous), so under ASGI a request waiting on the database
+doesn't hold a worker thread. They return the same JSON as
+``PublicJobListView``:
+
+* rows are read from the ``PublicJob`` read model as tuples with
+  ``async for``/``aget()`` and serialized by ``public_feed_rows()``, the
+  list view's fast path, then rendered with ``JSONRenderer``;
+* authentication runs the configured DRF authentication classes in a thread,
+  since they may load the user;
+* reads go to a replica unless the user was pinned to the primary by a
+  recent write, like the DRF views using ``core.routers.ReplicaReadMixin``.
+
+Only page-number pagination is offered here; keyset paging and conditional
+requests stay on the synchronous endpoint.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework import exceptions, status
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from core import routers
+
+from .models import PublicJob
+from .search import filter_public_jobs
+from .serializers import PUBLIC_ROW_FIELDS, public_feed_rows
+
+_renderer = JSONRenderer()
+
+
+def _json(data, status_code=status.HTTP_200_OK, headers=None):
+    response = HttpResponse(
+        _renderer.render(data), status=status_code, content_type='application/json'
+    )
+    for name, value in (headers or {}).items():
+        response[name] = value
+    return response
+
+
+def _error(exc):
+    headers = {}
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        # As in APIView: 401 with a challenge if the first authenticator has one.
+        authenticators = _authenticators()
+        header = authenticators[0].authenticate_header(None) if authenticators else None
+        if header:
+            headers['WWW-Authenticate'] = header
+        else:
+            exc.status_code = status.HTTP_403_FORBIDDEN
+    detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    return _json(detail, exc.status_code, headers)
+
+
+def _authenticators():
+    return [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+
+
+@sync_to_async
+def _authenticate(request):
+    """Run the DRF authenticators; returns the user or raises NotAuthenticated."""
+    drf_request = Request(request)
+    for authenticator in _authenticators():
+        result = authenticator.authenticate(drf_request)
+        if result is not None:
+            return result[0]
+    raise exceptions.NotAuthenticated()
+
+
+def _page_number(request, count, page_size):
+    """The requested page and the last page, as PageNumberPagination validates them."""
+    last = max(1, -(-count // page_size))
+    raw = request.GET.get(PageNumberPagination.page_query_param, 1)
+    if raw in PageNumberPagination.last_page_strings:
+        return last, last
+    try:
+        number = int(raw)
+    except (TypeError, ValueError):
+        number = 0
+    if not 1 <= number <= last:
+        raise exceptions.NotFound(PageNumberPagination.invalid_page_message.format(
+            page_number=raw, message='Invalid page.'
+        ))
+    return number, last
+
+
+def _page_link(url, number):
+    if number == 1:
+        return remove_query_param(url, PageNumberPagination.page_query_param)
+    return replace_query_param(url, PageNumberPagination.page_query_param, number)
+
+
+async def public_job_list(request):
+    if request.method not in ('GET', 'HEAD'):
+        return _error(exceptions.MethodNotAllowed(request.method))
+    try:
+        user = await _authenticate(request)
+    except exceptions.APIException as exc:
+        return _error(exc)
+
+    with routers.replica_reads(await routers.areplica_for(user)):
+        # The place filters resolve names against the gazetteer up front.
+        queryset = await sync_to_async(filter_public_jobs)(
+            PublicJob.objects.order_by('-created_at', '-id'), request.GET
+        )
+        page_size = api_settings.PAGE_SIZE
+        count = await queryset.acount()
+        try:
+            number, last = _page_number(request, count, page_size)
+        except exceptions.APIException as exc:
+            return _error(exc)
+
+        offset = (number - 1) * page_size
+        page = queryset.values_list(*PUBLIC_ROW_FIELDS)[offset:offset + page_size]
+        # values_list().aiterator() opens its cursor in the event loop
+        # on Django 4.2; iterating the queryset fetches the page in a thread.
+        jobs = [job async for job in page]
+
+    url = request.build_absolute_uri()
+    return _json({
+        'count': count,
+        'next': _page_link(url, number + 1) if number < last else None,
+        'previous': _page_link(url, number - 1) if number > 1 else None,
+        'results': public_feed_rows(jobs),
+    })
+
+
+async def public_job_detail(request, pk):
+    if request.method not in ('GET', 'HEAD'):
+        return _error(exceptions.MethodNotAllowed(request.method))
+    try:
+        user = await _authenticate(request)
+        with routers.replica_reads(await routers.areplica_for(user)):
+            try:
+                job = await PublicJob.objects.values_list(*PUBLIC_ROW_FIELDS).aget(pk=pk)
+            except PublicJob.DoesNotExist:
+                raise exceptions.NotFound()
+    except exceptions.APIException as exc:
+        return _error(exc)
+
+    return _json(public_feed_rows([job])[0])
@@ -0,0 +1,118 @@
+"""
+Conditional GET support (ETag / Last-Modified) for job views.
+
+List validators come from a cheap aggregate over the filtered queryset (or,
+for keyset pages, from the page rows' versions); a single job's come from
+its ``updated_at``. Either way a 304 is answered without serializing
+anything.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return f'W/{quote_etag(digest)}'
+
+
+def not_modified(request, etag, last_modified):
+    """A 304 response if the request's validators match, else ``None``."""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Job views are per-user; make shared caches revalidate every time.
+    patch_cache_control(response, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+class ConditionalListMixin:
+    """
+    Adds ETag and Last-Modified to a list view.
+
+    With page-number pagination the validators come from one aggregate over
+    the filtered queryset (row count, highest id, latest ``updated_at``),
+    whose count is then reused by ``JobPagination``. Keyset pages skip the
+    COUNT by design, so there they come from the ids and ``updated_at`` of
+    the page rows, which have to be fetched anyway. Either way the query
+    string, the requesting user and ``get_etag_extra()`` are part of the
+    ETag.
+    """
+
+    def get_etag_extra(self):
+        return None
+
+    def make_list_etag(self, *state):
+        return make_etag(
+            self.request.get_full_path(), self.request.user.pk, self.get_etag_extra(), *state
+        )
+
+    def get_list_validators(self, queryset):
+        stats = queryset.order_by().aggregate(
+            count=Count('pk'), last_id=Max('pk'), last_modified=Max('updated_at')
+        )
+        # Lets JobPagination skip its own COUNT query.
+        self.row_count = stats['count']
+        etag = self.make_list_etag(stats['count'], stats['last_id'], stats['last_modified'])
+        return etag, stats['last_modified']
+
+    def get_page_validators(self, page):
+        versions = [(row.id, row.updated_at) for row in page]
+        last_modified = max((updated_at for _, updated_at in versions), default=None)
+        etag = self.make_list_etag(
+            versions, self.paginator.get_next_link(), self.paginator.get_previous_link()
+        )
+        return etag, last_modified
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = None
+        if self.paginator is not None and self.paginator.use_keyset(request):
+            page = self.paginate_queryset(queryset)
+            self.validators = self.get_page_validators(page)
+        else:
+            self.validators = self.get_list_validators(queryset)
+
+        etag, last_modified = self.validators
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        if page is None:
+            page = self.paginate_queryset(queryset)
+        if page is not None:
+            response = self.get_paginated_response(self.serialize_rows(page))
+        else:
+            response = Response(self.serialize_rows(queryset))
+        return set_validators(response, etag, last_modified)
+
+    def serialize_rows(self, rows):
+        return self.get_serializer(rows, many=True).data
+
+
+class ConditionalRetrieveMixin:
+    """Adds ETag and Last-Modified to a detail view from the job's ``updated_at``."""
+
+    def retrieve(self, request, *args, **kwargs):
+        # get_object() runs the object permission checks before anything is
+        # revealed about the job.
+        instance = self.get_object()
+        last_modified = instance.updated_at
+        etag = make_etag(request.path, request.user.pk, last_modified)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        response = Response(self.get_serializer(instance).data)
+        return set_validators(response, etag, last_modified)
@@ -0,0 +1,74 @@
+"""
+Streaming job exports for admins.
+
+Rows are read with ``QuerySet.iterator(chunk_size=...)``, which fetches from
+the database cursor in chunks and runs the skills prefetch once per chunk,
+so memory stays flat however many jobs are exported.
+"""
+import csv
+import json
+
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+from .models import Skill
+
+EXPORT_FIELDS = [
+    'id', 'title', 'company_email', 'job_type', 'location', 'status',
+    'skills', 'created_at', 'updated_at',
+]
+
+CHUNK_SIZE = 2000
+
+_datetime = serializers.DateTimeField()
+
+
+def export_rows(queryset, chunk_size=CHUNK_SIZE):
+    queryset = (
+        queryset.select_related(None)
+        .select_related('company')
+        .prefetch_related(Prefetch('skills', queryset=Skill.objects.only('name')))
+        .only(
+            'id', 'title', 'job_type', 'location', 'status', 'created_at',
+            'updated_at', 'company__email',
+        )
+        .order_by('id')
+    )
+    for job in queryset.iterator(chunk_size=chunk_size):
+        yield {
+            'id': job.id,
+            'title': job.title,
+            'company_email': job.company.email,
+            'job_type': job.job_type,
+            'location': job.location,
+            'status': job.status,
+            'skills': [skill.name for skill in job.skills.all()],
+            'created_at': _datetime.to_representation(job.created_at),
+            'updated_at': _datetime.to_representation(job.updated_at),
+        }
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        row['skills'] = ';'.join(row['skills'])
+        yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+
+FORMATS = {
+    'ndjson': (stream_ndjson, 'application/x-ndjson'),
+    'csv': (stream_csv, 'text/csv'),
+}
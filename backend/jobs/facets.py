@@ -0,0 +1,46 @@
+"""
+Facet counts for the public job board.
+
+Each facet is one grouped aggregate over the jobs matching the public
+filters. The filtered queryset is used as an ``id IN (subquery)`` so that
+its joins and ``DISTINCT`` don't leak into the ``GROUP BY``; it must not be
+relevance-ranked (``rank=False``), since ranking joins the search index by
+table name.
+"""
+from django.db.models import Count
+
+from .models import Job
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+def _buckets(rows, field):
+    return [{'value': row[field], 'count': row['count']} for row in rows]
+
+
+def facet_counts(queryset, limit=DEFAULT_LIMIT):
+    """
+    ``job_type`` counts for every type, plus the ``limit`` most common
+    locations and skills, for the jobs in ``queryset``.
+    """
+    jobs = Job.objects.filter(pk__in=queryset.order_by().values('pk'))
+
+    job_types = list(
+        jobs.values('job_type').annotate(count=Count('id')).order_by('-count', 'job_type')
+    )
+    locations = (
+        jobs.values('location').annotate(count=Count('id')).order_by('-count', 'location')[:limit]
+    )
+    skills = (
+        Job.skills.through.objects.filter(job__in=jobs)
+        .values('skill__name')
+        .annotate(count=Count('job_id'))
+        .order_by('-count', 'skill__name')[:limit]
+    )
+    return {
+        'count': sum(row['count'] for row in job_types),
+        'job_type': _buckets(job_types, 'job_type'),
+        'location': _buckets(locations, 'location'),
+        'skills': _buckets(skills, 'skill__name'),
+    }
@@ -0,0 +1,94 @@
+"""
+Response cache for the public job feed.
+
+Entries are keyed by the normalized query parameters plus a global feed
+version. Write paths that can change what the feed shows send the
+``jobs_changed`` signal, which bumps the version; old entries are then
+never read again and expire on their own, so no key scanning is needed and
+the scheme works the same on the local-memory and shared cache backends.
+
+Pages read from a replica are cached apart from pages read from the
+primary. A replica may not have a write yet when the version is bumped for
+it, and its stale page must not reach the users pinned to the primary (see
+``core.routers``). ``sync_replicas`` bumps the version again once the
+replicas have caught up.
+"""
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.routers import current_read_alias
+
+KEY_PREFIX = 'jobs:feed'
+VERSION_KEY = f'{KEY_PREFIX}:version'
+HITS_KEY = f'{KEY_PREFIX}:hits'
+MISSES_KEY = f'{KEY_PREFIX}:misses'
+
+
+def _incr(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Missing key. add() only succeeds for one racing process; the others
+        # retry the increment.
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
+
+
+def get_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_version():
+    return _incr(VERSION_KEY)
+
+
+def normalize_params(query_params):
+    """Sorted, non-empty query parameters as a stable string."""
+    items = sorted(
+        (key, value)
+        for key, values in query_params.lists()
+        for value in values
+        if value != ''
+    )
+    return urlencode(items)
+
+
+def make_key(request, namespace='list'):
+    # Pagination links are absolute, so the host is part of the key.
+    base = request.build_absolute_uri(request.path)
+    digest = hashlib.sha1(
+        f'{base}?{normalize_params(request.query_params)}'.encode()
+    ).hexdigest()
+    source = 'replica' if current_read_alias() else 'primary'
+    return f'{KEY_PREFIX}:{namespace}:{get_version()}:{source}:{digest}'
+
+
+def lookup(key):
+    data = cache.get(key)
+    _incr(HITS_KEY if data is not None else MISSES_KEY)
+    return data
+
+
+def store(key, data):
+    cache.set(key, data, settings.JOBS_FEED_CACHE_TIMEOUT)
+
+
+def stats():
+    values = cache.get_many([VERSION_KEY, HITS_KEY, MISSES_KEY])
+    hits = values.get(HITS_KEY, 0)
+    misses = values.get(MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        'version': values.get(VERSION_KEY, 1),
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / lookups, 4) if lookups else None,
+    }
@@ -0,0 +1,112 @@
+"""
+Per-job fragment cache for the public feed.
+
+An approved job shows up on many feed pages (every filter, every page
+number), and the whole-page cache in ``feed_cache`` is dropped on every
+write. So each job's rendered JSON is also cached on its own, keyed by the
+job id and a digest of the row's rendered columns. A feed page is then the
+page envelope with the cached fragments spliced into ``results``; only
+rows missing from the cache are serialized.
+
+The key is computed from the very row being rendered, so any change to
+the row (edits, company and skill renames, moderation) gives it a new key
+and a fragment can never be served for content it wasn't rendered from,
+whatever the timing of writes and reads. ``read_model.sync_public_jobs``
+evicts the old fragments of the rows it rewrites once the transaction
+commits, only to free the memory.
+"""
+import hashlib
+import json
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from .serializers import public_feed_rows
+
+KEY_PREFIX = 'jobs:frag'
+
+_renderer = JSONRenderer()
+
+
+def fragment_key(row):
+    """Key of a ``values_list(*PUBLIC_ROW_FIELDS)`` row's fragment."""
+    # Everything public_feed_rows() renders: all but updated_at.
+    digest = hashlib.blake2b(repr(tuple(row[1:7])).encode(), digest_size=12).hexdigest()
+    return f'{KEY_PREFIX}:{row[0]}:{digest}'
+
+
+class RenderedRows(Sequence):
+    """
+    Feed rows as rendered JSON fragments. ``FragmentJSONRenderer`` writes the
+    fragments out as they are; indexing or iterating decodes them, so code
+    reading ``response.data`` still sees the row dicts.
+    """
+
+    def __init__(self, fragments):
+        self.fragments = list(fragments)
+
+    def __len__(self):
+        return len(self.fragments)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [json.loads(fragment) for fragment in self.fragments[index]]
+        return json.loads(self.fragments[index])
+
+    def __eq__(self, other):
+        if isinstance(other, (list, RenderedRows)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+
+def rendered_rows(rows):
+    """
+    ``RenderedRows`` for ``values_list(*PUBLIC_ROW_FIELDS, named=True)`` rows,
+    taken from the cache where possible.
+    """
+    rows = list(rows)
+    keys = [fragment_key(row) for row in rows]
+    fragments = cache.get_many(keys)
+    missing = [(key, row) for key, row in zip(keys, rows) if key not in fragments]
+    if missing:
+        data = public_feed_rows([row for _, row in missing])
+        fresh = {key: _renderer.render(item) for (key, _), item in zip(missing, data)}
+        cache.set_many(fresh, settings.JOBS_FRAGMENT_CACHE_TIMEOUT)
+        fragments.update(fresh)
+    return RenderedRows(fragments[key] for key in keys)
+
+
+def evict(rows):
+    """Drop the fragments of replaced ``values_list(*PUBLIC_ROW_FIELDS)`` rows on commit."""
+    keys = [fragment_key(row) for row in rows]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class FragmentJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` that splices ``RenderedRows`` into a compact envelope
+    instead of re-encoding them. The bytes are the same as rendering the
+    decoded rows. With indentation (the browsable API) the rows are decoded
+    and rendered normally.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data.get('results') if isinstance(data, dict) else None
+        if not isinstance(rows, RenderedRows):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        envelope = super().render(
+            {**data, 'results': []}, accepted_media_type, renderer_context
+        )
+        suffix = b'"results":[]}'
+        if not envelope.endswith(suffix):
+            return super().render(
+                {**data, 'results': list(rows)}, accepted_media_type, renderer_context
+            )
+        return b''.join([envelope[:-2], b','.join(rows.fragments), b']}'])
@@ -0,0 +1,73 @@
+"""
+Base for the process-local in-memory indexes (``jobs.suggest``,
+``jobs.matching``).
+
+Each process builds its copy from the database on first use and the
+process that commits a change applies it in place. Every change also bumps
+a generation counter in the cache; other processes compare it with the
+generation they built from at most every ``sync_interval`` seconds and
+rebuild when it moved. Set ``REDIS_URL`` when running several workers, or
+each one keeps its own counter.
+
+Rebuilds read from the primary even inside a view routed to a replica
+(``core.routers``): a replica that hasn't caught up would be recorded as
+the current generation and served until the next change.
+"""
+import abc
+import threading
+import time
+
+from django.core.cache import cache
+
+from core.routers import replica_reads
+
+
+class LocalIndex(abc.ABC):
+    #: Cache key of the generation counter.
+    generation_key = None
+    #: Seconds between checks of the generation counter.
+    sync_interval = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.built = False
+        self.generation = None
+        self.checked_at = 0.0
+
+    @abc.abstractmethod
+    def _rebuild(self):
+        """Load the index from the database; called with the lock held."""
+
+    def _rebuild_from_primary(self):
+        with replica_reads(None):
+            self._rebuild()
+
+    def sync(self, force=False):
+        """Rebuild if this copy is stale or another process changed the index."""
+        now = time.monotonic()
+        if not force and self.built and now - self.checked_at < self.sync_interval:
+            return
+        generation = cache.get(self.generation_key)
+        with self._lock:
+            if force or not self.built or generation != self.generation:
+                self._rebuild_from_primary()
+                self.built = True
+                self.generation = generation
+            self.checked_at = now
+
+    def _changed(self):
+        """Publish a local change; called with the lock held."""
+        try:
+            generation = cache.incr(self.generation_key)
+        except ValueError:
+            cache.add(self.generation_key, 1, None)
+            generation = cache.get(self.generation_key)
+        # If someone else changed it too, our copy is missing their change.
+        if generation != (self.generation or 0) + 1:
+            self.built = False
+        self.generation = generation
+
+    def invalidate(self):
+        with self._lock:
+            self.built = False
+            self._changed()
@@ -0,0 +1,288 @@
+"""
+Gazetteer-backed job locations.
+
+``Job.location`` stays the free text the company typed; ``Job.place`` is
+that text resolved to a ``Location`` through ``LocationAlias``, so
+"Bengaluru", "bangalore, india" and "Bangalore" are all one place. Names
+are matched on ``normalize(name)`` (accents stripped, case-folded, spaces
+collapsed). For "City, Region, Country" texts the part before the first
+comma is looked up and the rest picks among places sharing that name (a
+part that matches none of them, e.g. an unknown region, means no match);
+otherwise the most populous one wins.
+
+The gazetteer is a CSV file (``data/gazetteer.csv`` by default) loaded with
+``python manage.py load_gazetteer``:
+
+    name,region,country,latitude,longitude,population,aliases
+    Bengaluru,Karnataka,India,12.9716,77.5946,8443675,Bangalore|Bengaluru City
+
+``within(latitude, longitude, km)`` finds the places in a radius: an
+indexed bounding-box range on ``Location`` narrows the candidates, then
+each is checked with the haversine distance. Jobs take their place's
+coordinates, so the public radius filter is ``place_id IN (...)``.
+"""
+import csv
+import math
+import unicodedata
+from pathlib import Path
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Job, Location, LocationAlias
+
+DEFAULT_GAZETTEER = Path(__file__).resolve().parent / 'data' / 'gazetteer.csv'
+
+EARTH_RADIUS_KM = 6371.0088
+
+DEFAULT_RADIUS_KM = 25
+MAX_RADIUS_KM = 1000
+
+BATCH_SIZE = 500
+
+
+def normalize(name):
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.replace('.', ' ').split()).casefold()
+
+
+def _parts(text):
+    """Normalized comma-separated parts of ``text``, empty ones dropped."""
+    return [part for part in (normalize(part) for part in text.split(',')) if part]
+
+
+def _lookup_keys(text):
+    parts = _parts(text)
+    if not parts:
+        return []
+    return list(dict.fromkeys([', '.join(parts), parts[0]]))
+
+
+def _best(text, candidates):
+    """The candidate ``Location`` that fits ``text`` best, or None."""
+    parts = _parts(text)
+    if not parts or not candidates:
+        return None
+    full = ', '.join(parts)
+    qualifiers = set(parts[1:])
+
+    def known(location):
+        # "Kakkanad, Kochi": a neighbourhood alias qualified by the city itself.
+        return {normalize(location.name), normalize(location.region), normalize(location.country)}
+
+    def score(candidate):
+        location, key = candidate
+        return (key == full, len(known(location) & qualifiers), location.population, -location.pk)
+
+    location, key = max(candidates, key=score)
+    # A full-text alias always wins; a bare name must agree with every qualifier given.
+    if key != full and qualifiers - known(location):
+        return None
+    return location
+
+
+def resolve_many(texts):
+    """Map each free-text location to its ``Location`` (or None), in one query."""
+    texts = list(dict.fromkeys(texts))
+    keys = {key for text in texts for key in _lookup_keys(text)}
+    candidates = {}
+    aliases = LocationAlias.objects.filter(normalized_name__in=keys).select_related('location')
+    for alias in aliases:
+        candidates.setdefault(alias.normalized_name, []).append(
+            (alias.location, alias.normalized_name)
+        )
+    return {
+        text: _best(text, [c for key in _lookup_keys(text) for c in candidates.get(key, [])])
+        for text in texts
+    }
+
+
+def resolve(text):
+    return resolve_many([text])[text]
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude, longitude, km):
+    """
+    ``(min_lat, max_lat, [(min_lng, max_lng), ...])`` enclosing the circle;
+    two longitude ranges when it crosses the antimeridian, all of them when
+    it reaches a pole.
+    """
+    delta_lat = math.degrees(km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - delta_lat, latitude + delta_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90), min(max_lat, 90), [(-180, 180)]
+    delta_lng = math.degrees(
+        math.asin(min(1.0, math.sin(km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude))))
+    )
+    min_lng, max_lng = longitude - delta_lng, longitude + delta_lng
+    if min_lng < -180:
+        return min_lat, max_lat, [(min_lng + 360, 180), (-180, max_lng)]
+    if max_lng > 180:
+        return min_lat, max_lat, [(min_lng, 180), (-180, max_lng - 360)]
+    return min_lat, max_lat, [(min_lng, max_lng)]
+
+
+def within(latitude, longitude, km):
+    """Ids of the places at most ``km`` from the point."""
+    min_lat, max_lat, lng_ranges = bounding_box(latitude, longitude, km)
+    ids = []
+    for min_lng, max_lng in lng_ranges:
+        candidates = Location.objects.filter(
+            latitude__range=(min_lat, max_lat), longitude__range=(min_lng, max_lng)
+        ).values_list('id', 'latitude', 'longitude')
+        ids.extend(
+            pk for pk, lat, lng in candidates
+            if haversine_km(latitude, longitude, lat, lng) <= km
+        )
+    return ids
+
+
+def parse_point(value):
+    """``(latitude, longitude)`` from ``"lat,lng"``, or None if it isn't one."""
+    try:
+        latitude, longitude = (float(part) for part in value.split(','))
+    except ValueError:
+        return None
+    if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+        return latitude, longitude
+    return None
+
+
+def filter_by_place(queryset, query_params):
+    """
+    Apply the ``place`` (exact location) and ``near`` + ``radius_km``
+    filters to a ``Job`` or ``PublicJob`` queryset. Names that don't resolve
+    match nothing.
+    """
+    place = query_params.get('place')
+    if place:
+        location = resolve(place)
+        queryset = queryset.filter(place=location) if location else queryset.none()
+
+    near = query_params.get('near')
+    if near:
+        point = parse_point(near)
+        if point is None:
+            location = resolve(near)
+            point = (location.latitude, location.longitude) if location else None
+        if point is None:
+            return queryset.none()
+        try:
+            km = float(query_params.get('radius_km', DEFAULT_RADIUS_KM))
+        except ValueError:
+            km = DEFAULT_RADIUS_KM
+        # nan would survive the clamping below and match nothing.
+        if not math.isfinite(km):
+            km = DEFAULT_RADIUS_KM
+        km = min(max(km, 0), MAX_RADIUS_KM)
+        queryset = queryset.filter(place_id__in=within(*point, km))
+    return queryset
+
+
+# Loading the gazetteer
+
+def read_gazetteer(path):
+    """Rows of a gazetteer CSV as dicts, with numbers parsed and aliases split."""
+    with open(path, newline='', encoding='utf-8') as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                yield {
+                    'name': row['name'].strip(),
+                    'region': (row.get('region') or '').strip(),
+                    'country': row['country'].strip(),
+                    'latitude': float(row['latitude']),
+                    'longitude': float(row['longitude']),
+                    'population': int(row.get('population') or 0),
+                    'aliases': [a.strip() for a in (row.get('aliases') or '').split('|') if a.strip()],
+                }
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError(f'{path}, line {line}: {exc!r}') from exc
+
+
+def _alias_names(row):
+    """The names and their "Name, Region", "Name, Country" and "Name, Region, Country" forms."""
+    names = [row['name'], *row['aliases']]
+    qualifiers = [row['country']]
+    if row['region']:
+        qualifiers += [row['region'], f"{row['region']}, {row['country']}"]
+    return {
+        normalize(name)
+        for base in names
+        for name in [base, *(f'{base}, {qualifier}' for qualifier in qualifiers)]
+    }
+
+
+def load_gazetteer(rows):
+    """
+    Upsert gazetteer rows, keyed by (name, region, country), and replace
+    their aliases. Returns the number of locations loaded.
+    """
+    rows = list(rows)
+    with transaction.atomic():
+        Location.objects.bulk_create(
+            [
+                Location(**{key: value for key, value in row.items() if key != 'aliases'})
+                for row in rows
+            ],
+            update_conflicts=True,
+            unique_fields=['name', 'region', 'country'],
+            update_fields=['latitude', 'longitude', 'population'],
+            batch_size=BATCH_SIZE,
+        )
+        ids = {
+            (name, region, country): pk
+            for pk, name, region, country in Location.objects.values_list(
+                'id', 'name', 'region', 'country'
+            )
+        }
+        loaded = [ids[row['name'], row['region'], row['country']] for row in rows]
+        for start in range(0, len(loaded), BATCH_SIZE):
+            LocationAlias.objects.filter(location_id__in=loaded[start:start + BATCH_SIZE]).delete()
+        LocationAlias.objects.bulk_create(
+            [
+                LocationAlias(location_id=pk, normalized_name=alias)
+                for pk, row in zip(loaded, rows)
+                for alias in _alias_names(row)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+    return len(rows)
+
+
+def resolve_jobs():
+    """
+    Re-resolve every job's place, e.g. after loading the gazetteer. Returns
+    the ids of the jobs whose place changed.
+    """
+    now = timezone.now()
+    changed = []
+    last_id = 0
+    while True:
+        jobs = list(
+            Job.objects.filter(id__gt=last_id).order_by('id')
+            .only('id', 'location', 'place')[:BATCH_SIZE]
+        )
+        if not jobs:
+            return changed
+        places = resolve_many(job.location for job in jobs)
+        updated = []
+        for job in jobs:
+            place = places[job.location]
+            if job.place_id != (place.pk if place else None):
+                job.place = place
+                # Like every write, so validators and caches keyed on it move.
+                job.updated_at = now
+                updated.append(job)
+        Job.objects.bulk_update(updated, ['place', 'updated_at'])
+        changed.extend(job.pk for job in updated)
+        last_id = jobs[-1].pk
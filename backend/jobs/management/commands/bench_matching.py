@@ -0,0 +1,138 @@
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from jobs.management.commands.generate_dataset import Zipf
+from jobs.matching import MatchingIndex
+from jobs.models import Job, PublicJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the skill-matching index (jobs.matching): build time, memory "
+        "and query latency on synthetic in-memory jobs (500k by default), with "
+        "results checked against a brute-force ranking. With --db, also index "
+        "the PublicJob table and compare with a GROUP BY over the skills join."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=500_000)
+        parser.add_argument('--skills', type=int, default=500)
+        parser.add_argument('--max-skills-per-job', type=int, default=8)
+        parser.add_argument('--zipf', type=float, default=1.1)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=7)
+        parser.add_argument('--db', action='store_true', help='Also benchmark the database.')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        names = [f'Skill {i}' for i in range(options['skills'])]
+        popularity = Zipf(len(names), options['zipf'], rng)
+        queries = [
+            [names[rank] for rank in popularity.sample_distinct(rng.randint(1, 5))]
+            for _ in range(options['queries'])
+        ]
+
+        rows = self.synthetic(rng, names, popularity, options)
+        index = self.build(rows, f"synthetic, {len(rows):,} jobs")
+        self.verify(index, rows, queries[:3], options['limit'])
+        self.report('index', lambda query: index.match(query, options['limit']), queries)
+
+        if options['db']:
+            self.benchmark_db(queries, options['limit'])
+
+    def synthetic(self, rng, names, popularity, options):
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        most = min(options['max_skills_per_job'], len(names))
+        rows = [
+            (
+                job_id,
+                start + timedelta(seconds=rng.randrange(365 * 86400)),
+                '\n'.join(
+                    sorted(names[rank] for rank in popularity.sample_distinct(rng.randint(1, most)))
+                ),
+            )
+            for job_id in range(1, options['jobs'] + 1)
+        ]
+        rows.sort(key=lambda row: (row[1], row[0]))
+        return rows
+
+    def build(self, rows, label):
+        index = MatchingIndex()
+        started = time.perf_counter()
+        index.load(rows)
+        elapsed = time.perf_counter() - started
+        index.built = True
+        # Benchmarks never publish changes, so don't let sync() rebuild it.
+        index.checked_at = float('inf')
+        self.stdout.write(
+            f"Built the index ({label}) in {elapsed:.2f}s: {len(index._postings)} skills, "
+            f"{index.memory() / 2**20:.1f} MiB."
+        )
+        return index
+
+    def verify(self, index, rows, queries, limit):
+        for query in queries:
+            wanted = set(query)
+            scored = sorted(
+                (
+                    (len(wanted.intersection(skills.split('\n'))), created_at, job_id)
+                    for job_id, created_at, skills in rows
+                ),
+                reverse=True,
+            )
+            expected = [(job_id, matched) for matched, _, job_id in scored[:limit] if matched]
+            if index.match(query, limit)[0] != expected:
+                self.stderr.write(f"Index ranking differs from brute force for {query}!")
+
+    def report(self, name, run, queries):
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            run(query)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f"{name:<10} p50 {statistics.median(timings):8.3f} ms   p95 {p95:8.3f} ms   "
+            f"max {timings[-1]:8.3f} ms   ({len(timings)} queries)"
+        )
+
+    def benchmark_db(self, queries, limit):
+        names = list(
+            Job.skills.through.objects.filter(job__status='approved')
+            .values('skill__name').annotate(jobs=Count('job_id'))
+            .order_by('-jobs').values_list('skill__name', flat=True)[:len(queries)]
+        )
+        if not names:
+            self.stderr.write("No approved jobs with skills in the database; run generate_dataset.")
+            return
+        # Same query shapes, over the skills that exist in the database.
+        rng = random.Random(0)
+        queries = [rng.sample(names, min(len(query), len(names))) for query in queries]
+
+        rows = (
+            PublicJob.objects.order_by('created_at', 'id')
+            .values_list('id', 'created_at', 'skills')
+            .iterator(chunk_size=5000)
+        )
+        index = self.build(rows, f"database, {PublicJob.objects.count():,} jobs")
+
+        def group_by(query):
+            return list(
+                Job.objects.filter(status='approved', skills__name__in=query)
+                .values('id').annotate(matched=Count('id'))
+                .order_by('-matched', '-created_at', '-id')
+                .values_list('id', 'matched')[:limit]
+            )
+
+        mismatches = sum(group_by(query) != index.match(query, limit)[0] for query in queries[:10])
+        if mismatches:
+            self.stderr.write(f"{mismatches} of 10 rankings differ between the index and GROUP BY!")
+        self.report('index', lambda query: index.match(query, limit), queries)
+        self.report('GROUP BY', group_by, queries[:max(10, len(queries) // 10)])
@@ -0,0 +1,146 @@
+import math
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from accounts.models import User
+from jobs import search
+from jobs.models import Job, Skill
+
+WORDS = [
+    'senior', 'junior', 'backend', 'frontend', 'fullstack', 'data', 'platform',
+    'mobile', 'cloud', 'security', 'developer', 'engineer', 'analyst', 'lead',
+    'architect', 'intern', 'manager', 'designer', 'scientist', 'consultant',
+]
+LOCATIONS = [
+    'Bangalore, India', 'Mumbai, India', 'Pune, India', 'Hyderabad, India',
+    'Chennai, India', 'Kochi, India', 'Delhi, India', 'Remote', 'London, UK',
+    'Berlin, Germany', 'Singapore', 'Dubai, UAE', 'New York, USA',
+]
+QUERIES = [
+    {'location': 'bangalore'},
+    {'location': 'india'},
+    {'skill': 'python'},
+    {'skill': 'skill-17'},
+    {'location': 'remote', 'skill': 'react'},
+    {'q': 'senior backend'},
+    {'q': 'python kochi'},
+]
+
+
+def legacy_queryset(location=None, skill=None, q=None):
+    queryset = Job.objects.filter(status='approved').order_by('-created_at', '-id')
+    if location:
+        queryset = queryset.filter(location__icontains=location)
+    if skill:
+        queryset = queryset.filter(skills__name__icontains=skill)
+    if q:
+        for term in q.split():
+            queryset = queryset.filter(
+                Q(title__icontains=term)
+                | Q(location__icontains=term)
+                | Q(company__full_name__icontains=term)
+                | Q(skills__name__icontains=term)
+            )
+    return queryset.distinct()
+
+
+def indexed_queryset(**params):
+    queryset = Job.objects.filter(status='approved').order_by('-created_at', '-id')
+    return search.search_jobs(queryset, **params)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark public job search (icontains vs. the FTS5 index) on a "
+        "synthetic dataset. All rows are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=100_000)
+        parser.add_argument('--skills', type=int, default=300)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            self.stderr.write("The FTS5 index is only available on SQLite.")
+            return
+
+        with transaction.atomic():
+            self.populate(options)
+            for params in QUERIES:
+                self.compare(params, options)
+            transaction.set_rollback(True)
+
+    def populate(self, options):
+        rng = random.Random(options['seed'])
+        started = time.perf_counter()
+
+        company = User.objects.create_user(
+            email='bench-search@example.com', full_name='Bench Corp'
+        )
+        names = ['Python', 'Django', 'React', 'Go', 'SQL', 'AWS', 'Docker']
+        names += [f'skill-{i}' for i in range(options['skills'] - len(names))]
+        skills = Skill.objects.bulk_create(Skill(name=name) for name in names)
+
+        jobs = Job.objects.bulk_create(
+            (
+                Job(
+                    title=' '.join(rng.sample(WORDS, 3)).title(),
+                    company=company,
+                    job_type=rng.choice(['full_time', 'part_time', 'internship']),
+                    location=rng.choice(LOCATIONS),
+                    status=rng.choice(['approved', 'approved', 'pending', 'rejected']),
+                )
+                for _ in range(options['jobs'])
+            ),
+            batch_size=2000,
+        )
+        Through = Job.skills.through
+        Through.objects.bulk_create(
+            (
+                Through(job_id=job.pk, skill_id=skill.pk)
+                for job in jobs
+                for skill in rng.sample(skills, rng.randint(1, 6))
+            ),
+            batch_size=5000,
+        )
+        search.rebuild_index()
+        self.stdout.write(
+            f"Loaded {len(jobs)} jobs in {time.perf_counter() - started:.1f}s"
+        )
+
+    def compare(self, params, options):
+        size = options['page_size']
+
+        def run(queryset):
+            return queryset.count(), [job.pk for job in queryset[:size]]
+
+        legacy = self.time(lambda: run(legacy_queryset(**params)), options['repeat'])
+        indexed = self.time(lambda: run(indexed_queryset(**params)), options['repeat'])
+
+        expected = set(legacy_queryset(**params).values_list('pk', flat=True))
+        actual = set(indexed_queryset(**params).values_list('pk', flat=True))
+        if expected != actual:
+            self.stderr.write(f"Result mismatch for {params}")
+
+        label = ' '.join(f'{key}={value}' for key, value in params.items())
+        self.stdout.write(
+            f"{label:<32} icontains p50 {legacy[0]:8.2f}ms p95 {legacy[1]:8.2f}ms"
+            f" | fts5 p50 {indexed[0]:8.2f}ms p95 {indexed[1]:8.2f}ms"
+        )
+
+    def time(self, func, repeat):
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        return statistics.median(samples), samples[math.ceil(len(samples) * 0.95) - 1]
@@ -0,0 +1,79 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from jobs.models import PublicJob
+from jobs.serializers import PUBLIC_ROW_FIELDS, PublicFeedSerializer, public_feed_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows/sec of PublicFeedSerializer and the public_feed_rows() "
+        "fast path. Serialization alone runs on synthetic in-memory rows; with "
+        "--db, fetching from PublicJob (instances vs tuples) is timed too."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20_000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--db', action='store_true', help='Also time fetching from PublicJob.')
+
+    def handle(self, *args, **options):
+        instances = self.synthetic(options['rows'])
+        tuples = [tuple(getattr(job, field) for field in PUBLIC_ROW_FIELDS) for job in instances]
+
+        reference = JSONRenderer().render(PublicFeedSerializer(instances, many=True).data)
+        if JSONRenderer().render(public_feed_rows(tuples)) != reference:
+            self.stderr.write('public_feed_rows() output differs from PublicFeedSerializer!')
+
+        self.stdout.write(f"{'path':<34} {'rows/s':>12} {'ms/page of 10':>14}")
+        paths = [
+            ('serializer', lambda: PublicFeedSerializer(instances, many=True).data),
+            ('fast', lambda: public_feed_rows(tuples)),
+        ]
+        if options['db']:
+            queryset = PublicJob.objects.order_by('-created_at', '-id')[:options['rows']]
+            paths += [
+                ('db + serializer', lambda: PublicFeedSerializer(list(queryset), many=True).data),
+                ('db + fast', lambda: public_feed_rows(
+                    queryset.values_list(*PUBLIC_ROW_FIELDS)
+                )),
+            ]
+        for name, run in paths:
+            rows, seconds = self.measure(run, options['repeat'])
+            self.stdout.write(f"{name:<34} {rows / seconds:>12,.0f} {seconds / rows * 10_000:>14.3f}")
+
+    @staticmethod
+    def measure(run, repeat):
+        """Rows produced and the median seconds one run takes."""
+        run()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = len(run())
+            timings.append(time.perf_counter() - start)
+        return rows, statistics.median(timings)
+
+    @staticmethod
+    def synthetic(count):
+        rng = random.Random(7)
+        now = timezone.now()
+        skills = ['Python', 'Django', 'React', 'SQL', 'AWS', 'Go', 'Docker', 'Kotlin']
+        return [
+            PublicJob(
+                id=index,
+                title=f'{rng.choice(["Senior", "Junior", ""])} Backend Engineer {index}'.strip(),
+                company_name=f'Company {rng.randrange(500)}',
+                job_type=rng.choice(['full_time', 'part_time', 'internship']),
+                location=rng.choice(['Kochi, India', 'Remote', 'Pune, India']),
+                skills='\n'.join(sorted(rng.sample(skills, rng.randint(0, 5)))),
+                created_at=now - timedelta(seconds=rng.randrange(10**7), microseconds=rng.randrange(10**6)),
+                updated_at=now,
+            )
+            for index in range(1, count + 1)
+        ]
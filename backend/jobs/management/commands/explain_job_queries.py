@@ -0,0 +1,116 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import User
+from jobs.pagination import KeysetPagination
+from jobs.views import AdminJobListView, CompanyJobListView, PublicJobListView
+
+# (view, query params, user role) for every list view and filter combination
+# the API exposes.
+SCENARIOS = [
+    (PublicJobListView, {}, 'company'),
+    (PublicJobListView, {'job_type': 'full_time'}, 'company'),
+    (PublicJobListView, {'location': 'bangalore'}, 'company'),
+    (PublicJobListView, {'skill': 'python'}, 'company'),
+    (PublicJobListView, {'q': 'python developer'}, 'company'),
+    (PublicJobListView, {'job_type': 'internship', 'location': 'pune'}, 'company'),
+    (CompanyJobListView, {}, 'company'),
+    (AdminJobListView, {}, 'admin'),
+    (AdminJobListView, {'status': 'pending'}, 'admin'),
+    (AdminJobListView, {'company': 'company@example.com'}, 'admin'),
+    (AdminJobListView, {'status': 'pending', 'company': 'company@example.com'}, 'admin'),
+]
+
+# Scans of these tables grow with the data. Virtual tables (the FTS index)
+# report "SCAN ... VIRTUAL TABLE INDEX" and are not flagged.
+WATCHED_TABLES = ('jobs_publicjob', 'jobs_job', 'jobs_job_skills', 'accounts_user')
+
+
+def build_queryset(view_class, params, role):
+    factory = APIRequestFactory()
+    request = Request(factory.get('/', params))
+    request.user = User(pk=1, email='company@example.com', role=role, is_staff=role == 'admin')
+    view = view_class()
+    view.setup(request)
+    view.request = request
+    view.format_kwarg = None
+    return view.get_queryset()
+
+
+def plan_steps(plan):
+    # SQLite rows look like "7 0 0 SEARCH jobs_job USING INDEX ...".
+    for line in plan.splitlines():
+        yield line.split(' ', 3)[-1].strip(' |-`')
+
+
+def table_scans(plan):
+    """
+    Full scans of watched tables. Walking an index in ORDER BY order is fine
+    because the page's LIMIT stops it early; it's only a full scan when the
+    rows then have to be sorted.
+    """
+    steps = list(plan_steps(plan))
+    sorted_afterwards = bool(sorts(plan))
+    scans = []
+    for step in steps:
+        for table in WATCHED_TABLES:
+            if step in (f'SCAN {table}', f'SCAN TABLE {table}'):
+                scans.append(step)
+            elif step.startswith(f'SCAN {table} USING') and sorted_afterwards:
+                scans.append(step)
+    return scans
+
+
+def sorts(plan):
+    return [step for step in plan_steps(plan) if step.startswith('USE TEMP B-TREE')]
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the query plan of every job list view's page queries and flag "
+        "full table scans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--strict', action='store_true',
+            help="Exit with an error if any query scans a watched table.",
+        )
+
+    def handle(self, *args, **options):
+        page_size = api_settings.PAGE_SIZE
+        now = timezone.now()
+        problems = []
+
+        for view_class, params, role in SCENARIOS:
+            queryset = build_queryset(view_class, params, role)
+            variants = [
+                ('page', queryset[:page_size]),
+                ('cursor', KeysetPagination.seek(queryset, now, 1)[:page_size + 1]),
+            ]
+            label = ' '.join(f'{key}={value}' for key, value in params.items())
+            for mode, page in variants:
+                plan = page.explain()
+                self.stdout.write(self.style.MIGRATE_HEADING(
+                    f"{view_class.__name__} [{mode}] {label}".rstrip()
+                ))
+                self.stdout.write(plan)
+                for scan in table_scans(plan):
+                    problems.append(f"{view_class.__name__} [{mode}] {label}: {scan}")
+                    self.stdout.write(self.style.ERROR(f"  table scan: {scan}"))
+                for sort in sorts(plan):
+                    # Expected for relevance-ranked search, where the order
+                    # comes from bm25() rather than an index.
+                    self.stdout.write(self.style.WARNING(f"  sort: {sort}"))
+                self.stdout.write('')
+
+        if problems:
+            summary = f"{len(problems)} table scan(s) found."
+            if options['strict']:
+                raise CommandError(summary + '\n' + '\n'.join(problems))
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS("No table scans."))
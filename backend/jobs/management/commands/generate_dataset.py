@@ -0,0 +1,226 @@
+import bisect
+import itertools
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import User
+from jobs import read_model, search
+from jobs.locations import resolve_many as resolve_places
+from jobs.models import Job, Skill
+
+EMAIL_DOMAIN = 'dataset.example.com'
+PASSWORD = 'dataset-pass'
+
+# Ids per DELETE when clearing; well under SQLite's 999 variables.
+DELETE_BATCH_SIZE = 500
+
+COMMON_SKILLS = [
+    'Python', 'JavaScript', 'SQL', 'React', 'Java', 'Django', 'AWS', 'Docker',
+    'TypeScript', 'Node.js', 'Git', 'Kubernetes', 'Go', 'PostgreSQL', 'Linux',
+    'C++', 'Figma', 'Excel', 'Flutter', 'Kotlin', 'Machine Learning', 'Redis',
+]
+LOCATIONS = [
+    'Bangalore, India', 'Remote', 'Hyderabad, India', 'Pune, India',
+    'Chennai, India', 'Mumbai, India', 'Kochi, India', 'Delhi, India',
+    'Thiruvananthapuram, India', 'Gurgaon, India', 'Noida, India',
+    'Kolkata, India', 'Ahmedabad, India', 'Coimbatore, India', 'Jaipur, India',
+    'London, United Kingdom', 'Berlin, Germany', 'Singapore',
+    'Dubai, United Arab Emirates', 'New York, United States',
+]
+SENIORITY = ['', '', 'Junior', 'Senior', 'Lead', 'Staff', 'Principal']
+AREAS = [
+    'Backend', 'Frontend', 'Full Stack', 'Data', 'Platform', 'Mobile', 'Cloud',
+    'Security', 'QA', 'Machine Learning', 'DevOps', 'Embedded',
+]
+ROLES = ['Engineer', 'Developer', 'Analyst', 'Architect', 'Intern', 'Designer', 'Scientist']
+COMPANY_WORDS = [
+    'Acme', 'Blue', 'Cloud', 'Data', 'Edge', 'Flux', 'Grid', 'Hyper', 'Iron',
+    'Jade', 'Kite', 'Lumen', 'Nova', 'Orbit', 'Pixel', 'Quant', 'Roots',
+    'Sigma', 'Tide', 'Vertex',
+]
+COMPANY_SUFFIXES = ['Labs', 'Technologies', 'Systems', 'Solutions', 'Works', 'Digital']
+
+STATUS_WEIGHTS = {'approved': 70, 'pending': 20, 'rejected': 10}
+JOB_TYPE_WEIGHTS = {'full_time': 70, 'part_time': 10, 'internship': 20}
+
+
+class Zipf:
+    """Samples ranks 0..n-1 with P(k) proportional to 1 / (k + 1) ** s."""
+
+    def __init__(self, n, s, rng):
+        self.cumulative = list(itertools.accumulate(1 / (k + 1) ** s for k in range(n)))
+        self.rng = rng
+
+    def sample(self):
+        return bisect.bisect_left(self.cumulative, self.rng.random() * self.cumulative[-1])
+
+    def sample_distinct(self, count):
+        ranks = set()
+        while len(ranks) < count:
+            ranks.add(self.sample())
+        return ranks
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic dataset: companies, jobs with mixed statuses and "
+        "job types, and a Zipf-distributed skill vocabulary. Written with "
+        f"bulk_create. Generated companies use @{EMAIL_DOMAIN} addresses and "
+        f"the password '{PASSWORD}'; --clear removes them and their jobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=200)
+        parser.add_argument('--jobs', type=int, default=50_000)
+        parser.add_argument('--skills', type=int, default=500)
+        parser.add_argument(
+            '--zipf', type=float, default=1.1,
+            help='Exponent of the skill and location popularity distribution.',
+        )
+        parser.add_argument('--max-skills-per-job', type=int, default=8)
+        parser.add_argument('--days', type=int, default=365, help='Spread of created_at.')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--clear', action='store_true', help='Only delete generated data.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with transaction.atomic():
+            deleted = self.clear()
+            if options['clear']:
+                self.refresh_derived()
+                self.stdout.write(f"Deleted {deleted} generated jobs.")
+                return
+            rng = random.Random(options['seed'])
+            companies = self.create_companies(rng, options)
+            skills = self.create_skills(options)
+            jobs = self.create_jobs(rng, companies, options)
+            links = self.link_skills(rng, jobs, skills, options)
+            self.refresh_derived()
+
+        self.stdout.write(
+            f"Generated {len(companies)} companies, {len(skills)} skills, {len(jobs)} jobs "
+            f"and {links} job-skill links in {time.perf_counter() - started:.1f}s."
+        )
+
+    def clear(self):
+        """Delete generated companies and their jobs; returns the number of jobs."""
+        companies = User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}')
+        jobs = Job.objects.filter(company__in=companies)
+        Job.skills.through.objects.filter(job__in=jobs).delete()
+        # Plain DELETEs instead of jobs.delete(), whose per-job signals would
+        # update the search index and read model row by row. Nothing else
+        # references jobs; refresh_derived() rebuilds what the signals keep.
+        ids = list(jobs.values_list('pk', flat=True))
+        with connection.cursor() as cursor:
+            for start in range(0, len(ids), DELETE_BATCH_SIZE):
+                batch = ids[start:start + DELETE_BATCH_SIZE]
+                placeholders = ', '.join(['%s'] * len(batch))
+                cursor.execute(
+                    f'DELETE FROM {Job._meta.db_table} WHERE id IN ({placeholders})', batch
+                )
+        companies.delete()
+        return len(ids)
+
+    def create_companies(self, rng, options):
+        # One hash for everyone: hashing per user would dominate the run.
+        password = make_password(PASSWORD)
+        names = set()
+        for i in range(options['companies']):
+            name = (
+                f'{rng.choice(COMPANY_WORDS)}{rng.choice(COMPANY_WORDS).lower()} '
+                f'{rng.choice(COMPANY_SUFFIXES)}'
+            )
+            names.add(f'{name} {i}' if name in names else name)
+        return User.objects.bulk_create(
+            (
+                User(
+                    email=f'company{i}@{EMAIL_DOMAIN}', full_name=name,
+                    role='company', password=password,
+                )
+                for i, name in enumerate(sorted(names))
+            ),
+            batch_size=options['batch_size'],
+        )
+
+    def create_skills(self, options):
+        """The vocabulary, most popular first; existing skills are reused."""
+        names = COMMON_SKILLS[:options['skills']]
+        names += [f'Skill {i}' for i in range(len(names), options['skills'])]
+        wanted = {Skill.normalize(name): name for name in names}
+        Skill.objects.bulk_create(
+            (Skill(name=name, normalized_name=key) for key, name in wanted.items()),
+            batch_size=options['batch_size'],
+            ignore_conflicts=True,
+        )
+        ids = dict(
+            Skill.objects.filter(normalized_name__in=wanted).values_list('normalized_name', 'id')
+        )
+        return [ids[key] for key in wanted]
+
+    def create_jobs(self, rng, companies, options):
+        locations = Zipf(len(LOCATIONS), options['zipf'], rng)
+        # None until the gazetteer is loaded; load_gazetteer resolves them then.
+        resolved = resolve_places(LOCATIONS)
+        places = [resolved[name] for name in LOCATIONS]
+        statuses, status_weights = zip(*STATUS_WEIGHTS.items())
+        job_types, job_type_weights = zip(*JOB_TYPE_WEIGHTS.items())
+        # Some companies post far more than others.
+        company_picker = Zipf(len(companies), 0.8, rng)
+        now = timezone.now()
+        span = options['days'] * 86400
+
+        jobs = [
+            Job(
+                title=' '.join(
+                    filter(None, [rng.choice(SENIORITY), rng.choice(AREAS), rng.choice(ROLES)])
+                ),
+                company=companies[company_picker.sample()],
+                job_type=rng.choices(job_types, job_type_weights)[0],
+                location=LOCATIONS[index],
+                place=places[index],
+                status=rng.choices(statuses, status_weights)[0],
+            )
+            for index in (locations.sample() for _ in range(options['jobs']))
+        ]
+        jobs = Job.objects.bulk_create(jobs, batch_size=options['batch_size'])
+
+        # auto_now_add/auto_now overwrite the timestamps on insert, and
+        # bulk_update doesn't apply them.
+        for job in jobs:
+            job.created_at = now - timedelta(seconds=rng.randrange(span))
+            job.updated_at = job.created_at + timedelta(
+                seconds=rng.randrange(int((now - job.created_at).total_seconds()) + 1)
+            )
+        Job.objects.bulk_update(jobs, ['created_at', 'updated_at'], batch_size=options['batch_size'])
+        return jobs
+
+    def link_skills(self, rng, jobs, skills, options):
+        popularity = Zipf(len(skills), options['zipf'], rng)
+        most = min(options['max_skills_per_job'], len(skills))
+        Through = Job.skills.through
+        rows = (
+            Through(job_id=job.pk, skill_id=skills[rank])
+            for job in jobs
+            for rank in popularity.sample_distinct(rng.randint(1, most))
+        )
+        total = 0
+        while batch := list(itertools.islice(rows, options['batch_size'] * 4)):
+            Through.objects.bulk_create(batch)
+            total += len(batch)
+        return total
+
+    def refresh_derived(self):
+        """
+        Rebuild the search index and the read model, which the job signals
+        keep in sync and which clear() and bulk_create bypass. Rebuilding
+        the read model also resets the feed cache and in-memory skill indexes.
+        """
+        search.rebuild_index()
+        read_model.rebuild_public_jobs()
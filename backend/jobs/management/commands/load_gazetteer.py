@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs import locations
+from jobs.models import Job
+from jobs.signals import jobs_changed
+
+
+class Command(BaseCommand):
+    help = (
+        "Load locations and their aliases from a gazetteer CSV (name, region, "
+        "country, latitude, longitude, population, |-separated aliases), then "
+        "re-resolve every job's place. Loading the same file again is a no-op."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default=str(locations.DEFAULT_GAZETTEER),
+            help='Gazetteer CSV (default: the bundled jobs/data/gazetteer.csv).',
+        )
+        parser.add_argument(
+            '--no-resolve', action='store_true', help="Don't re-resolve the jobs' places.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            total = locations.load_gazetteer(locations.read_gazetteer(options['path']))
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(f"Loaded {total} locations from {options['path']}.")
+        if options['no_resolve']:
+            return
+
+        changed = locations.resolve_jobs()
+        approved = []
+        for start in range(0, len(changed), locations.BATCH_SIZE):
+            approved.extend(
+                Job.objects.filter(
+                    pk__in=changed[start:start + locations.BATCH_SIZE], status='approved'
+                ).values_list('pk', flat=True)
+            )
+        if approved:
+            jobs_changed.send(sender=Job, job_ids=approved)
+        self.stdout.write(f"Re-resolved the places of {len(changed)} jobs.")
@@ -0,0 +1,126 @@
+import http.client
+import math
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(len(ordered) * fraction) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test public job endpoints on running servers and compare their "
+        "throughput, e.g. the WSGI app under gunicorn against the async views "
+        "under an ASGI worker:\n"
+        "  gunicorn core.wsgi:application -w 4 -b 127.0.0.1:8000\n"
+        "  gunicorn core.asgi:application -w 4 -k uvicorn.workers.UvicornWorker -b 127.0.0.1:8001\n"
+        "  manage.py loadtest_public --target wsgi=http://127.0.0.1:8000/api/jobs/ "
+        "--target asgi=http://127.0.0.1:8001/api/jobs/async/"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target', action='append', required=True, metavar='NAME=URL',
+            help='Endpoint to test; repeat to compare several.',
+        )
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=64)
+        parser.add_argument('--warmup', type=int, default=50)
+        parser.add_argument(
+            '--email',
+            help='User to mint an access token for (defaults to the first active user).',
+        )
+        parser.add_argument('--token', help='Access token to send instead of minting one.')
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options['target']:
+            name, sep, url = target.partition('=')
+            if not sep or not urlsplit(url).netloc:
+                raise CommandError(f"Expected NAME=URL, got '{target}'.")
+            targets.append((name, url))
+
+        token = options['token'] or self.mint_token(options['email'])
+
+        self.stdout.write(
+            f"{options['requests']} requests per target, concurrency {options['concurrency']}"
+        )
+        self.stdout.write(
+            f"{'target':<12} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}"
+        )
+        for name, url in targets:
+            self.run(url, token, options['warmup'], options['concurrency'])
+            elapsed, latencies, errors = self.run(
+                url, token, options['requests'], options['concurrency']
+            )
+            if not latencies:
+                raise CommandError(f'{name}: every request failed ({errors} errors).')
+            self.stdout.write(
+                f"{name:<12} {len(latencies) / elapsed:>9.1f} "
+                f"{statistics.median(latencies):>9.2f} "
+                f"{percentile(latencies, 0.95):>9.2f} "
+                f"{percentile(latencies, 0.99):>9.2f} {errors:>7}"
+            )
+
+    def mint_token(self, email):
+        users = User.objects.filter(is_active=True).order_by('id')
+        user = users.filter(email=email).first() if email else users.first()
+        if user is None:
+            raise CommandError('No user to authenticate as; pass --email or --token.')
+        return str(RefreshToken.for_user(user).access_token)
+
+    def run(self, url, token, total, concurrency):
+        """Send ``total`` GETs over ``concurrency`` keep-alive connections."""
+        parts = urlsplit(url)
+        path = parts.path + (f'?{parts.query}' if parts.query else '')
+        connection_class = (
+            http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        )
+        headers = {'Authorization': f'Bearer {token}'}
+        remaining = iter(range(total))
+        lock = threading.Lock()
+        latencies = []
+        errors = 0
+
+        def worker():
+            nonlocal errors
+            conn = connection_class(parts.netloc, timeout=30)
+            try:
+                while True:
+                    with lock:
+                        if next(remaining, None) is None:
+                            return
+                    start = time.perf_counter()
+                    try:
+                        conn.request('GET', path, headers=headers)
+                        response = conn.getresponse()
+                        response.read()
+                        ok = response.status == 200
+                    except (OSError, http.client.HTTPException):
+                        conn.close()
+                        conn = connection_class(parts.netloc, timeout=30)
+                        ok = False
+                    elapsed = (time.perf_counter() - start) * 1000
+                    with lock:
+                        if ok:
+                            latencies.append(elapsed)
+                        else:
+                            errors += 1
+            finally:
+                conn.close()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for _ in range(concurrency):
+                pool.submit(worker)
+        return time.perf_counter() - start, latencies, errors
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs.read_model import rebuild_public_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the PublicJob read model from the approved jobs, e.g. after "
+        "jobs were changed outside the API."
+    )
+
+    def handle(self, *args, **options):
+        total = rebuild_public_jobs()
+        self.stdout.write(f"Rebuilt the public feed with {total} jobs.")
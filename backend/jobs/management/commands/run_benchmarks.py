@@ -0,0 +1,328 @@
+import json
+import math
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from unittest import mock
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from accounts import urls as accounts_urls
+from accounts.models import User
+from accounts.tokens import ClaimsRefreshToken
+from accounts.views import LoginView, RegisterView
+from jobs import feed_cache
+from jobs import urls as jobs_urls
+from jobs.management.commands.generate_dataset import EMAIL_DOMAIN, PASSWORD
+from jobs.models import Job, PublicJob
+
+# Bump when scenarios change so results files aren't compared across versions.
+SUITE_VERSION = 1
+
+
+class Scenario:
+    """
+    One request to benchmark. ``route`` is the URL pattern it covers; writes
+    are rolled back after every request.
+    """
+
+    def __init__(self, name, route, method, path, user=None, data=None, write=False,
+                 repeat=None, cold=False):
+        self.name = name
+        self.route = route
+        self.method = method
+        self.path = path
+        self.user = user
+        self.data = data
+        self.write = write
+        self.repeat = repeat
+        # Bump the feed cache version before each request.
+        self.cold = cold
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(len(ordered) * fraction) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every URL in jobs/urls.py and accounts/urls.py in process "
+        "against the current database (see generate_dataset). Reports p50/p95/p99 "
+        "latency, queries per request and peak traced memory per scenario and "
+        "writes them to a JSON file that can be diffed, or compared with "
+        "--compare, between commits. Writes are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--output', default='benchmark-results.json')
+        parser.add_argument('--compare', help='Earlier results file to print deltas against.')
+        parser.add_argument('--only', help='Run scenarios whose name contains this text.')
+
+    def handle(self, *args, **options):
+        scenarios = self.build_scenarios()
+        self.check_coverage(scenarios)
+        if options['only']:
+            scenarios = [s for s in scenarios if options['only'] in s.name]
+
+        results = {}
+        with ExitStack() as stack:
+            stack.enter_context(override_settings(ALLOWED_HOSTS=['testserver']))
+            # Login/registration throttles would turn repeated runs into 429s.
+            for view in (LoginView, RegisterView):
+                stack.enter_context(mock.patch.object(view, 'throttle_classes', []))
+            for scenario in scenarios:
+                results[scenario.name] = self.measure(scenario, options)
+                self.report(scenario.name, results[scenario.name])
+
+        previous = None
+        if options['compare']:
+            previous = json.loads(Path(options['compare']).read_text())['scenarios']
+            self.compare(results, previous)
+
+        payload = {
+            'suite_version': SUITE_VERSION,
+            'meta': self.metadata(options),
+            'scenarios': results,
+        }
+        Path(options['output']).write_text(json.dumps(payload, indent=2, sort_keys=True) + '\n')
+        self.stdout.write(f"Wrote {options['output']}")
+
+    # Scenarios
+
+    def build_scenarios(self):
+        company = (
+            User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}', job__status='approved')
+            .order_by('id').first()
+        )
+        admin = User.objects.filter(role='admin', is_staff=True, is_active=True).first()
+        if company is None:
+            raise CommandError('No generated data; run "manage.py generate_dataset" first.')
+        if admin is None:
+            admin = User.objects.create_superuser(
+                email=f'bench-admin@{EMAIL_DOMAIN}', password=PASSWORD
+            )
+
+        own_job = Job.objects.filter(company=company).order_by('-id').first()
+        public_job = PublicJob.objects.order_by('-created_at').first()
+        pending = list(
+            Job.objects.filter(status='pending').order_by('id').values_list('id', flat=True)[:100]
+        )
+        last_page = max(1, PublicJob.objects.count() // settings.REST_FRAMEWORK['PAGE_SIZE'])
+        new_job = {
+            'title': 'Benchmark Engineer', 'job_type': 'full_time',
+            'location': 'Kochi, India', 'skills': ['Python', 'Django', 'Benchmarking'],
+        }
+
+        return [
+            Scenario('register', 'register/', 'post', '/api/register/', data={
+                'email': 'bench-register@example.com', 'full_name': 'Bench',
+                'password': PASSWORD, 'role': 'company',
+            }, write=True, repeat=10),
+            Scenario('login', 'login/', 'post', '/api/login/',
+                     data={'email': company.email, 'password': PASSWORD}, repeat=10),
+            Scenario('profile', 'profile/', 'get', '/api/profile/', user=company),
+            Scenario('profile update', 'profile/', 'patch', '/api/profile/', user=company,
+                     data={'full_name': company.full_name}, write=True),
+            Scenario('logout', 'logout/', 'post', '/api/logout/', user=company,
+                     data=lambda: {'refresh': str(ClaimsRefreshToken.for_user(company))},
+                     write=True),
+            Scenario('token refresh', 'token/refresh/', 'post', '/api/token/refresh/',
+                     data={'refresh': str(ClaimsRefreshToken.for_user(company))}),
+
+            Scenario('company list', 'company/jobs/', 'get', '/api/company/jobs/', user=company),
+            Scenario('company list cursor', 'company/jobs/', 'get',
+                     '/api/company/jobs/?pagination=cursor', user=company),
+            Scenario('company create', 'company/jobs/create/', 'post',
+                     '/api/company/jobs/create/', user=company, data=new_job, write=True),
+            Scenario('company bulk create 50', 'company/jobs/bulk-create/', 'post',
+                     '/api/company/jobs/bulk-create/', user=company, data=[new_job] * 50,
+                     write=True, repeat=10),
+            Scenario('company job detail', 'company/jobs/<int:pk>/', 'get',
+                     f'/api/company/jobs/{own_job.pk}/', user=company),
+            Scenario('company job update', 'company/jobs/<int:pk>/', 'patch',
+                     f'/api/company/jobs/{own_job.pk}/', user=company,
+                     data={'title': own_job.title}, write=True),
+            Scenario('job update view', 'job/<int:pk>/update/', 'get',
+                     f'/api/job/{own_job.pk}/update/', user=company),
+            Scenario('job delete', 'job/<int:pk>/delete/', 'delete',
+                     f'/api/job/{own_job.pk}/delete/', user=company, write=True),
+
+            Scenario('admin list', 'admin/jobs/', 'get', '/api/admin/jobs/', user=admin),
+            Scenario('admin list pending', 'admin/jobs/', 'get',
+                     '/api/admin/jobs/?status=pending', user=admin),
+            Scenario('admin export ndjson', 'admin/jobs/export/', 'get',
+                     '/api/admin/jobs/export/', user=admin, repeat=3),
+            Scenario('admin verify', 'admin/jobs/<int:pk>/verify/', 'patch',
+                     f'/api/admin/jobs/{pending[0]}/verify/', user=admin,
+                     data={'action': 'approve'}, write=True),
+            Scenario('admin bulk verify 100', 'admin/jobs/verify/', 'post',
+                     '/api/admin/jobs/verify/', user=admin,
+                     data={'ids': pending, 'action': 'approve'}, write=True),
+            Scenario('admin feed cache stats', 'admin/jobs/feed-cache/', 'get',
+                     '/api/admin/jobs/feed-cache/', user=admin),
+
+            Scenario('public list', 'jobs/', 'get', '/api/jobs/', user=company, cold=True),
+            Scenario('public list cached', 'jobs/', 'get', '/api/jobs/', user=company),
+            Scenario('public list last page', 'jobs/', 'get', f'/api/jobs/?page={last_page}',
+                     user=company, cold=True),
+            Scenario('public list cursor', 'jobs/', 'get', '/api/jobs/?pagination=cursor',
+                     user=company, cold=True),
+            Scenario('public list location', 'jobs/', 'get', '/api/jobs/?location=bangalore',
+                     user=company, cold=True),
+            Scenario('public list place', 'jobs/', 'get', '/api/jobs/?place=bengaluru',
+                     user=company, cold=True),
+            Scenario('public list near', 'jobs/', 'get',
+                     '/api/jobs/?near=kochi&radius_km=250', user=company, cold=True),
+            Scenario('public list skill', 'jobs/', 'get', '/api/jobs/?skill=python',
+                     user=company, cold=True),
+            Scenario('public list search', 'jobs/', 'get', '/api/jobs/?q=senior%20backend',
+                     user=company, cold=True),
+            Scenario('public list async', 'jobs/async/', 'get', '/api/jobs/async/', user=company),
+            Scenario('public facets', 'jobs/facets/', 'get', '/api/jobs/facets/', user=company,
+                     cold=True),
+            Scenario('public job detail', 'jobs/<int:pk>/', 'get', f'/api/jobs/{public_job.pk}/',
+                     user=company),
+            Scenario('skill suggest', 'skills/suggest/', 'get', '/api/skills/suggest/?prefix=py',
+                     user=company),
+            Scenario('skill suggest 1 letter', 'skills/suggest/', 'get',
+                     '/api/skills/suggest/?prefix=s&limit=50', user=company),
+            Scenario('job matching', 'jobs/matching/', 'get',
+                     '/api/jobs/matching/?skills=python,django,react', user=company),
+        ]
+
+    def check_coverage(self, scenarios):
+        covered = {scenario.route for scenario in scenarios}
+        routes = [
+            str(pattern.pattern)
+            for module in (accounts_urls, jobs_urls)
+            for pattern in module.urlpatterns
+        ]
+        missing = [route for route in routes if route not in covered]
+        if missing:
+            self.stderr.write(f"No benchmark scenario for: {', '.join(missing)}")
+
+    # Measuring
+
+    def client_for(self, user):
+        client = APIClient()
+        if user is not None:
+            token = ClaimsRefreshToken.for_user(user).access_token
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    @contextmanager
+    def rollback(self, scenario):
+        if not scenario.write:
+            yield
+            return
+        with transaction.atomic():
+            yield
+            transaction.set_rollback(True)
+
+    def request(self, client, scenario):
+        if scenario.cold:
+            feed_cache.bump_version()
+        data = scenario.data() if callable(scenario.data) else scenario.data
+        with self.rollback(scenario):
+            response = getattr(client, scenario.method)(scenario.path, data, format='json')
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+        return response
+
+    def measure(self, scenario, options):
+        client = self.client_for(scenario.user)
+        repeat = scenario.repeat or options['repeat']
+
+        for _ in range(max(1, options['warmup'])):
+            response = self.request(client, scenario)
+        if response.status_code >= 400:
+            self.stderr.write(f"{scenario.name}: HTTP {response.status_code}")
+
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            self.request(client, scenario)
+            samples.append((time.perf_counter() - started) * 1000)
+
+        # Queries and memory are measured on one extra request, since both
+        # kinds of tracing slow requests down.
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as queries:
+            self.request(client, scenario)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            'method': scenario.method.upper(),
+            'path': scenario.path,
+            'status': response.status_code,
+            'requests': repeat,
+            'p50_ms': round(statistics.median(samples), 3),
+            'p95_ms': round(percentile(samples, 0.95), 3),
+            'p99_ms': round(percentile(samples, 0.99), 3),
+            'queries': len(queries),
+            'peak_kib': round(peak / 1024, 1),
+        }
+
+    # Output
+
+    def report(self, name, result):
+        self.stdout.write(
+            f"{name:<28} {result['status']:>3} p50 {result['p50_ms']:8.2f}ms "
+            f"p95 {result['p95_ms']:8.2f}ms p99 {result['p99_ms']:8.2f}ms "
+            f"queries {result['queries']:>3} peak {result['peak_kib']:9.1f}KiB"
+        )
+
+    def compare(self, results, previous):
+        self.stdout.write('\nChange vs. previous run (p50, p95, queries, peak memory):')
+        for name, result in results.items():
+            before = previous.get(name)
+            if before is None:
+                self.stdout.write(f"{name:<28} new")
+                continue
+
+            def delta(key):
+                if not before[key]:
+                    return f"{result[key]:>8}"
+                return f"{(result[key] - before[key]) / before[key]:+8.1%}"
+
+            self.stdout.write(
+                f"{name:<28} {delta('p50_ms')} {delta('p95_ms')} "
+                f"{result['queries'] - before['queries']:+4d} {delta('peak_kib')}"
+            )
+
+    def metadata(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                cwd=settings.BASE_DIR, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'created': datetime.now(dt_timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'repeat': options['repeat'],
+            'dataset': {
+                'users': User.objects.count(),
+                'jobs': Job.objects.count(),
+                'public_jobs': PublicJob.objects.count(),
+            },
+        }
@@ -0,0 +1,39 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from jobs import feed_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database onto every file in DATABASE_REPLICAS "
+        "with SQLite's online backup API, which gives a consistent snapshot "
+        "while the primary keeps serving writes. Stands in for replication "
+        "when running replicas locally; run it from cron to bound their lag."
+    )
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError('No replicas configured; set DATABASE_REPLICAS in .env.')
+
+        primary = settings.DATABASES['default']['NAME']
+        for alias in settings.DATABASE_REPLICAS:
+            # The alias opens the file read-only; write it through its own path.
+            path = settings.DATABASES[alias]['NAME'].removeprefix('file:').removesuffix('?mode=ro')
+            connections[alias].close()
+            started = time.perf_counter()
+            source = sqlite3.connect(primary)
+            target = sqlite3.connect(path)
+            try:
+                with target:
+                    source.backup(target)
+            finally:
+                source.close()
+                target.close()
+            self.stdout.write(f'{alias}: copied to {path} in {time.perf_counter() - started:.2f}s')
+        # Feed pages cached from the replicas may predate the copy.
+        feed_cache.bump_version()
@@ -0,0 +1,280 @@
+"""
+Skill-overlap job matching over an in-memory inverted index.
+
+``/api/jobs/matching/?skills=python,django`` ranks the approved jobs by how
+many of the given skills they list, newest first among equals. Instead of a
+``GROUP BY`` over the skills join, each process keeps an inverted index
+built from the ``PublicJob`` read model (one table scan, no joins):
+
+* every indexed job has a slot. Slots below ``ordered`` are sorted by
+  ``(created_at, id)``, so a higher slot is a newer job. Jobs added since
+  the last build that are older than the newest one go to an unordered
+  tail after them, which is kept short by rebuilding;
+* every skill, by normalized name, has a posting bitmap: a Python int with
+  bit ``slot`` set for each of its jobs. 500k jobs take 62 KiB per skill
+  and the bitwise operations run in C.
+
+A query adds up the bitmaps of its skills in bit-sliced form (``planes[i]``
+holds bit ``i`` of each job's match count), derives the bitmap of jobs
+matching exactly ``c`` skills for ``c`` from ``len(skills)`` down, and
+takes the highest set bits of each level (plus its tail slots, sorted)
+until it has ``limit`` jobs. Ranking doesn't touch the database.
+
+``read_model.sync_public_jobs`` passes every read-model row it rewrites
+(approvals, edits, rejections, deletes, renames) to ``jobs_changed``, which
+updates the bitmaps in place once the transaction commits; other processes
+rebuild, always from the primary (see ``jobs.local_index``).
+"""
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db import transaction
+
+from .local_index import LocalIndex
+from .models import PublicJob, Skill
+
+GENERATION_KEY = 'jobs:matching:generation'
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+MAX_SKILLS = 20
+
+# Rebuild once this many slots are out of order, or once this share of the
+# slots belongs to jobs that left the feed.
+MAX_TAIL = 4096
+MAX_REMOVED_SHARE = 0.25
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _timestamp(value):
+    return (value - _EPOCH) // _MICROSECOND
+
+
+# int.bit_count() is Python 3.10+.
+_popcount = getattr(int, 'bit_count', None) or (lambda bitmap: bin(bitmap).count('1'))
+
+
+def _bitmap(slots, size):
+    bits = bytearray((size + 7) // 8)
+    for slot in slots:
+        bits[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _set_bits(bitmap):
+    """Positions of the set bits of a small bitmap, highest first."""
+    found = []
+    while bitmap:
+        top = bitmap.bit_length() - 1
+        found.append(top)
+        bitmap ^= 1 << top
+    return found
+
+
+def _highest_bits(bitmap, count, below):
+    """Positions of the ``count`` highest set bits under ``below``, highest first."""
+    found = []
+    end = min(bitmap.bit_length(), below)
+    window = 4096
+    while end > 0 and len(found) < count:
+        start = max(0, end - window)
+        chunk = (bitmap >> start) & ((1 << (end - start)) - 1)
+        found.extend(start + position for position in _set_bits(chunk)[:count - len(found)])
+        end = start
+        # Sparse bitmaps: look further back at a time.
+        window *= 2
+    return found
+
+
+class MatchingIndex(LocalIndex):
+    generation_key = GENERATION_KEY
+    sync_interval = settings.JOBS_MATCHING_SYNC_INTERVAL
+
+    def __init__(self):
+        super().__init__()
+        self._reset()
+
+    def _reset(self):
+        self._postings = {}        # normalized skill name -> bitmap of slots
+        self._ids = array('q')     # slot -> job id, -1 once the job left the feed
+        self._keys = array('q')    # slot -> created_at, microseconds since the epoch
+        self._slots = {}           # job id -> slot, for the jobs still in the feed
+        self._ordered = 0          # slots below this are in (created_at, id) order
+        self._removed = 0
+        self._names = {}           # skill name -> normalized name
+
+    def __len__(self):
+        return len(self._ids) - self._removed
+
+    # Building
+
+    def _rebuild(self):
+        rows = (
+            PublicJob.objects.order_by('created_at', 'id')
+            .values_list('id', 'created_at', 'skills')
+            .iterator(chunk_size=5000)
+        )
+        self.load(rows)
+
+    def load(self, rows):
+        """Index ``(id, created_at, skills)`` rows sorted by ``(created_at, id)``."""
+        self._reset()
+        slots_by_skill = {}
+        for job_id, created_at, skills in rows:
+            slot = len(self._ids)
+            self._ids.append(job_id)
+            self._keys.append(_timestamp(created_at))
+            self._slots[job_id] = slot
+            for key in self._skill_keys(skills):
+                slots_by_skill.setdefault(key, []).append(slot)
+        self._ordered = len(self._ids)
+        self._postings = {
+            key: _bitmap(slots, len(self._ids)) for key, slots in slots_by_skill.items()
+        }
+
+    def _skill_keys(self, skills):
+        """Normalized names of a newline-joined ``PublicJob.skills`` value."""
+        keys = set()
+        for name in skills.split('\n'):
+            key = self._names.get(name)
+            if key is None:
+                key = self._names[name] = Skill.normalize(name)
+            if key:
+                keys.add(key)
+        return keys
+
+    def _slot(self, job_id):
+        return self._slots.get(job_id, -1)
+
+    def _append(self, job_id, key):
+        slot = len(self._ids)
+        in_order = self._ordered == slot and (
+            slot == 0 or (key, job_id) > (self._keys[slot - 1], self._ids[slot - 1])
+        )
+        self._ids.append(job_id)
+        self._keys.append(key)
+        self._slots[job_id] = slot
+        if in_order:
+            self._ordered += 1
+        return slot
+
+    def _needs_rebuild(self):
+        return (
+            len(self._ids) - self._ordered > MAX_TAIL
+            or self._removed > max(MAX_TAIL, MAX_REMOVED_SHARE * len(self._ids))
+        )
+
+    # Incremental updates
+
+    def apply(self, before, after):
+        """
+        Replace read-model rows: ``before`` maps the ids of the rows that
+        existed to their ``skills``, ``after`` maps the ids of the rows that
+        exist now to ``(created_at, skills)``.
+        """
+        with self._lock:
+            if not self.built:
+                return
+            for job_id, skills in before.items():
+                slot = self._slot(job_id)
+                if slot < 0:
+                    # Indexed from a different state than the one being changed.
+                    self.built = False
+                    break
+                mask = ~(1 << slot)
+                for key in self._skill_keys(skills):
+                    bitmap = self._postings.get(key, 0) & mask
+                    if bitmap:
+                        self._postings[key] = bitmap
+                    else:
+                        self._postings.pop(key, None)
+                if job_id not in after:
+                    self._ids[slot] = -1
+                    del self._slots[job_id]
+                    self._removed += 1
+            else:
+                for job_id, (created_at, skills) in after.items():
+                    slot = self._slot(job_id)
+                    if slot < 0:
+                        slot = self._append(job_id, _timestamp(created_at))
+                    bit = 1 << slot
+                    for key in self._skill_keys(skills):
+                        self._postings[key] = self._postings.get(key, 0) | bit
+            self._changed()
+
+    # Queries
+
+    def match(self, names, limit=DEFAULT_LIMIT):
+        """
+        ``([(job id, matched skills), ...], total)``: the ``limit`` best
+        matches for the skill ``names``, and how many jobs match at least one.
+        """
+        self.sync()
+        with self._lock:
+            if self._needs_rebuild():
+                self._rebuild_from_primary()
+            keys = {Skill.normalize(name) for name in names} - {''}
+            bitmaps = [self._postings[key] for key in keys if key in self._postings]
+            if not bitmaps:
+                return [], 0
+
+            planes = []
+            for bitmap in bitmaps:
+                carry = bitmap
+                for i, plane in enumerate(planes):
+                    planes[i] = plane ^ carry
+                    carry &= plane
+                    if not carry:
+                        break
+                else:
+                    planes.append(carry)
+            matching = 0
+            for bitmap in bitmaps:
+                matching |= bitmap
+
+            results = []
+            # No job matches more skills than the planes can count.
+            top = min(len(bitmaps), (1 << len(planes)) - 1)
+            for count in range(top, 0, -1):
+                level = matching
+                for i, plane in enumerate(planes):
+                    # level ^ (level & plane) is level & ~plane without
+                    # negating a big int.
+                    level = level & plane if count >> i & 1 else level ^ (level & plane)
+                if not level:
+                    continue
+                needed = limit - len(results)
+                slots = _highest_bits(level, needed, below=self._ordered)
+                tail = level >> self._ordered
+                if tail:
+                    slots += [self._ordered + slot for slot in _set_bits(tail)]
+                    slots.sort(key=lambda slot: (self._keys[slot], self._ids[slot]), reverse=True)
+                results.extend((self._ids[slot], count) for slot in slots[:needed])
+                if len(results) >= limit:
+                    break
+            return results, _popcount(matching)
+
+    def memory(self):
+        """Approximate bytes held by the postings, slot arrays and slot map."""
+        arrays = (self._ids, self._keys)
+        return (
+            sum((bitmap.bit_length() + 7) // 8 for bitmap in self._postings.values())
+            + sum(len(values) * values.itemsize for values in arrays)
+            + sys.getsizeof(self._slots)
+        )
+
+
+index = MatchingIndex()
+
+
+def jobs_changed(before, after):
+    """Apply rewritten read-model rows (see ``MatchingIndex.apply``) on commit."""
+    transaction.on_commit(lambda: index.apply(before, after))
+
+
+def invalidate():
+    transaction.on_commit(index.invalidate)
@@ -0,0 +1,41 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE jobs_job_fts USING fts5("
+        "title, location, company_name, skills, tokenize='trigram')"
+    )
+    schema_editor.execute(
+        """
+        INSERT INTO jobs_job_fts (rowid, title, location, company_name, skills)
+        SELECT j.id, j.title, j.location, u.full_name,
+               COALESCE((
+                   SELECT group_concat(s.name, char(31))
+                   FROM jobs_job_skills js
+                   JOIN jobs_skill s ON s.id = js.skill_id
+                   WHERE js.job_id = j.id
+               ), '')
+        FROM jobs_job j
+        JOIN accounts_user u ON u.id = j.company_id
+        """
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS jobs_job_fts")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("jobs", "0001_initial"),
+        ("accounts", "0002_alter_user_groups_alter_user_user_permissions"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations, models
+
+
+def normalize(name):
+    return " ".join(name.split()).casefold()
+
+
+def merge_duplicate_skills(apps, schema_editor):
+    """
+    Fold skills whose names only differ by case or whitespace into the oldest
+    one, moving their job links over.
+    """
+    Skill = apps.get_model("jobs", "Skill")
+    Through = apps.get_model("jobs", "Job").skills.through
+
+    survivors = {}
+    for skill in Skill.objects.order_by("id"):
+        key = normalize(skill.name)
+        survivor = survivors.get(key)
+        if survivor is None:
+            skill.name = " ".join(skill.name.split())
+            skill.normalized_name = key
+            survivors[key] = skill
+            continue
+
+        linked = set(
+            Through.objects.filter(skill_id=survivor.pk).values_list("job_id", flat=True)
+        )
+        Through.objects.filter(skill_id=skill.pk, job_id__in=linked).delete()
+        Through.objects.filter(skill_id=skill.pk).update(skill_id=survivor.pk)
+        skill.delete()
+
+    for skill in survivors.values():
+        skill.save(update_fields=["name", "normalized_name"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("jobs", "0003_job_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="skill",
+            name="normalized_name",
+            field=models.CharField(max_length=50, null=True),
+        ),
+        migrations.RunPython(merge_duplicate_skills, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="skill",
+            name="normalized_name",
+            field=models.CharField(max_length=50, unique=True),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:42
+
+from django.db import migrations, models
+
+
+def populate_public_jobs(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    PublicJob = apps.get_model("jobs", "PublicJob")
+    Through = Job.skills.through
+
+    skills = {}
+    rows = (
+        Through.objects.filter(job__status="approved")
+        .order_by("skill__name")
+        .values_list("job_id", "skill__name")
+    )
+    for job_id, name in rows:
+        skills.setdefault(job_id, []).append(name)
+
+    jobs = Job.objects.filter(status="approved").values(
+        "id", "title", "company__full_name", "job_type", "location", "created_at", "updated_at"
+    )
+    PublicJob.objects.bulk_create(
+        (
+            PublicJob(
+                id=job["id"],
+                title=job["title"],
+                company_name=job["company__full_name"],
+                job_type=job["job_type"],
+                location=job["location"],
+                skills="\n".join(skills.get(job["id"], [])),
+                created_at=job["created_at"],
+                updated_at=job["updated_at"],
+            )
+            for job in jobs.iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0005_job_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PublicJob",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=255)),
+                ("company_name", models.CharField(max_length=255)),
+                ("job_type", models.CharField(max_length=20)),
+                ("location", models.CharField(max_length=100)),
+                ("skills", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["created_at"], name="publicjob_created_idx"),
+                    models.Index(
+                        fields=["job_type", "created_at"],
+                        name="publicjob_type_created_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(populate_public_jobs, migrations.RunPython.noop),
+    ]
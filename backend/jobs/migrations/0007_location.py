@@ -0,0 +1,104 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0006_publicjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Location",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                ("region", models.CharField(blank=True, max_length=100)),
+                ("country", models.CharField(max_length=100)),
+                ("latitude", models.FloatField()),
+                ("longitude", models.FloatField()),
+                ("population", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="LocationAlias",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("normalized_name", models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="locationalias",
+            name="location",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="aliases",
+                to="jobs.location",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="location",
+            index=models.Index(
+                fields=["latitude", "longitude"], name="location_lat_lng_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="location",
+            constraint=models.UniqueConstraint(
+                fields=("name", "region", "country"), name="location_unique_name"
+            ),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="place",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="jobs",
+                to="jobs.location",
+            ),
+        ),
+        migrations.AddField(
+            model_name="publicjob",
+            name="place",
+            field=models.ForeignKey(
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="jobs.location",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="locationalias",
+            constraint=models.UniqueConstraint(
+                fields=("normalized_name", "location"), name="location_alias_unique"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="publicjob",
+            index=models.Index(
+                fields=["place", "created_at"], name="publicjob_place_created_idx"
+            ),
+        ),
+    ]
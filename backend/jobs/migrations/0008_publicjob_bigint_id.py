@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0007_location"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="publicjob",
+            name="id",
+            field=models.BigIntegerField(primary_key=True, serialize=False),
+        ),
+    ]
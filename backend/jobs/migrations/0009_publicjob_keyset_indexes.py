@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0008_publicjob_bigint_id"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="publicjob",
+            name="publicjob_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="publicjob",
+            name="publicjob_type_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="publicjob",
+            name="publicjob_place_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="publicjob",
+            index=models.Index(
+                fields=["created_at", "id"], name="publicjob_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="publicjob",
+            index=models.Index(
+                fields=["job_type", "created_at", "id"],
+                name="publicjob_type_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="publicjob",
+            index=models.Index(
+                fields=["place", "created_at", "id"], name="publicjob_place_created_idx"
+            ),
+        ),
+    ]
@@ -3,9 +3,72 @@ from accounts.models import User
 # Create your models here.
 class Skill(models.Model):
     name = models.CharField(max_length=50, unique=True)
+    # Case- and whitespace-insensitive identity, so "Python", "python " and
+    # "PYTHON" are one skill.
+    normalized_name = models.CharField(max_length=50, unique=True)
 
     def __str__(self):
         return self.name
+
+    @staticmethod
+    def clean_name(name):
+        return ' '.join(name.split())
+
+    @classmethod
+    def normalize(cls, name):
+        return cls.clean_name(name).casefold()
+
+    def save(self, *args, **kwargs):
+        self.name = self.clean_name(self.name)
+        self.normalized_name = self.normalize(self.name)
+        super().save(*args, **kwargs)
+
+
+class Location(models.Model):
+    """
+    A place from the gazetteer (see ``jobs.locations``). Jobs are resolved to
+    one from their free-text ``location``.
+    """
+    name = models.CharField(max_length=100)
+    region = models.CharField(max_length=100, blank=True)
+    country = models.CharField(max_length=100)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    # Picks the likelier place when a name is ambiguous.
+    population = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['name', 'region', 'country'], name='location_unique_name'
+            ),
+        ]
+        indexes = [
+            # Bounding-box prefilter of the radius search.
+            models.Index(fields=['latitude', 'longitude'], name='location_lat_lng_idx'),
+        ]
+
+    def __str__(self):
+        return ', '.join(part for part in (self.name, self.region, self.country) if part)
+
+
+class LocationAlias(models.Model):
+    """A normalized name a location is known by, including its own."""
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='aliases')
+    normalized_name = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [
+            # Also the index aliases are looked up by.
+            models.UniqueConstraint(
+                fields=['normalized_name', 'location'], name='location_alias_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return self.normalized_name
+
+
 class Job(models.Model):
     JOB_TYPE_CHOICES = (
         ('full_time', 'Full Time'),
@@ -20,15 +83,102 @@ class Job(models.Model):
     )
 
     title = models.CharField(max_length=255)
-    company = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Covered by the composite indexes below, which all lead with company.
+    company = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     job_type = models.CharField(max_length=20, choices=JOB_TYPE_CHOICES)
     location = models.CharField(max_length=100)
+    # ``location`` resolved against the gazetteer; null if it didn't match.
+    place = models.ForeignKey(
+        Location, null=True, blank=True, on_delete=models.SET_NULL, related_name='jobs'
+    )
     skills = models.ManyToManyField(Skill, blank=True)
     status = models.CharField(
         max_length=20,
         choices=[('pending','Pending'),('approved','Approved'),('rejected','Rejected')]
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped on every write, including status changes; drives ETag and
+    # Last-Modified. Queryset .update() calls must set it explicitly.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        job = super().from_db(db, field_names, values)
+        # The status as loaded, so post_save can tell a job leaving the
+        # public feed from one that was never in it (see jobs.signals).
+        if 'status' in field_names:
+            job._loaded_status = values[field_names.index('status')]
+        return job
+
+    class Meta:
+        # Designed from the list views' access patterns; every list is ordered
+        # by recency and SQLite appends the rowid (id) to each index, so they
+        # also serve the (created_at, id) keyset ordering.
+        indexes = [
+            # Public feed: status='approved' ORDER BY created_at.
+            models.Index(fields=['status', 'created_at'], name='job_status_created_idx'),
+            # Public feed filtered by job_type.
+            models.Index(
+                fields=['status', 'job_type', 'created_at'],
+                name='job_status_type_created_idx',
+            ),
+            # Max(updated_at) of the public feed for conditional requests.
+            models.Index(fields=['status', 'updated_at'], name='job_status_updated_idx'),
+            # Admin list without filters.
+            models.Index(fields=['created_at'], name='job_created_idx'),
+            # Company dashboard: company=user ORDER BY created_at.
+            models.Index(fields=['company', 'created_at'], name='job_company_created_idx'),
+            # Admin list filtered by company email and status.
+            models.Index(
+                fields=['company', 'status', 'created_at'],
+                name='job_company_status_idx',
+            ),
+        ]
+
+
+class PublicJob(models.Model):
+    """
+    Read model of the public feed: one row per approved job, with the company
+    name and skill names copied in so the feed is served from this table
+    alone. Kept in sync by ``jobs.read_model``; never written directly.
+    """
+    # The job's id; also the rowid the search index is keyed by.
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    company_name = models.CharField(max_length=255)
+    job_type = models.CharField(max_length=20)
+    location = models.CharField(max_length=100)
+    # The job's place, for the exact-location and radius filters.
+    place = models.ForeignKey(
+        Location, null=True, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+'
+    )
+    # Skill names, sorted and separated by newlines.
+    skills = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    # The job's updated_at.
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        # id is not the rowid (it's a bigint), so it's spelled out for the
+        # (-created_at, -id) order to come from the index without a sort.
+        indexes = [
+            # The feed, newest first, with and without a job_type filter.
+            models.Index(fields=['created_at', 'id'], name='publicjob_created_idx'),
+            models.Index(
+                fields=['job_type', 'created_at', 'id'], name='publicjob_type_created_idx'
+            ),
+            # The feed filtered to one or more places.
+            models.Index(
+                fields=['place', 'created_at', 'id'], name='publicjob_place_created_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    @property
+    def skill_names(self):
+        return self.skills.split('\n') if self.skills else []
 
 # class Skill(models.Model):
 #     name = models.CharField(max_length=50, unique=True)
@@ -0,0 +1,184 @@
+"""
+Pagination for the job list views.
+
+Offset paging (``?page=N``) stays the default. Clients can opt in to keyset
+paging with ``?pagination=cursor`` and then follow the ``next``/``previous``
+links, which carry an opaque ``cursor``. Keyset pages are ordered newest
+first on ``(created_at, id)``, seek straight to the cursor position through
+the index instead of using OFFSET, and skip the COUNT query. Rows inserted or
+approved after a cursor was issued sort by their own ``created_at``, so they
+never shift the rows of later pages.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from functools import partial
+
+from django.core.paginator import Paginator as DjangoPaginator
+from django.utils.encoding import force_str
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        position = self.decode_cursor(request)
+
+        if position is None:
+            reverse = False
+            queryset = queryset.order_by('-created_at', '-id')
+        else:
+            created_at, pk, reverse = position
+            queryset = self.seek(queryset, created_at, pk, reverse)
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.first = rows[0] if rows else None
+        self.last = rows[-1] if rows else None
+        return rows
+
+    @staticmethod
+    def seek(queryset, created_at, pk, reverse=False):
+        """Rows strictly after ``(created_at, pk)`` in paging direction."""
+        if reverse:
+            return queryset.filter(created_at__gte=created_at).exclude(
+                created_at=created_at, id__lte=pk
+            ).order_by('created_at', 'id')
+        return queryset.filter(created_at__lte=created_at).exclude(
+            created_at=created_at, id__gte=pk
+        ).order_by('-created_at', '-id')
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or self.last is None:
+            return None
+        return self.encode_cursor(self.last, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first is None:
+            # Paged backwards past the newest row: restart from the top.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.first, reverse=True)
+
+    def encode_cursor(self, row, reverse):
+        payload = json.dumps([row.created_at.isoformat(), row.id, int(reverse)])
+        token = base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            created_at, pk, reverse = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+            return datetime.fromisoformat(created_at), int(pk), bool(reverse)
+        except (TypeError, ValueError, UnicodeEncodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description': force_str('The pagination cursor value.'),
+            'schema': {'type': 'string'},
+        }]
+
+
+class CountedPaginator(DjangoPaginator):
+    """Django paginator that can reuse a row count the view already has."""
+
+    def __init__(self, *args, count=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if count is not None:
+            self.__dict__['count'] = count
+
+
+class JobPagination(PageNumberPagination):
+    """
+    Page-number pagination that switches to keyset paging per request when
+    ``?pagination=cursor`` or a ``cursor`` is supplied.
+
+    If the view sets ``row_count`` (e.g. from its ETag aggregate), that is
+    used instead of running another COUNT query.
+    """
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.keyset_class() if self.use_keyset(request) else None
+        if self.keyset is not None:
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.django_paginator_class = partial(
+            CountedPaginator, count=getattr(view, 'row_count', None)
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': force_str("Set to 'cursor' for keyset pagination."),
+                'schema': {'type': 'string', 'enum': ['cursor']},
+            },
+        ] + self.keyset_class().get_schema_operation_parameters(view)
@@ -19,4 +19,4 @@ class IsCompany(BasePermission):
     
 class IsOwnerCompany(BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.company == request.user
+        return obj.company_id == request.user.pk
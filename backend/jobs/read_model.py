@@ -0,0 +1,128 @@
+"""
+Maintains ``PublicJob``, the denormalized read model of the public feed.
+
+``sync_public_jobs(ids)`` re-derives the rows for the given jobs: approved
+jobs are upserted with their current company name and skills, anything else
+(pending, rejected, deleted) is removed. It is driven by ``jobs_changed``
+(moderation, company edits and deletes, company renames) and by skill
+renames and deletes; see ``jobs.signals``. ``rebuild_public_jobs()``
+re-derives the whole table, for the ``rebuild_public_feed`` command. Both
+evict the cached fragments (``jobs.fragments``) of the rows they replace,
+keep the in-memory skill indexes (``jobs.suggest``, ``jobs.matching``)
+current and bump the feed cache version (``jobs.feed_cache``). The bump
+waits for the commit: a page computed from the old rows in the meantime
+must not be cached under the new version.
+"""
+from collections import Counter
+
+from django.db import transaction
+
+from . import feed_cache, fragments, matching, suggest
+from .models import Job, PublicJob, Skill
+from .serializers import PUBLIC_ROW_FIELDS
+
+BATCH_SIZE = 500
+
+SYNCED_FIELDS = [
+    'title', 'company_name', 'job_type', 'location', 'place', 'skills', 'created_at', 'updated_at',
+]
+
+
+def skill_names(job_ids):
+    """``{job id: [skill name, ...]}`` with names sorted."""
+    names = {}
+    rows = (
+        Job.skills.through.objects.filter(job_id__in=job_ids)
+        .order_by('skill__name')
+        .values_list('job_id', 'skill__name')
+    )
+    for job_id, name in rows:
+        names.setdefault(job_id, []).append(name)
+    return names
+
+
+def _build(jobs):
+    skills = skill_names([job['id'] for job in jobs])
+    return [
+        PublicJob(
+            id=job['id'],
+            title=job['title'],
+            company_name=job['company__full_name'],
+            job_type=job['job_type'],
+            location=job['location'],
+            place_id=job['place_id'],
+            skills='\n'.join(skills.get(job['id'], [])),
+            created_at=job['created_at'],
+            updated_at=job['updated_at'],
+        )
+        for job in jobs
+    ]
+
+
+def _approved(queryset):
+    return list(
+        queryset.filter(status='approved').values(
+            'id', 'title', 'company__full_name', 'job_type', 'location', 'place_id',
+            'created_at', 'updated_at',
+        )
+    )
+
+
+def _skill_counts(skill_lists):
+    """``Counter`` of normalized skill names over newline-joined ``skills`` values."""
+    return Counter(
+        Skill.normalize(name) for skills in skill_lists for name in skills.split('\n') if name
+    )
+
+
+def sync_public_jobs(job_ids):
+    job_ids = list(dict.fromkeys(job_ids))
+    if not job_ids:
+        return
+    # Skills of the rows replaced, and created_at and skills of their replacements.
+    before = {}
+    after = {}
+    with transaction.atomic():
+        for start in range(0, len(job_ids), BATCH_SIZE):
+            batch = job_ids[start:start + BATCH_SIZE]
+            rows = _build(_approved(Job.objects.filter(pk__in=batch)))
+            old = list(
+                PublicJob.objects.filter(pk__in=batch).values_list(*PUBLIC_ROW_FIELDS, named=True)
+            )
+            fragments.evict(old)
+            before.update((row.id, row.skills) for row in old)
+            after.update((row.id, (row.created_at, row.skills)) for row in rows)
+            PublicJob.objects.filter(pk__in=batch).exclude(
+                pk__in=[row.id for row in rows]
+            ).delete()
+            PublicJob.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['id'],
+                update_fields=SYNCED_FIELDS,
+            )
+        counts = _skill_counts(skills for _, skills in after.values())
+        counts.subtract(_skill_counts(before.values()))
+        suggest.counts_changed(dict(counts))
+        matching.jobs_changed(before, after)
+        transaction.on_commit(feed_cache.bump_version)
+
+
+def rebuild_public_jobs():
+    """Re-derive the whole read model; returns the number of rows."""
+    with transaction.atomic():
+        fragments.evict(PublicJob.objects.values_list(*PUBLIC_ROW_FIELDS).iterator())
+        suggest.invalidate()
+        matching.invalidate()
+        transaction.on_commit(feed_cache.bump_version)
+        PublicJob.objects.all().delete()
+        ids = Job.objects.filter(status='approved').order_by('id').values_list('id', flat=True)
+        total = 0
+        last_id = 0
+        while True:
+            batch = list(ids.filter(id__gt=last_id)[:BATCH_SIZE])
+            if not batch:
+                return total
+            PublicJob.objects.bulk_create(_build(_approved(Job.objects.filter(pk__in=batch))))
+            total += len(batch)
+            last_id = batch[-1]
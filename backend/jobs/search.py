@@ -0,0 +1,207 @@
+"""
+Full-text search over jobs backed by an SQLite FTS5 index.
+
+The index (``jobs_job_fts``) holds one row per job, keyed by the job id, with
+the title, location, company name and skill names. It uses the ``trigram``
+tokenizer so that a quoted phrase matches any case-insensitive substring,
+which keeps the results of the public ``location``/``skill`` filters the same
+as the old ``icontains`` lookups while avoiding the table scan.
+
+Terms shorter than three characters can't be expressed as trigrams, so those
+(and every term on non-SQLite databases) fall back to ``icontains``.
+"""
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from . import locations
+from .models import Job, PublicJob, Skill
+
+FTS_TABLE = 'jobs_job_fts'
+
+# Skill names are stored in one column, joined by the ASCII unit separator so
+# a phrase can never match across two skill names.
+SKILL_SEPARATOR = '\x1f'
+
+MIN_TERM_LENGTH = 3
+
+# bm25() column weights: title, location, company_name, skills.
+RANK_WEIGHTS = (10.0, 2.0, 5.0, 3.0)
+
+# Keeps each statement well below SQLite's bound-parameter limit.
+BATCH_SIZE = 500
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def _source_sql(where):
+    job_table = Job._meta.db_table
+    user_table = Job._meta.get_field('company').related_model._meta.db_table
+    through_table = Job.skills.through._meta.db_table
+    skill_table = Skill._meta.db_table
+    return f"""
+        INSERT INTO {FTS_TABLE} (rowid, title, location, company_name, skills)
+        SELECT j.id, j.title, j.location, u.full_name,
+               COALESCE((
+                   SELECT group_concat(s.name, char(31))
+                   FROM {through_table} js
+                   JOIN {skill_table} s ON s.id = js.skill_id
+                   WHERE js.job_id = j.id
+               ), '')
+        FROM {job_table} j
+        JOIN {user_table} u ON u.id = j.company_id
+        {where}
+    """
+
+
+def _batches(ids):
+    ids = list(dict.fromkeys(ids))
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield ids[start:start + BATCH_SIZE]
+
+
+def remove_jobs(job_ids):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        for batch in _batches(job_ids):
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})',
+                batch,
+            )
+
+
+def index_jobs(job_ids):
+    """Re-index the given jobs from their current database rows."""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        for batch in _batches(job_ids):
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})',
+                batch,
+            )
+            cursor.execute(
+                _source_sql(f'WHERE j.id IN ({placeholders})'),
+                batch,
+            )
+
+
+def rebuild_index():
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(_source_sql(''))
+
+
+def _phrase(term, column=None):
+    term = term.replace(SKILL_SEPARATOR, ' ').replace('"', '""')
+    phrase = f'"{term}"'
+    return f'{column} : {phrase}' if column else phrase
+
+
+def _searchable(term):
+    return is_available() and len(term) >= MIN_TERM_LENGTH
+
+
+def _related_lookups(model):
+    """Lookups for the company name and skill names, and whether they can fan out."""
+    if model is PublicJob:
+        return 'company_name', 'skills', False
+    return 'company__full_name', 'skills__name', True
+
+
+def search_jobs(queryset, location=None, skill=None, q=None, rank=True):
+    """
+    Apply the public search filters to a ``Job`` queryset.
+
+    ``location`` and ``skill`` are substring filters on a single column;
+    ``q`` matches every whitespace-separated term against any column and,
+    unless ``rank`` is false, orders the results by relevance.
+    Works on ``Job`` and ``PublicJob`` querysets, which share the index.
+    """
+    company_lookup, skill_lookup, fans_out = _related_lookups(queryset.model)
+    clauses = []
+    ranked = False
+    distinct = False
+
+    if location:
+        if _searchable(location):
+            clauses.append(_phrase(location, 'location'))
+        else:
+            queryset = queryset.filter(location__icontains=location)
+
+    if skill:
+        if _searchable(skill):
+            clauses.append(_phrase(skill, 'skills'))
+        else:
+            queryset = queryset.filter(**{f'{skill_lookup}__icontains': skill})
+            distinct = fans_out
+
+    if q:
+        for term in q.split():
+            if _searchable(term):
+                clauses.append(_phrase(term))
+                ranked = True
+            else:
+                queryset = queryset.filter(
+                    Q(title__icontains=term)
+                    | Q(location__icontains=term)
+                    | Q(**{f'{company_lookup}__icontains': term})
+                    | Q(**{f'{skill_lookup}__icontains': term})
+                )
+                distinct = fans_out
+
+    if clauses and ranked and rank:
+        # bm25() needs the index joined into the query itself.
+        job_table = queryset.model._meta.db_table
+        weights = ', '.join(str(weight) for weight in RANK_WEIGHTS)
+        queryset = queryset.extra(
+            select={'search_rank': f'bm25({FTS_TABLE}, {weights})'},
+            tables=[FTS_TABLE],
+            where=[
+                f'{FTS_TABLE}.rowid = {job_table}.id',
+                f'{FTS_TABLE} MATCH %s',
+            ],
+            params=[' AND '.join(clauses)],
+        ).order_by('search_rank', *queryset.query.order_by)
+    elif clauses:
+        # A subquery rather than a join, so the queryset can itself be used
+        # as a subquery (Django re-aliases the job table there).
+        queryset = queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [' AND '.join(clauses)],
+        ))
+
+    if distinct:
+        queryset = queryset.distinct()
+
+    return queryset
+
+
+def filter_public_jobs(queryset, query_params, rank=True):
+    """
+    The public feed filtered by the public query parameters: a ``PublicJob``
+    queryset, or a ``Job`` one restricted to approved jobs.
+    """
+    if queryset.model is Job:
+        queryset = queryset.filter(status='approved')
+
+    job_type = query_params.get('job_type')
+    if job_type:
+        queryset = queryset.filter(job_type=job_type)
+
+    queryset = locations.filter_by_place(queryset, query_params)
+
+    return search_jobs(
+        queryset,
+        location=query_params.get('location'),
+        skill=query_params.get('skill'),
+        q=query_params.get('q'),
+        rank=rank,
+    )
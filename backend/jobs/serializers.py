@@ -1,8 +1,14 @@
-from rest_framework import serializers
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 
 
 
-from .models import Job,Skill
+from . import locations, search
+from .models import Job, PublicJob, Skill
+from .skills import clean_skill_names, resolve_skills
 class AdminJobSerializer(serializers.ModelSerializer):
     company_email = serializers.CharField(
         source='company.email',
@@ -22,6 +28,18 @@ class AdminJobSerializer(serializers.ModelSerializer):
         ]
 
 
+class JobBulkVerifySerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=500
+    )
+    action = serializers.ChoiceField(choices=['approve', 'reject'])
+
+    def validate_ids(self, value):
+        return list(dict.fromkeys(value))
+
+
 class JobSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
@@ -43,7 +61,14 @@ class JobSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if request and hasattr(request, 'user'):
             validated_data['company'] = request.user
+        if 'location' in validated_data:
+            validated_data['place'] = locations.resolve(validated_data['location'])
         return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        if 'location' in validated_data:
+            validated_data['place'] = locations.resolve(validated_data['location'])
+        return super().update(instance, validated_data)
 # class PublicJobSerializer(serializers.ModelSerializer):
 #     company_name = serializers.CharField(
 #         source="company.full_name",
@@ -79,16 +104,127 @@ class PublicJobSerializer(serializers.ModelSerializer):
             'skills',
             'created_at'
         ]
+
+
+class PublicFeedSerializer(serializers.ModelSerializer):
+    """``PublicJobSerializer``'s output, read from the ``PublicJob`` read model."""
+    skills = serializers.ListField(source='skill_names', child=serializers.CharField(), read_only=True)
+
+    class Meta:
+        model = PublicJob
+        fields = [
+            'id',
+            'title',
+            'company_name',
+            'job_type',
+            'location',
+            'skills',
+            'created_at'
+        ]
+
+
+# Columns read for public_feed_rows(); updated_at is only there for the
+# list view's validators and keyset pagination.
+PUBLIC_ROW_FIELDS = (
+    'id', 'title', 'company_name', 'job_type', 'location', 'skills', 'created_at', 'updated_at',
+)
+
+
+def _datetime_formatter():
+    """``DateTimeField.to_representation`` for aware datetimes, minus the per-call setup."""
+    field = serializers.DateTimeField()
+    if getattr(field, 'format', api_settings.DATETIME_FORMAT) != ISO_8601 or not settings.USE_TZ:
+        return field.to_representation
+    current = timezone.get_current_timezone()
+
+    def to_representation(value):
+        value = value.astimezone(current).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+    return to_representation
+
+
+def public_feed_rows(rows):
+    """
+    The output of ``PublicFeedSerializer(many=True)`` built straight from
+    ``PublicJob`` ``values_list(*PUBLIC_ROW_FIELDS)`` tuples, skipping model
+    instances and DRF's per-field machinery. The fields are all plain
+    strings and ints apart from ``skills`` and ``created_at``, so only those
+    two are converted. Keep it in step with ``PublicFeedSerializer``; the
+    differential test compares their rendered JSON byte for byte.
+    """
+    format_datetime = _datetime_formatter()
+    return [
+        {
+            'id': id,
+            'title': title,
+            'company_name': company_name,
+            'job_type': job_type,
+            'location': location,
+            'skills': skills.split('\n') if skills else [],
+            'created_at': format_datetime(created_at),
+        }
+        for id, title, company_name, job_type, location, skills, created_at, _ in rows
+    ]
+
+
+class CompanyJobBulkCreateSerializer(serializers.ListSerializer):
+    """
+    Creates many jobs with a fixed number of queries: one skill and one
+    location resolution for the whole batch, then ``bulk_create`` for jobs
+    and skill links.
+    """
+
+    def create(self, validated_data):
+        request = self.context.get('request')
+        if not (request and hasattr(request, 'user')):
+            raise serializers.ValidationError("User authentication required.")
+
+        with transaction.atomic():
+            skill_ids = resolve_skills(
+                name for item in validated_data for name in item.get('skills', [])
+            )
+            places = locations.resolve_many(item['location'] for item in validated_data)
+            jobs = Job.objects.bulk_create([
+                Job(
+                    company=request.user,
+                    status='pending',
+                    place=places[item['location']],
+                    **{key: value for key, value in item.items() if key != 'skills'},
+                )
+                for item in validated_data
+            ])
+            Through = Job.skills.through
+            Through.objects.bulk_create(
+                [
+                    Through(job_id=job.pk, skill_id=skill_ids[Skill.normalize(name)])
+                    for job, item in zip(jobs, validated_data)
+                    for name in clean_skill_names(item.get('skills', []))
+                ],
+                ignore_conflicts=True,
+            )
+            # bulk_create sends no signals.
+            search.index_jobs([job.pk for job in jobs])
+        return jobs
+
+
 class CompanyJobCreateSerializer(serializers.ModelSerializer):
     skills = serializers.ListField(
         child=serializers.CharField(max_length=100),
         required=False,
-        allow_empty=True
+        allow_empty=True,
+        write_only=True
     )
 
     class Meta:
         model = Job
         fields = ['title', 'job_type', 'location', 'skills']
+        list_serializer_class = CompanyJobBulkCreateSerializer
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['skills'] = [skill.name for skill in instance.skills.all()]
+        return data
 
     def validate_title(self, value):
         if not value or not value.strip():
@@ -109,8 +245,8 @@ class CompanyJobCreateSerializer(serializers.ModelSerializer):
         else:
             raise serializers.ValidationError("User authentication required.")
         
+        validated_data['place'] = locations.resolve(validated_data['location'])
         job = Job.objects.create(**validated_data)
-        for skill_name in skills_data:
-            skill, _ = Skill.objects.get_or_create(name=skill_name.strip())
-            job.skills.add(skill)
+        job.skills.add(*resolve_skills(skills_data).values())
         return job
+
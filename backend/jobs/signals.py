@@ -0,0 +1,109 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from accounts.models import User
+from . import read_model, search, skills, suggest
+from .models import Job, Skill
+
+# Sent after changes to what the public feed shows that bypass Job.save()
+# (bulk moderation, company renames, re-resolved places), with the
+# affected ``job_ids``; saves and deletes of single jobs are picked up by
+# the post_save and post_delete receivers below. ``read_model.sync_public_jobs``
+# bumps the feed version once the new rows are committed.
+jobs_changed = Signal()
+
+# Job fields copied into PublicJob; updated_at changes on every save.
+PUBLIC_FIELDS = {
+    'status', 'title', 'company', 'company_id', 'job_type', 'location', 'place', 'place_id',
+    'updated_at',
+}
+
+
+@receiver(jobs_changed)
+def sync_read_model(sender, job_ids=(), **kwargs):
+    read_model.sync_public_jobs(job_ids)
+
+
+@receiver(post_save, sender=Job)
+def index_saved_job(sender, instance, created, update_fields=None, **kwargs):
+    # A job whose loaded status is unknown may have been public.
+    was_public = not created and getattr(instance, '_loaded_status', 'approved') == 'approved'
+    instance._loaded_status = instance.status
+    if (was_public or instance.status == 'approved') and (
+        not update_fields or PUBLIC_FIELDS.intersection(update_fields)
+    ):
+        # Every move into or out of the feed and every edit of a public
+        # job, whether through the API, the Django admin or the shell.
+        # Saving a pending or rejected job stays free.
+        read_model.sync_public_jobs([instance.pk])
+    # Status changes don't touch any indexed column.
+    if update_fields and set(update_fields) <= {'status', 'updated_at'}:
+        return
+    search.index_jobs([instance.pk])
+
+
+@receiver(post_delete, sender=Job)
+def unindex_deleted_job(sender, instance, **kwargs):
+    search.remove_jobs([instance.pk])
+    # Also covers jobs deleted along with their company.
+    read_model.sync_public_jobs([instance.pk])
+
+
+@receiver(m2m_changed, sender=Job.skills.through)
+def index_job_skills(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # skill.job_set.clear() doesn't pass the affected jobs to post_clear.
+        instance._search_job_ids = list(instance.job_set.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        search.index_jobs([instance.pk])
+        if instance.status == 'approved':
+            read_model.sync_public_jobs([instance.pk])
+        return
+    job_ids = pk_set or getattr(instance, '_search_job_ids', [])
+    search.index_jobs(job_ids)
+    read_model.sync_public_jobs(job_ids)
+
+
+@receiver(post_save, sender=Skill)
+def index_renamed_skill(sender, instance, created, **kwargs):
+    if created:
+        mapping = {instance.normalized_name: instance.pk}
+        transaction.on_commit(lambda: skills.registry.set_many(mapping))
+        suggest.skills_created({instance.pk: instance.name})
+        return
+    # The old normalized name may still point at this id.
+    skills.registry.clear()
+    suggest.invalidate()
+    skills.registry.set_many({instance.normalized_name: instance.pk})
+    job_ids = list(instance.job_set.values_list('pk', flat=True))
+    search.index_jobs(job_ids)
+    read_model.sync_public_jobs(job_ids)
+
+
+@receiver(pre_delete, sender=Skill)
+def remember_deleted_skill_jobs(sender, instance, **kwargs):
+    instance._search_job_ids = list(instance.job_set.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Skill)
+def index_deleted_skill(sender, instance, **kwargs):
+    skills.registry.discard(instance.normalized_name)
+    suggest.invalidate()
+    job_ids = getattr(instance, '_search_job_ids', [])
+    search.index_jobs(job_ids)
+    read_model.sync_public_jobs(job_ids)
+
+
+@receiver(post_save, sender=User)
+def index_renamed_company(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields and 'full_name' not in update_fields):
+        return
+    job_ids = list(Job.objects.filter(company=instance).values_list('pk', flat=True))
+    search.index_jobs(job_ids)
+    # The company name is copied into every one of its public jobs, from
+    # the profile API, the Django admin or the shell alike.
+    jobs_changed.send(sender=Job, job_ids=job_ids)
@@ -0,0 +1,106 @@
+"""
+Canonical skill registry.
+
+Skill names are matched on ``Skill.normalize(name)`` (collapsed whitespace,
+case-folded). Resolved ``normalized name -> id`` pairs are kept in a
+process-local LRU so that creating jobs with already-known skills doesn't
+query the ``Skill`` table. Entries are added when skills are looked up or,
+for new skills, once their transaction commits, and dropped when a skill is
+renamed or deleted (see ``jobs.signals``). Skill ids never change otherwise,
+so other processes' caches stay valid.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+
+from . import suggest
+from .models import Skill
+
+
+class SkillRegistry:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._ids = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        found = {}
+        with self._lock:
+            for key in keys:
+                skill_id = self._ids.get(key)
+                if skill_id is not None:
+                    self._ids.move_to_end(key)
+                    found[key] = skill_id
+        return found
+
+    def set_many(self, mapping):
+        with self._lock:
+            for key, skill_id in mapping.items():
+                self._ids[key] = skill_id
+                self._ids.move_to_end(key)
+            while len(self._ids) > self.maxsize:
+                self._ids.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._ids.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
+
+    def __len__(self):
+        return len(self._ids)
+
+
+registry = SkillRegistry(settings.JOBS_SKILL_CACHE_SIZE)
+
+
+def clean_skill_names(names):
+    """Cleaned skill names, de-duplicated by normalized name, in order."""
+    cleaned = {}
+    for name in names:
+        name = Skill.clean_name(name)
+        if name:
+            cleaned.setdefault(Skill.normalize(name), name)
+    return list(cleaned.values())
+
+
+def resolve_skills(names):
+    """
+    Map skill names to ``{normalized name: Skill id}``, creating missing skills.
+
+    Names already in the registry cost no queries. The rest take at most
+    three: one lookup, one ``bulk_create`` and, if anything was created, one
+    re-read (which also picks up skills created concurrently elsewhere).
+    """
+    wanted = {Skill.normalize(name): name for name in clean_skill_names(names)}
+    if not wanted:
+        return {}
+
+    resolved = registry.get_many(wanted)
+    missing = [key for key in wanted if key not in resolved]
+    if missing:
+        found = dict(
+            Skill.objects.filter(normalized_name__in=missing).values_list('normalized_name', 'id')
+        )
+        registry.set_many(found)
+        resolved.update(found)
+
+        created = [key for key in missing if key not in found]
+        if created:
+            Skill.objects.bulk_create(
+                [Skill(name=wanted[key], normalized_name=key) for key in created],
+                ignore_conflicts=True,
+            )
+            new = dict(
+                Skill.objects.filter(normalized_name__in=created)
+                .values_list('normalized_name', 'id')
+            )
+            # Only cache ids that survive the surrounding transaction.
+            transaction.on_commit(lambda: registry.set_many(new))
+            suggest.skills_created({skill_id: wanted[key] for key, skill_id in new.items()})
+            resolved.update(new)
+    return resolved
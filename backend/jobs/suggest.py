@@ -0,0 +1,174 @@
+"""
+In-memory skill autocomplete.
+
+Each process keeps every skill in a sorted list of normalized keys (the
+full name and each later word, so "learn" finds "Machine Learning") and
+answers a prefix with a bisect plus a scan of the matching range, ranked by
+how many approved jobs use the skill. Ranges of one-letter prefixes are
+long, so those walk a list of all skills in rank order instead and stop at
+``limit`` matches. Lookups don't touch the database.
+
+The index is built on first use with two queries and then kept up to date
+in place: new skills are added once their transaction commits, and
+``read_model.sync_public_jobs`` reports how the skill counts of the rows it
+rewrites changed. Renames, deletes and rebuilds of the read model mark it
+stale instead. Other processes rebuild within
+``JOBS_SKILL_SUGGEST_SYNC_INTERVAL`` seconds (see ``jobs.local_index``).
+"""
+import bisect
+import heapq
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+
+from .local_index import LocalIndex
+from .models import Job, Skill
+
+GENERATION_KEY = 'jobs:skills:generation'
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# Answers for recent (prefix, limit) pairs; emptied on every change.
+MEMO_SIZE = 1024
+
+# Prefixes shorter than this are answered from the ranked list.
+SHORT_PREFIX = 2
+
+
+def _keys(normalized_name):
+    """Index keys for a skill: its name and the suffix starting at each later word."""
+    words = normalized_name.split(' ')
+    return [' '.join(words[start:]) for start in range(len(words))]
+
+
+class SkillIndex(LocalIndex):
+    generation_key = GENERATION_KEY
+    sync_interval = settings.JOBS_SKILL_SUGGEST_SYNC_INTERVAL
+
+    def __init__(self):
+        super().__init__()
+        self._entries = []   # sorted (key, skill id)
+        self._skills = {}    # skill id -> [name, normalized name, approved job count]
+        self._ids = {}       # normalized name -> skill id
+        self._memo = {}
+        self._ranked = None  # skill ids, most used first; built on demand
+
+    def _rebuild(self):
+        counts = dict(
+            Job.skills.through.objects.filter(job__status='approved')
+            .values('skill_id').annotate(jobs=Count('job_id'))
+            .values_list('skill_id', 'jobs')
+        )
+        skills = {}
+        entries = []
+        for pk, name, normalized in Skill.objects.values_list('id', 'name', 'normalized_name'):
+            skills[pk] = [name, normalized, counts.get(pk, 0)]
+            entries.extend((key, pk) for key in _keys(normalized))
+        entries.sort()
+        self._skills = skills
+        self._entries = entries
+        self._ids = {normalized: pk for pk, (_, normalized, _) in skills.items()}
+        self._memo = {}
+        self._ranked = None
+
+    def _changed(self):
+        self._memo = {}
+        self._ranked = None
+        super()._changed()
+
+    # Incremental updates
+
+    def add_skills(self, skills):
+        """Add ``{skill id: name}`` for newly created skills."""
+        with self._lock:
+            if not self.built:
+                return
+            for pk, name in skills.items():
+                if pk in self._skills:
+                    continue
+                normalized = Skill.normalize(name)
+                self._skills[pk] = [name, normalized, 0]
+                self._ids[normalized] = pk
+                for key in _keys(normalized):
+                    bisect.insort(self._entries, (key, pk))
+            self._changed()
+
+    def adjust_counts(self, deltas):
+        """Apply ``{normalized name: change in approved jobs}``."""
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        with self._lock:
+            if not self.built:
+                return
+            for normalized, delta in deltas.items():
+                pk = self._ids.get(normalized)
+                if pk is None:
+                    # A skill we haven't heard of (e.g. created in another process).
+                    self.built = False
+                    continue
+                self._skills[pk][2] += delta
+            self._changed()
+
+    # Lookups
+
+    def suggest(self, prefix, limit=DEFAULT_LIMIT):
+        """``[(name, approved jobs), ...]`` for skills matching ``prefix``, most used first."""
+        self.sync()
+        key = Skill.normalize(prefix)
+        memo_key = (key, limit)
+        with self._lock:
+            found = self._memo.get(memo_key)
+            if found is not None:
+                return found
+            skills = self._skills
+            if len(key) < SHORT_PREFIX:
+                best = self._walk_ranked(key, limit)
+            else:
+                entries = self._entries
+                matches = set()
+                position = bisect.bisect_left(entries, (key,))
+                while position < len(entries) and entries[position][0].startswith(key):
+                    matches.add(entries[position][1])
+                    position += 1
+                best = heapq.nsmallest(limit, matches, key=self._rank)
+            found = [(skills[pk][0], skills[pk][2]) for pk in best]
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo = {}
+            self._memo[memo_key] = found
+            return found
+
+    def _rank(self, pk):
+        name, normalized, jobs = self._skills[pk]
+        return -jobs, normalized
+
+    def _walk_ranked(self, key, limit):
+        if self._ranked is None:
+            self._ranked = sorted(self._skills, key=self._rank)
+        word = ' ' + key
+        best = []
+        for pk in self._ranked:
+            normalized = self._skills[pk][1]
+            if normalized.startswith(key) or word in normalized:
+                best.append(pk)
+                if len(best) == limit:
+                    break
+        return best
+
+
+index = SkillIndex()
+
+
+def skills_created(skills):
+    """Add ``{skill id: name}`` to the index once the transaction commits."""
+    transaction.on_commit(lambda: index.add_skills(skills))
+
+
+def counts_changed(deltas):
+    transaction.on_commit(lambda: index.adjust_counts(deltas))
+
+
+def invalidate():
+    transaction.on_commit(index.invalidate)
@@ -1,3 +1,1394 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import random
+import tempfile
+from unittest import mock
+from datetime import datetime, timedelta, timezone as dt_timezone
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import Count
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from core import routers
+from core.testing import QueryBudgetMixin
+from . import feed_cache, fragments, locations, matching, skills, suggest
+from .export import export_rows
+from .models import Job, Location, PublicJob, Skill
+from .serializers import PUBLIC_ROW_FIELDS, PublicFeedSerializer, public_feed_rows
+from .search import search_jobs
+
+
+class PublicJobSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(
+            email='acme@example.com', password='pass12345', full_name='Acme Corp'
+        )
+        python = Skill.objects.create(name='Python')
+        django = Skill.objects.create(name='Django')
+        react = Skill.objects.create(name='React')
+
+        def job(title, location, skills, status='approved'):
+            job = Job.objects.create(
+                title=title, company=cls.company, job_type='full_time',
+                location=location, status=status,
+            )
+            job.skills.set(skills)
+            return job
+
+        cls.backend = job('Backend Developer', 'Bangalore, India', [python, django])
+        cls.frontend = job('Frontend Engineer', 'Remote', [react])
+        cls.data = job('Data Analyst', 'Mumbai', [python])
+        cls.pending = job('Python Intern', 'Bangalore', [python], status='pending')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.company)
+
+    def ids(self, **params):
+        response = self.client.get('/api/jobs/', params)
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data['results']]
+
+    def legacy_ids(self, location=None, skill=None):
+        queryset = Job.objects.filter(status='approved')
+        if location:
+            queryset = queryset.filter(location__icontains=location)
+        if skill:
+            queryset = queryset.filter(skills__name__icontains=skill)
+        return set(queryset.distinct().values_list('id', flat=True))
+
+    def test_filters_match_icontains(self):
+        cases = [
+            {'location': 'bang'}, {'location': 'INDIA'}, {'location': 'mo'},
+            {'skill': 'pyth'}, {'skill': 'jango'}, {'skill': 'r'},
+            {'location': 'remote', 'skill': 'react'}, {'skill': 'nodejs'},
+        ]
+        for params in cases:
+            with self.subTest(**params):
+                self.assertEqual(set(self.ids(**params)), self.legacy_ids(**params))
+
+    def test_skill_phrase_does_not_span_skill_names(self):
+        self.assertEqual(self.ids(skill='Python Django'), [])
+
+    def test_q_ranks_title_matches_first(self):
+        titled = Job.objects.create(
+            title='Python Developer', company=self.company, job_type='part_time',
+            location='Pune', status='approved',
+        )
+        ranked = self.ids(q='python')
+        self.assertEqual(ranked[0], titled.id)
+        self.assertEqual(set(ranked), {titled.id, self.backend.id, self.data.id})
+
+    def indexed_ids(self, **params):
+        return set(search_jobs(Job.objects.all(), **params).values_list('id', flat=True))
+
+    def test_index_follows_skill_changes(self):
+        self.frontend.skills.add(Skill.objects.create(name='TypeScript'))
+        self.assertEqual(self.indexed_ids(skill='typescript'), {self.frontend.id})
+
+        Skill.objects.filter(name='TypeScript').delete()
+        self.assertEqual(self.indexed_ids(skill='typescript'), set())
+
+    def test_index_follows_company_rename(self):
+        self.company.full_name = 'Globex'
+        self.company.save()
+        self.assertEqual(len(self.indexed_ids(q='globex')), 4)
+
+    def test_search_jobs_without_terms_is_a_noop(self):
+        queryset = Job.objects.filter(status='approved')
+        self.assertEqual(search_jobs(queryset).count(), 3)
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(email='initech@example.com', password='pass12345')
+        cls.jobs = [
+            Job.objects.create(
+                title=f'Job {i}', company=cls.company, job_type='full_time',
+                location='Remote', status='approved',
+            )
+            for i in range(25)
+        ]
+        # Force timestamp ties so the id tie-breaker is exercised.
+        Job.objects.filter(pk__in=[job.pk for job in cls.jobs[5:15]]).update(
+            created_at=cls.jobs[5].created_at
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.company)
+
+    def expected_ids(self):
+        return list(
+            Job.objects.filter(status='approved')
+            .order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+
+    def walk(self, url):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            url = response.data['next']
+        return pages
+
+    def test_walks_every_row_once_without_count_or_offset(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/jobs/', {'pagination': 'cursor'})
+        self.assertNotIn('count', response.data)
+        for query in queries.captured_queries:
+            self.assertNotIn('COUNT(', query['sql'])
+            self.assertNotIn('OFFSET', query['sql'])
+
+        pages = self.walk('/api/jobs/?pagination=cursor')
+        ids = [row['id'] for page in pages for row in page['results']]
+        self.assertEqual(ids, self.expected_ids())
+
+    def test_cursor_is_stable_while_jobs_are_approved(self):
+        first = self.client.get('/api/jobs/', {'pagination': 'cursor'}).data
+        Job.objects.create(
+            title='Fresh', company=self.company, job_type='full_time',
+            location='Remote', status='approved',
+        )
+        rest = self.walk(first['next'])
+        ids = [row['id'] for row in first['results']]
+        ids += [row['id'] for page in rest for row in page['results']]
+        # The new job sorts ahead of the first page and is not repeated.
+        self.assertEqual(ids, self.expected_ids()[1:])
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get('/api/jobs/', {'pagination': 'cursor'}).data
+        second = self.client.get(first['next']).data
+        back = self.client.get(second['previous']).data
+        self.assertEqual(back['results'], first['results'])
+        self.assertIsNone(back['previous'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/jobs/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_number_is_still_the_default(self):
+        response = self.client.get('/api/jobs/', {'page': 2})
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(
+            [row['id'] for row in response.data['results']], self.expected_ids()[10:20]
+        )
+
+
+class ListQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Each list view must run a fixed number of queries, whatever the page size."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(
+            email='hooli@example.com', password='pass12345', full_name='Hooli'
+        )
+        cls.admin = User.objects.create_superuser(email='root@example.com', password='pass12345')
+        skills = [Skill.objects.create(name=name) for name in ('Python', 'Go', 'SQL')]
+        for i in range(12):
+            job = Job.objects.create(
+                title=f'Engineer {i}', company=cls.company, job_type='full_time',
+                location='Bangalore', status='approved' if i % 4 else 'pending',
+            )
+            job.skills.set(skills)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_public_list(self):
+        self.client.force_authenticate(self.company)
+        # COUNT, page; skills and company name are inline in PublicJob.
+        self.assertEndpointQueryBudget(2, '/api/jobs/')
+        self.assertEndpointQueryBudget(2, '/api/jobs/', {'skill': 'python'})
+        self.assertEndpointQueryBudget(1, '/api/jobs/', {'pagination': 'cursor'})
+
+    def test_company_list(self):
+        self.client.force_authenticate(self.company)
+        self.assertEndpointQueryBudget(3, '/api/company/jobs/')
+        self.assertEndpointQueryBudget(2, '/api/company/jobs/', {'pagination': 'cursor'})
+
+    def test_admin_list(self):
+        self.client.force_authenticate(self.admin)
+        self.assertEndpointQueryBudget(2, '/api/admin/jobs/')
+        self.assertEndpointQueryBudget(2, '/api/admin/jobs/', {'status': 'pending'})
+
+
+class PublicFeedCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(
+            email='umbrella@example.com', password='pass12345', full_name='Umbrella'
+        )
+        cls.admin = User.objects.create_superuser(email='boss@example.com', password='pass12345')
+        cls.job = Job.objects.create(
+            title='Chemist', company=cls.company, job_type='full_time',
+            location='Raccoon City', status='pending',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.company)
+
+    def test_hit_skips_the_orm(self):
+        first = self.client.get('/api/jobs/', {'job_type': 'full_time', 'location': ''})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/jobs/', {'job_type': 'full_time'})
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+    def test_moderation_and_edits_invalidate(self):
+        self.assertEqual(self.client.get('/api/jobs/').data['count'], 0)
+
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/admin/jobs/{self.job.pk}/verify/', {'action': 'approve'})
+        self.client.force_authenticate(self.company)
+        self.assertEqual(self.client.get('/api/jobs/').data['count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/company/jobs/{self.job.pk}/', {'title': 'Virologist'})
+        self.assertEqual(self.client.get('/api/jobs/').data['results'][0]['title'], 'Virologist')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch('/api/profile/', {'full_name': 'Umbrella Corp'})
+        self.assertEqual(
+            self.client.get('/api/jobs/').data['results'][0]['company_name'], 'Umbrella Corp'
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f'/api/job/{self.job.pk}/delete/')
+        self.assertEqual(self.client.get('/api/jobs/').data['count'], 0)
+
+    def test_version_is_bumped_after_the_read_model_commits(self):
+        version = feed_cache.get_version()
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.patch(f'/api/admin/jobs/{self.job.pk}/verify/', {'action': 'approve'})
+            # Until the commit, readers still see the old rows, so pages
+            # they cache must stay under the old version.
+            self.assertEqual(feed_cache.get_version(), version)
+        for callback in callbacks:
+            callback()
+        self.assertGreater(feed_cache.get_version(), version)
+
+    def test_stats(self):
+        self.client.get('/api/jobs/')
+        self.client.get('/api/jobs/')
+        self.client.force_authenticate(self.admin)
+        stats = self.client.get('/api/admin/jobs/feed-cache/').data
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+
+class PublicJobFacetsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(
+            email='wayne@example.com', password='pass12345', full_name='Wayne Enterprises'
+        )
+        cls.admin = User.objects.create_superuser(email='alfred@example.com', password='pass12345')
+        python = Skill.objects.create(name='Python')
+        go = Skill.objects.create(name='Go')
+        rows = [
+            ('Backend Engineer', 'full_time', 'Gotham', [python, go]),
+            ('Data Engineer', 'full_time', 'Gotham', [python]),
+            ('Python Intern', 'internship', 'Metropolis', [python]),
+            ('Go Developer', 'part_time', 'Gotham', [go]),
+        ]
+        for title, job_type, location, skills in rows:
+            job = Job.objects.create(
+                title=title, company=cls.company, job_type=job_type,
+                location=location, status='approved',
+            )
+            job.skills.set(skills)
+        cls.pending = Job.objects.create(
+            title='Pending', company=cls.company, job_type='internship',
+            location='Bludhaven', status='pending',
+        )
+        cls.pending.skills.set([go])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.company)
+
+    def test_counts(self):
+        with self.assertNumQueries(3):
+            data = self.client.get('/api/jobs/facets/').data
+        self.assertEqual(data['count'], 4)
+        self.assertEqual(data['job_type'], [
+            {'value': 'full_time', 'count': 2},
+            {'value': 'internship', 'count': 1},
+            {'value': 'part_time', 'count': 1},
+        ])
+        self.assertEqual(data['location'], [
+            {'value': 'Gotham', 'count': 3}, {'value': 'Metropolis', 'count': 1},
+        ])
+        self.assertEqual(data['skills'], [
+            {'value': 'Python', 'count': 3}, {'value': 'Go', 'count': 2},
+        ])
+
+    def test_uses_public_filters(self):
+        data = self.client.get('/api/jobs/facets/', {'q': 'engineer', 'limit': 1}).data
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['location'], [{'value': 'Gotham', 'count': 2}])
+        self.assertEqual(data['skills'], [{'value': 'Python', 'count': 2}])
+
+        data = self.client.get('/api/jobs/facets/', {'skill': 'go'}).data
+        self.assertEqual(data['count'], 2)
+
+    def test_cached_until_approval(self):
+        self.assertEqual(self.client.get('/api/jobs/facets/')['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/jobs/facets/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/admin/jobs/{self.pending.pk}/verify/', {'action': 'approve'})
+        self.client.force_authenticate(self.company)
+        response = self.client.get('/api/jobs/facets/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['count'], 5)
+
+
+class PublicReadModelTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(
+            email='initech@example.com', password='pass12345', full_name='Initech'
+        )
+        cls.admin = User.objects.create_superuser(email='lumbergh@example.com', password='pass12345')
+        cls.python = Skill.objects.create(name='Python')
+        cls.cobol = Skill.objects.create(name='COBOL')
+        cls.job = Job.objects.create(
+            title='Programmer', company=cls.company, job_type='full_time',
+            location='Austin', status='pending',
+        )
+        cls.job.skills.set([cls.cobol, cls.python])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def row(self):
+        return PublicJob.objects.filter(pk=self.job.pk).first()
+
+    def moderate(self, action):
+        self.client.force_authenticate(self.admin)
+        self.client.patch(f'/api/admin/jobs/{self.job.pk}/verify/', {'action': action})
+
+    def test_follows_moderation_edits_and_deletes(self):
+        self.assertIsNone(self.row())
+        self.moderate('approve')
+        row = self.row()
+        self.assertEqual(
+            (row.title, row.company_name, row.skill_names),
+            ('Programmer', 'Initech', ['COBOL', 'Python']),
+        )
+
+        self.client.force_authenticate(self.company)
+        self.client.patch(
+            f'/api/company/jobs/{self.job.pk}/', {'title': 'Senior Programmer'}, format='json'
+        )
+        self.client.patch('/api/profile/', {'full_name': 'Initech LLC'})
+        self.assertEqual(
+            (self.row().title, self.row().company_name), ('Senior Programmer', 'Initech LLC')
+        )
+
+        self.cobol.name = 'Cobol'
+        self.cobol.save()
+        self.python.delete()
+        self.assertEqual(self.row().skill_names, ['Cobol'])
+
+        self.moderate('reject')
+        self.assertIsNone(self.row())
+
+        self.client.force_authenticate(self.admin)
+        self.client.post(
+            '/api/admin/jobs/verify/', {'ids': [self.job.pk], 'action': 'approve'}, format='json'
+        )
+        # Bulk moderation only touches pending jobs.
+        self.assertIsNone(self.row())
+        Job.objects.filter(pk=self.job.pk).update(status='pending')
+        self.client.post(
+            '/api/admin/jobs/verify/', {'ids': [self.job.pk], 'action': 'approve'}, format='json'
+        )
+        self.assertIsNotNone(self.row())
+
+        self.client.force_authenticate(self.company)
+        self.client.delete(f'/api/job/{self.job.pk}/delete/')
+        self.assertIsNone(self.row())
+
+    def test_follows_saves_outside_the_api(self):
+        job = Job.objects.get(pk=self.job.pk)
+        job.status = 'approved'
+        job.save()
+        self.assertEqual(self.row().title, 'Programmer')
+
+        job = Job.objects.get(pk=self.job.pk)
+        job.location = 'Dallas'
+        job.save(update_fields=['location'])
+        self.assertEqual(self.row().location, 'Dallas')
+
+        job.status = 'rejected'
+        job.save()
+        self.assertIsNone(self.row())
+
+        # Moving between statuses outside the feed doesn't touch the read model.
+        job = Job.objects.get(pk=self.job.pk)
+        job.status = 'pending'
+        with self.assertNumQueries(1):
+            job.save(update_fields=['status', 'updated_at'])
+
+    def test_company_renamed_outside_the_api(self):
+        Job.objects.filter(pk=self.job.pk).update(status='approved')
+        call_command('rebuild_public_feed', stdout=io.StringIO())
+        self.client.force_authenticate(self.company)
+        self.assertEqual(self.client.get('/api/jobs/').data['results'][0]['company_name'], 'Initech')
+
+        company = User.objects.get(pk=self.company.pk)
+        company.full_name = 'Initrode'
+        with self.captureOnCommitCallbacks(execute=True):
+            company.save()
+        self.assertEqual(self.row().company_name, 'Initrode')
+        # Past the cached page and the cached fragment.
+        self.assertEqual(
+            self.client.get('/api/jobs/').data['results'][0]['company_name'], 'Initrode'
+        )
+
+    def test_feed_page_reads_one_table(self):
+        self.moderate('approve')
+        self.client.force_authenticate(self.company)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/jobs/')
+        self.assertEqual(response.data['results'][0]['skills'], ['COBOL', 'Python'])
+        self.assertFalse([q['sql'] for q in queries if 'JOIN' in q['sql']])
+
+    def test_rebuild_command(self):
+        Job.objects.filter(pk=self.job.pk).update(status='approved')
+        call_command('rebuild_public_feed', stdout=io.StringIO())
+        self.assertEqual(self.row().skill_names, ['COBOL', 'Python'])
+
+
+class PublicFeedFastSerializationTests(TestCase):
+    """``public_feed_rows()`` must render exactly what ``PublicFeedSerializer`` does."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(email='fast@example.com', password='pass12345')
+        base = timezone.now().replace(microsecond=0)
+        PublicJob.objects.bulk_create([
+            PublicJob(
+                id=1, title='Développeur "Backend"', company_name='Ünïcode & Co',
+                job_type='full_time', location='Kochi, India', skills='C++\nPython\n日本語',
+                created_at=base, updated_at=base,
+            ),
+            PublicJob(
+                id=2, title='No skills', company_name='Plain', job_type='internship',
+                location='', skills='', created_at=base.replace(microsecond=123456),
+                updated_at=base,
+            ),
+            PublicJob(
+                id=3, title='Old\nline', company_name='Quote\\Slash', job_type='part_time',
+                location='Remote', skills='Go',
+                created_at=datetime(1999, 12, 31, 23, 59, 59, 1, tzinfo=dt_timezone.utc),
+                updated_at=base,
+            ),
+        ])
+
+    def render_both(self):
+        queryset = PublicJob.objects.order_by('-created_at', '-id')
+        reference = PublicFeedSerializer(queryset, many=True).data
+        fast = public_feed_rows(queryset.values_list(*PUBLIC_ROW_FIELDS))
+        return JSONRenderer().render(reference), JSONRenderer().render(fast)
+
+    def test_output_is_byte_identical(self):
+        reference, fast = self.render_both()
+        self.assertEqual(fast, reference)
+
+    def test_output_is_byte_identical_in_another_timezone(self):
+        with timezone.override('Asia/Kolkata'):
+            reference, fast = self.render_both()
+        self.assertIn(b'+05:30', fast)
+        self.assertEqual(fast, reference)
+
+    def test_endpoint_matches_the_serializer(self):
+        client = APIClient()
+        # A real token: the async view runs its own authentication.
+        token = RefreshToken.for_user(self.company).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        queryset = PublicJob.objects.order_by('-created_at', '-id')
+        expected = JSONRenderer().render(PublicFeedSerializer(queryset, many=True).data)
+        for url in ['/api/jobs/', '/api/jobs/?pagination=cursor', '/api/jobs/async/']:
+            with self.subTest(url=url):
+                cache.clear()
+                results = json.loads(client.get(url).content)['results']
+                self.assertEqual(JSONRenderer().render(results), expected)
+
+
+class PublicFeedFragmentCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(
+            email='fragments@example.com', password='pass12345', full_name='Shards'
+        )
+        cls.admin = User.objects.create_superuser(email='frag-admin@example.com', password='pass12345')
+        cls.python = Skill.objects.create(name='Python')
+        cls.jobs = [
+            Job.objects.create(
+                title=f'Job {i}', company=cls.company, job_type=job_type,
+                location=location, status='approved',
+            )
+            for i, (job_type, location) in enumerate([
+                ('full_time', 'Kochi'), ('internship', 'Kochi'), ('full_time', 'Pune'),
+            ])
+        ]
+        cls.jobs[0].skills.set([cls.python])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.company)
+
+    def key(self, job):
+        return fragments.fragment_key(
+            PublicJob.objects.values_list(*PUBLIC_ROW_FIELDS).get(pk=job.pk)
+        )
+
+    def serialized_ids(self, url):
+        with mock.patch.object(
+            fragments, 'public_feed_rows', wraps=fragments.public_feed_rows
+        ) as serialize:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return sorted(row[0] for call in serialize.call_args_list for row in call.args[0])
+
+    def test_rows_are_serialized_once_across_pages_and_filters(self):
+        self.assertEqual(self.serialized_ids('/api/jobs/'), sorted(job.pk for job in self.jobs))
+        self.assertEqual(self.serialized_ids('/api/jobs/?location=kochi'), [])
+        self.assertEqual(self.serialized_ids('/api/jobs/?job_type=full_time&pagination=cursor'), [])
+
+    def test_page_is_the_serializer_output_byte_for_byte(self):
+        response = self.client.get('/api/jobs/?location=kochi')
+        # Rendered again from cached fragments.
+        cached = self.client.get('/api/jobs/?location=kochi&page=1')
+        queryset = PublicJob.objects.filter(location='Kochi').order_by('-created_at', '-id')
+        expected = JSONRenderer().render({
+            'count': 2, 'next': None, 'previous': None,
+            'results': PublicFeedSerializer(queryset, many=True).data,
+        })
+        self.assertEqual(response.content, expected)
+        self.assertEqual(cached.content, expected)
+        self.assertEqual(self.client.get('/api/jobs/?format=api').status_code, 200)
+
+    def test_fragments_are_evicted_on_writes(self):
+        self.client.get('/api/jobs/')
+        renamed, edited, rejected = self.jobs
+        keys = [self.key(job) for job in self.jobs]
+        self.assertTrue(all(cache.get(key) for key in keys))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/company/jobs/{edited.pk}/', {'title': 'Edited'}, format='json')
+            # A rename rewrites the row but keeps its updated_at.
+            self.python.name = 'Python 3'
+            self.python.save()
+            self.client.force_authenticate(self.admin)
+            self.client.patch(f'/api/admin/jobs/{rejected.pk}/verify/', {'action': 'reject'})
+        self.assertEqual([cache.get(key) for key in keys], [None, None, None])
+        self.assertNotEqual(self.key(renamed), keys[0])
+
+        response = self.client.get('/api/jobs/')
+        self.assertEqual(
+            {row['title']: row['skills'] for row in response.data['results']},
+            {'Job 0': ['Python 3'], 'Edited': []},
+        )
+
+
+    def test_fragment_cached_during_a_write_is_not_served_after_it(self):
+        self.client.get('/api/jobs/')
+        renamed = self.jobs[0]
+        old_key = self.key(renamed)
+        stale = cache.get(old_key)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python.name = 'Python 3'
+            self.python.save()
+        # A reader that still saw the old row re-caches its fragment after
+        # the eviction.
+        cache.set(old_key, stale)
+        response = self.client.get('/api/jobs/?job_type=full_time')
+        row = next(row for row in response.data['results'] if row['id'] == renamed.pk)
+        self.assertEqual(row['skills'], ['Python 3'])
+
+
+class BulkJobCreateTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(email='wayne@example.com', password='pass12345')
+        Skill.objects.create(name='Python')
+
+    def setUp(self):
+        skills.registry.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.company)
+
+    def payload(self, count):
+        return [
+            {
+                'title': f'Engineer {i}', 'job_type': 'full_time', 'location': 'Gotham',
+                'skills': ['Python', f'Skill {i}', 'Go ', 'Go', f'Skill {i % 3}'],
+            }
+            for i in range(count)
+        ]
+
+    def test_query_count_is_independent_of_batch_size(self):
+        with self.assertQueryBudget(10) as small:
+            self.client.post('/api/company/jobs/bulk-create/', self.payload(2), format='json')
+        with self.assertQueryBudget(len(small.captured_queries)):
+            response = self.client.post(
+                '/api/company/jobs/bulk-create/', self.payload(40), format='json'
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 40)
+
+        job = Job.objects.get(pk=response.data['results'][7]['id'])
+        self.assertEqual(job.status, 'pending')
+        self.assertEqual(
+            sorted(job.skills.values_list('name', flat=True)),
+            ['Go', 'Python', 'Skill 1', 'Skill 7'],
+        )
+        self.assertEqual(Skill.objects.filter(name='Go').count(), 1)
+
+    def test_partial_failures_are_reported_per_item(self):
+        payload = self.payload(3)
+        payload[1]['title'] = '  '
+        response = self.client.post('/api/company/jobs/bulk-create/', payload, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['created', 'invalid', 'created'],
+        )
+        self.assertIn('title', response.data['results'][1]['errors'])
+        self.assertEqual(Job.objects.count(), 2)
+
+    def test_created_jobs_are_searchable(self):
+        response = self.client.post('/api/company/jobs/bulk-create/', self.payload(2), format='json')
+        ids = {result['id'] for result in response.data['results']}
+        self.assertEqual(
+            set(search_jobs(Job.objects.all(), skill='skill 1').values_list('id', flat=True)),
+            ids - {response.data['results'][0]['id']},
+        )
+
+
+class SkillRegistryTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(email='stark@example.com', password='pass12345')
+        cls.python = Skill.objects.create(name='  Python ')
+
+    def setUp(self):
+        skills.registry.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.company)
+
+    def create(self, *names):
+        response = self.client.post('/api/company/jobs/create/', {
+            'title': 'Engineer', 'job_type': 'full_time', 'location': 'Malibu',
+            'skills': list(names),
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return Job.objects.get(pk=Job.objects.latest('pk').pk)
+
+    def test_names_are_canonicalized(self):
+        self.assertEqual(self.python.name, 'Python')
+        job = self.create('python', 'PYTHON ', 'Machine   learning', 'machine learning')
+        self.assertEqual(
+            sorted(job.skills.values_list('name', flat=True)), ['Machine learning', 'Python']
+        )
+        self.assertEqual(Skill.objects.count(), 2)
+
+    def test_warm_registry_skips_the_skill_table(self):
+        self.create('Python')
+        with CaptureQueriesContext(connection) as queries:
+            self.create('PYTHON')
+        self.assertFalse(
+            [query for query in queries.captured_queries if 'jobs_skill"' in query['sql']
+             and 'jobs_job_skills' not in query['sql']]
+        )
+
+    def test_deleted_skill_is_forgotten(self):
+        skills.resolve_skills(['Python'])
+        self.python.delete()
+        self.assertNotIn(skills.resolve_skills(['Python'])['python'], [self.python.pk, None])
+
+
+class SkillSuggestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(email='hooli@example.com', password='pass12345')
+        cls.admin = User.objects.create_superuser(email='belson@example.com', password='pass12345')
+        cls.python = Skill.objects.create(name='Python')
+        cls.pytorch = Skill.objects.create(name='PyTorch')
+        cls.ml = Skill.objects.create(name='Machine Learning')
+        cls.pyspark = Skill.objects.create(name='PySpark')
+
+        def job(skills, status='approved'):
+            job = Job.objects.create(
+                title='Engineer', company=cls.company, job_type='full_time',
+                location='Palo Alto', status=status,
+            )
+            job.skills.set(skills)
+            return job
+
+        job([cls.python, cls.pytorch, cls.ml])
+        job([cls.python])
+        job([cls.pyspark])
+        job([cls.pyspark])
+        job([cls.pyspark])
+        cls.pending = job([cls.pytorch, cls.ml], status='pending')
+
+    def setUp(self):
+        cache.clear()
+        suggest.index.invalidate()
+        self.client = APIClient()
+        self.client.force_authenticate(self.company)
+
+    def suggest(self, **params):
+        response = self.client.get('/api/skills/suggest/', params)
+        self.assertEqual(response.status_code, 200)
+        return [(row['name'], row['jobs']) for row in response.data]
+
+    def test_ranked_by_approved_jobs(self):
+        self.assertEqual(
+            self.suggest(prefix=' PY'), [('PySpark', 3), ('Python', 2), ('PyTorch', 1)]
+        )
+
+    # "default" stands in for a replica; what's checked is where the router
+    # sends the rebuild's reads.
+    @override_settings(DATABASE_REPLICAS=['default'])
+    def test_rebuild_reads_the_primary(self):
+        aliases = []
+        route = routers.PrimaryReplicaRouter.db_for_read
+
+        def spy(router, model, **hints):
+            alias = route(router, model, **hints)
+            aliases.append(alias)
+            return alias
+
+        with mock.patch.object(routers.PrimaryReplicaRouter, 'db_for_read', spy):
+            self.assertEqual(self.suggest(prefix='py')[0], ('PySpark', 3))
+        self.assertTrue(aliases)
+        self.assertEqual(set(aliases), {None})
+        self.assertEqual(self.suggest(prefix='pyt', limit=1), [('Python', 2)])
+        self.assertEqual(self.suggest(prefix='learn'), [('Machine Learning', 1)])
+        self.assertEqual(self.suggest(prefix='rust'), [])
+
+    def test_warm_index_answers_without_queries(self):
+        self.suggest(prefix='py')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest(prefix='machine'), [('Machine Learning', 1)])
+
+    def test_new_skills_and_approvals_update_the_index_in_place(self):
+        self.suggest(prefix='py')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/company/jobs/create/', {
+                'title': 'Engineer', 'job_type': 'full_time', 'location': 'Palo Alto',
+                'skills': ['Pydantic', 'PyTorch'],
+            }, format='json')
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/admin/jobs/{self.pending.pk}/verify/', {'action': 'approve'})
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.suggest(prefix='py'),
+                [('PySpark', 3), ('Python', 2), ('PyTorch', 2), ('Pydantic', 0)],
+            )
+        self.assertEqual(self.suggest(prefix='learn'), [('Machine Learning', 2)])
+
+    def test_renames_and_changes_elsewhere_rebuild_the_index(self):
+        self.suggest(prefix='py')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pyspark.name = 'Apache Spark'
+            self.pyspark.save()
+        self.assertEqual(self.suggest(prefix='spark'), [('Apache Spark', 3)])
+
+        # Another process approved a job and bumped the generation.
+        Job.objects.filter(pk=self.pending.pk).update(status='approved')
+        cache.incr(suggest.GENERATION_KEY)
+        suggest.index.checked_at = 0
+        self.assertEqual(self.suggest(prefix='pyt'), [('Python', 2), ('PyTorch', 2)])
+
+
+class LocationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('load_gazetteer', stdout=io.StringIO())
+        cls.company = User.objects.create_user(email='infosys@example.com', password='pass12345')
+
+        def job(location, status='approved'):
+            return Job.objects.create(
+                title=f'Engineer in {location}', company=cls.company, job_type='full_time',
+                location=location, place=locations.resolve(location), status=status,
+            )
+
+        cls.bangalore = job('Bangalore, India')
+        cls.mysore = job('Mysore')
+        cls.kochi = job('Cochin, Kerala')
+        cls.remote = job('Remote')
+
+    def setUp(self):
+        cache.clear()
+        # The async list authenticates the token itself.
+        token = str(RefreshToken.for_user(self.company).access_token)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def place(self, text):
+        location = locations.resolve(text)
+        return location and location.name
+
+    def ids(self, url='/api/jobs/', **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return {row['id'] for row in response.json()['results']}
+
+    def test_resolves_aliases_and_qualifiers(self):
+        cases = {
+            'bengaluru': 'Bengaluru',
+            '  BANGALORE ,  Karnataka ': 'Bengaluru',
+            'Kakkanad, Kochi': 'Kochi',
+            'München': 'Munich',
+            'Portland': 'Portland',
+            'San José, Costa Rica': 'San Jose',
+            'Remote': None,
+            'Bangalore, Atlantis': None,
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(self.place(text), expected)
+        self.assertEqual(locations.resolve('Portland, Maine').region, 'Maine')
+        self.assertEqual(locations.resolve('Portland').region, 'Oregon')
+        self.assertEqual(locations.resolve('San José, Costa Rica').country, 'Costa Rica')
+
+    def test_job_writes_resolve_the_place(self):
+        response = self.client.post('/api/company/jobs/create/', {
+            'title': 'Engineer', 'job_type': 'full_time', 'location': 'Madras',
+        }, format='json')
+        job = Job.objects.get(pk=Job.objects.latest('pk').pk)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(job.place.name, 'Chennai')
+
+        self.client.patch(f'/api/company/jobs/{job.pk}/', {'location': 'Trivandrum'}, format='json')
+        job.refresh_from_db()
+        self.assertEqual(job.place.name, 'Thiruvananthapuram')
+
+        response = self.client.post('/api/company/jobs/bulk-create/', [
+            {'title': 'A', 'job_type': 'full_time', 'location': 'Gurgaon'},
+            {'title': 'B', 'job_type': 'full_time', 'location': 'Atlantis'},
+        ], format='json')
+        ids = [result['id'] for result in response.data['results']]
+        self.assertEqual(
+            [job.place and job.place.name for job in Job.objects.filter(pk__in=ids).order_by('pk')],
+            ['Gurugram', None],
+        )
+
+    def test_public_place_and_radius_filters(self):
+        for url in ('/api/jobs/', '/api/jobs/async/'):
+            with self.subTest(url=url):
+                self.assertEqual(self.ids(url, place='Bengaluru'), {self.bangalore.pk})
+                self.assertEqual(self.ids(url, place='Atlantis'), set())
+                # Mysuru is ~130 km from Bengaluru, Kochi ~360 km.
+                self.assertEqual(
+                    self.ids(url, near='bangalore', radius_km=200),
+                    {self.bangalore.pk, self.mysore.pk},
+                )
+                self.assertEqual(
+                    self.ids(url, near='12.97,77.59', radius_km='400'),
+                    {self.bangalore.pk, self.mysore.pk, self.kochi.pk},
+                )
+                self.assertEqual(self.ids(url, near='12.97,77.59', radius_km=5), {self.bangalore.pk})
+                self.assertEqual(self.ids(url, near='Atlantis'), set())
+                # Non-finite radii fall back to the default (25 km).
+                for radius in ('nan', 'inf', '-inf'):
+                    self.assertEqual(
+                        self.ids(url, near='bangalore', radius_km=radius), {self.bangalore.pk}
+                    )
+
+        response = self.client.get('/api/jobs/facets/', {'near': 'mysuru', 'radius_km': 200})
+        self.assertEqual(response.data['count'], 2)
+
+    def test_distance_and_bounding_box(self):
+        bangalore, mysore = locations.resolve('Bangalore'), locations.resolve('Mysore')
+        distance = locations.haversine_km(
+            bangalore.latitude, bangalore.longitude, mysore.latitude, mysore.longitude
+        )
+        self.assertAlmostEqual(distance, 128, delta=3)
+
+        east = Location.objects.create(name='East', country='Fiji', latitude=-17, longitude=179.9)
+        west = Location.objects.create(name='West', country='Fiji', latitude=-17, longitude=-179.9)
+        self.assertEqual(set(locations.within(-17, 179.95, 50)), {east.pk, west.pk})
+        self.assertEqual(locations.bounding_box(89.9, 0, 50)[2], [(-180, 180)])
+
+    def test_load_gazetteer_resolves_existing_jobs(self):
+        job = Job.objects.create(
+            title='Diver', company=self.company, job_type='full_time',
+            location='Atlantis', status='approved',
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = f'{directory}/gazetteer.csv'
+            with open(path, 'w') as f:
+                f.write('name,region,country,latitude,longitude,population,aliases\n')
+                f.write('Atlantis,,Ocean,0,-30,1,Poseidonis\n')
+            call_command('load_gazetteer', path, stdout=io.StringIO())
+        updated_at = job.updated_at
+        job.refresh_from_db()
+        self.assertEqual(job.place.name, 'Atlantis')
+        self.assertGreater(job.updated_at, updated_at)
+        self.assertEqual(
+            PublicJob.objects.values_list('place_id', 'updated_at').get(pk=job.pk),
+            (job.place_id, job.updated_at),
+        )
+        self.assertEqual(self.place('poseidonis, ocean'), 'Atlantis')
+
+
+class JobMatchingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(email='pied@example.com', password='pass12345')
+        cls.admin = User.objects.create_superuser(email='gavin@example.com', password='pass12345')
+        python, django, react, go = (
+            Skill.objects.create(name=name) for name in ['Python', 'Django', 'React', 'Go']
+        )
+
+        def job(title, skills, status='approved'):
+            job = Job.objects.create(
+                title=title, company=cls.company, job_type='full_time',
+                location='Palo Alto', status=status,
+            )
+            job.skills.set(skills)
+            return job
+
+        cls.backend = job('Backend', [python, django])
+        cls.fullstack = job('Full stack', [python, django, react])
+        cls.frontend = job('Frontend', [react])
+        cls.scripting = job('Scripting', [python])
+        cls.systems = job('Systems', [go])
+        cls.pending = job('Platform', [python, django, go], status='pending')
+
+    def setUp(self):
+        cache.clear()
+        matching.index.invalidate()
+        self.client = APIClient()
+        self.client.force_authenticate(self.company)
+
+    def match(self, **params):
+        response = self.client.get('/api/jobs/matching/', params)
+        self.assertEqual(response.status_code, 200)
+        return [(row['title'], row['matched_skills']) for row in response.data['results']]
+
+    def test_ranked_by_shared_skills_then_recency(self):
+        self.assertEqual(
+            self.match(skills='python, DJANGO,react'),
+            [('Full stack', 3), ('Backend', 2), ('Scripting', 1), ('Frontend', 1)],
+        )
+        self.assertEqual(
+            self.match(skills=['python', 'cobol'], limit=2), [('Scripting', 1), ('Full stack', 1)]
+        )
+        response = self.client.get('/api/jobs/matching/', {'skills': 'react'})
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(response.data['results'][0]['skills'], ['React'])
+        self.assertEqual(self.match(skills='cobol'), [])
+
+    # "default" stands in for a replica; what's checked is where the
+    # rebuilds' reads are routed.
+    @override_settings(DATABASE_REPLICAS=['default'])
+    def test_rebuilds_read_the_primary(self):
+        aliases = []
+        rebuild = matching.MatchingIndex._rebuild
+
+        def spy(index):
+            aliases.append(routers.current_read_alias())
+            rebuild(index)
+
+        with mock.patch.object(matching.MatchingIndex, '_rebuild', spy):
+            # Another process changed the index.
+            self.assertEqual(self.match(skills='go'), [('Systems', 1)])
+            # Too many removed slots.
+            matching.index._removed = len(matching.index._ids) + matching.MAX_TAIL + 1
+            self.assertEqual(self.match(skills='go'), [('Systems', 1)])
+        self.assertEqual(aliases, [None, None])
+
+    def test_validates_skills(self):
+        response = self.client.get('/api/jobs/matching/', {'skills': ' , '})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/jobs/matching/', {'skills': ','.join(['x'] * 21)})
+        self.assertEqual(response.status_code, 400)
+
+    def test_moderation_and_edits_update_the_index_in_place(self):
+        self.match(skills='go')
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/admin/jobs/{self.pending.pk}/verify/', {'action': 'approve'})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/admin/jobs/{self.systems.pk}/verify/', {'action': 'reject'})
+        self.client.force_authenticate(self.company)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f'/api/company/jobs/{self.backend.pk}/', {'title': 'Backend Go'}, format='json'
+            )
+            self.backend.skills.add(Skill.objects.get(name='Go'))
+
+        # Only the page of rows is read; the ranking comes from the index.
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.match(skills='go,python'),
+                [('Platform', 2), ('Backend Go', 2), ('Scripting', 1), ('Full stack', 1)],
+            )
+
+    def test_index_matches_brute_force(self):
+        rng = random.Random(3)
+        names = [f'Skill {i}' for i in range(12)]
+        start = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+        jobs = {
+            job_id: (
+                start + timedelta(minutes=rng.randrange(500)), rng.sample(names, rng.randint(0, 5))
+            )
+            for job_id in range(1, 400)
+        }
+        index = matching.MatchingIndex()
+        index.generation_key = 'jobs:matching:test'
+        index.built = True
+        loaded = set(rng.sample(sorted(jobs), 300))
+        index.load(
+            (job_id, created_at, '\n'.join(skills))
+            for job_id, (created_at, skills) in sorted(jobs.items(), key=lambda i: (i[1][0], i[0]))
+            if job_id in loaded
+        )
+        # Jobs approved later, mostly older than the newest one, land in the
+        # unordered tail; some jobs leave.
+        index.apply({}, {
+            job_id: (created_at, '\n'.join(skills))
+            for job_id, (created_at, skills) in jobs.items() if job_id not in loaded
+        })
+        self.assertLess(index._ordered, len(index._ids))
+        removed = rng.sample(sorted(jobs), 40)
+        index.apply({job_id: '\n'.join(jobs[job_id][1]) for job_id in removed}, {})
+        for job_id in removed:
+            del jobs[job_id]
+
+        for _ in range(50):
+            query = rng.sample(names, rng.randint(1, 12))
+            scored = [
+                (len(set(skills) & set(query)), created_at, job_id)
+                for job_id, (created_at, skills) in jobs.items()
+            ]
+            expected = sorted((score for score in scored if score[0]), reverse=True)
+            ranked, count = index.match(query, limit=15)
+            self.assertEqual(count, len(expected))
+            self.assertEqual(ranked, [(job_id, matched) for matched, _, job_id in expected[:15]])
+
+    def test_memory_follows_the_indexed_jobs_not_their_ids(self):
+        created_at = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+        index = matching.MatchingIndex()
+        index.generation_key = 'jobs:matching:test'
+        index.built = True
+        index.load([(7, created_at, 'Python'), (2**40, created_at, 'Python\nGo')])
+        self.assertLess(index.memory(), 2**12)
+        self.assertEqual(index.match(['go', 'python'])[0], [(2**40, 2), (7, 1)])
+        index.apply({2**40: 'Python\nGo'}, {})
+        self.assertEqual(index.match(['go', 'python']), ([(7, 1)], 1))
+
+
+class JobModerationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(email='cyberdyne@example.com', password='pass12345')
+        cls.admin = User.objects.create_superuser(email='mod@example.com', password='pass12345')
+        cls.jobs = [
+            Job.objects.create(
+                title=f'Job {i}', company=cls.company, job_type='full_time',
+                location='LA', status=status,
+            )
+            for i, status in enumerate(['pending', 'pending', 'approved', 'pending'])
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_bulk_verify_updates_pending_jobs_in_one_statement(self):
+        ids = [job.pk for job in self.jobs[:3]] + [999999]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                '/api/admin/jobs/verify/', {'ids': ids, 'action': 'reject'}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(
+            [result['outcome'] for result in response.data['results']],
+            ['updated', 'updated', 'skipped', 'not_found'],
+        )
+        updates = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            list(Job.objects.order_by('pk').values_list('status', flat=True)),
+            ['rejected', 'rejected', 'approved', 'pending'],
+        )
+
+    def test_bulk_verify_validates_input(self):
+        response = self.client.post(
+            '/api/admin/jobs/verify/', {'ids': [], 'action': 'delete'}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {'ids', 'action'})
+
+    def test_bulk_verify_requires_admin(self):
+        self.client.force_authenticate(self.company)
+        response = self.client.post(
+            '/api/admin/jobs/verify/', {'ids': [self.jobs[0].pk], 'action': 'approve'}, format='json'
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_single_verify_writes_only_the_status_column(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                f'/api/admin/jobs/{self.jobs[0].pk}/verify/', {'action': 'approve'}
+            )
+        self.assertEqual(response.data['status'], 'approved')
+        update = next(query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE'))
+        self.assertIn('SET "status"', update)
+        self.assertNotIn('"title"', update)
+
+
+class ConditionalRequestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(email='oscorp@example.com', password='pass12345')
+        cls.admin = User.objects.create_superuser(email='norman@example.com', password='pass12345')
+        cls.job = Job.objects.create(
+            title='Geneticist', company=cls.company, job_type='full_time',
+            location='NYC', status='pending',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.company)
+
+    def revalidate(self, url, response, **params):
+        return self.client.get(url, params, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def approve(self):
+        self.client.force_authenticate(self.admin)
+        self.client.post('/api/admin/jobs/verify/', {'ids': [self.job.pk], 'action': 'approve'}, format='json')
+        self.client.force_authenticate(self.company)
+
+    def test_company_list_and_detail(self):
+        for url in ('/api/company/jobs/', f'/api/company/jobs/{self.job.pk}/'):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertIn('Last-Modified', first)
+                self.assertEqual(self.revalidate(url, first).status_code, 304)
+
+                self.approve()
+                self.assertEqual(self.revalidate(url, first).status_code, 200)
+                Job.objects.filter(pk=self.job.pk).update(status='pending')
+
+    def test_not_modified_list_skips_serialization(self):
+        first = self.client.get('/api/company/jobs/')
+        with self.assertNumQueries(1):
+            response = self.revalidate('/api/company/jobs/', first)
+        self.assertEqual(response.status_code, 304)
+
+    def test_public_feed_revalidates_from_cache(self):
+        self.approve()
+        first = self.client.get('/api/jobs/')
+        with self.assertNumQueries(0):
+            response = self.revalidate('/api/jobs/', first)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+        cache.clear()
+        self.assertEqual(self.revalidate('/api/jobs/', first).status_code, 304)
+
+        self.client.patch(f'/api/company/jobs/{self.job.pk}/', {'title': 'Biologist'})
+        self.assertEqual(self.revalidate('/api/jobs/', first).status_code, 200)
+
+    def test_keyset_pages_revalidate(self):
+        first = self.client.get('/api/company/jobs/', {'pagination': 'cursor'})
+        again = self.revalidate('/api/company/jobs/', first, pagination='cursor')
+        self.assertEqual(again.status_code, 304)
+
+    def test_moderation_bumps_updated_at(self):
+        before = self.job.updated_at
+        self.approve()
+        self.job.refresh_from_db()
+        self.assertGreater(self.job.updated_at, before)
+
+
+class AdminExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email='export@example.com', password='pass12345')
+        cls.company = User.objects.create_user(email='tyrell@example.com', password='pass12345')
+        other = User.objects.create_user(email='weyland@example.com', password='pass12345')
+        python = Skill.objects.create(name='Python')
+        for i in range(5):
+            job = Job.objects.create(
+                title=f'Replicant, "Nexus" {i}', company=cls.company if i % 2 else other,
+                job_type='full_time', location='LA', status='pending' if i < 3 else 'approved',
+            )
+            job.skills.add(python)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def content(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_applies_admin_filters(self):
+        response = self.client.get(
+            '/api/admin/jobs/export/', {'status': 'pending', 'company': 'tyrell@example.com'}
+        )
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual([row['title'] for row in rows], ['Replicant, "Nexus" 1'])
+        self.assertEqual(rows[0]['skills'], ['Python'])
+
+    def test_csv(self):
+        response = self.client.get('/api/admin/jobs/export/', {'output': 'csv'})
+        rows = list(csv.DictReader(io.StringIO(self.content(response))))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[4]['title'], 'Replicant, "Nexus" 4')
+        self.assertEqual(rows[4]['company_email'], 'weyland@example.com')
+
+    def test_skills_are_prefetched_once_per_chunk(self):
+        # One cursor plus one prefetch for each of the three chunks.
+        with self.assertNumQueries(4):
+            rows = list(export_rows(Job.objects.all(), chunk_size=2))
+        self.assertEqual(len(rows), 5)
+
+    def test_rejects_unknown_output(self):
+        response = self.client.get('/api/admin/jobs/export/', {'output': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+
+class AsyncPublicReadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = User.objects.create_user(
+            email='acme@example.com', password='pass12345', full_name='Acme Corp'
+        )
+        python = Skill.objects.create(name='Python')
+        django = Skill.objects.create(name='Django')
+        for i in range(12):
+            job = Job.objects.create(
+                title=f'Python Developer {i}', company=cls.company, job_type='full_time',
+                location='Kochi' if i % 2 else 'Remote', status='approved',
+            )
+            job.skills.set([python, django] if i % 3 else [django])
+        cls.pending = Job.objects.create(
+            title='Pending', company=cls.company, job_type='full_time',
+            location='Kochi', status='pending',
+        )
+
+    def setUp(self):
+        cache.clear()
+        token = str(RefreshToken.for_user(self.company).access_token)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_list_matches_sync_view(self):
+        cases = [{}, {'page': 2}, {'location': 'kochi'}, {'q': 'python developer'}, {'skill': 'py'}]
+        for params in cases:
+            with self.subTest(**params):
+                sync = self.client.get('/api/jobs/', params)
+                async_ = self.client.get('/api/jobs/async/', params)
+                self.assertEqual(async_.status_code, 200)
+                expected = json.loads(sync.content)
+                expected['next'] = expected['next'] and expected['next'].replace('/jobs/', '/jobs/async/')
+                expected['previous'] = (
+                    expected['previous'] and expected['previous'].replace('/jobs/', '/jobs/async/')
+                )
+                self.assertEqual(json.loads(async_.content), expected)
+
+    def test_list_query_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/jobs/async/')
+        # User, count, page.
+        self.assertEqual(len(queries), 3)
+
+    def test_invalid_page(self):
+        response = self.client.get('/api/jobs/async/', {'page': 9})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {'detail': 'Invalid page.'})
+
+    def test_detail(self):
+        job = Job.objects.filter(status='approved').first()
+        response = self.client.get(f'/api/jobs/{job.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], job.pk)
+        self.assertEqual(response.json()['company_name'], 'Acme Corp')
+        self.assertEqual(self.client.get(f'/api/jobs/{self.pending.pk}/').status_code, 404)
+
+    def test_requires_authentication(self):
+        self.client.credentials()
+        response = self.client.get('/api/jobs/async/')
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('WWW-Authenticate', response)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer nonsense')
+        self.assertEqual(self.client.get(f'/api/jobs/{self.pending.pk}/').status_code, 401)
+
+
+class BenchmarkCommandTests(TestCase):
+    def test_generate_dataset_and_run_benchmarks(self):
+        call_command(
+            'generate_dataset', companies=5, jobs=60, skills=30, stdout=io.StringIO()
+        )
+        self.assertEqual(Job.objects.count(), 60)
+        self.assertEqual(
+            PublicJob.objects.count(), Job.objects.filter(status='approved').count()
+        )
+        # Zipf: the most popular skill is on more jobs than the least popular.
+        counts = list(
+            Job.skills.through.objects.values('skill_id').annotate(n=Count('id'))
+            .order_by('-n').values_list('n', flat=True)
+        )
+        self.assertGreater(counts[0], counts[-1])
+
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command(
+                'run_benchmarks', repeat=2, warmup=1, only='public', output=output.name,
+                stdout=io.StringIO(), stderr=io.StringIO(),
+            )
+            results = json.load(output)
+        self.assertEqual(results['meta']['dataset']['jobs'], 60)
+        listing = results['scenarios']['public list']
+        self.assertEqual(listing['status'], 200)
+        self.assertEqual(listing['queries'], 2)
+        self.assertTrue(all(
+            set(result) >= {'p50_ms', 'p95_ms', 'p99_ms', 'queries', 'peak_kib'}
+            for result in results['scenarios'].values()
+        ))
+
+        call_command('generate_dataset', clear=True, stdout=io.StringIO())
+        self.assertFalse(Job.objects.exists())
+        self.assertFalse(PublicJob.objects.exists())
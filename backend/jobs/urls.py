@@ -1,11 +1,19 @@
 from django.urls import path
+from .async_views import public_job_detail, public_job_list
 from .views import (
     CompanyJobCreateView,
+    CompanyJobBulkCreateView,
     CompanyJobListView,
     CompanyJobDetailView,
     AdminJobListView,
+    AdminJobExportView,
     AdminJobVerifyView,
+    AdminJobBulkVerifyView,
+    AdminFeedCacheStatsView,
     PublicJobListView,
+    PublicJobFacetsView,
+    JobMatchingView,
+    SkillSuggestView,
     JobUpdateView, 
     JobDeleteView
 
@@ -14,12 +22,19 @@ from .views import (
 urlpatterns = [
     path('company/jobs/', CompanyJobListView.as_view()),
     path('company/jobs/create/', CompanyJobCreateView.as_view()),
+    path('company/jobs/bulk-create/', CompanyJobBulkCreateView.as_view()),
     path('company/jobs/<int:pk>/', CompanyJobDetailView.as_view()),
      path('job/<int:pk>/update/', JobUpdateView.as_view(), name='job-update'),
     path('job/<int:pk>/delete/', JobDeleteView.as_view(), name='job-delete'),
     path('admin/jobs/', AdminJobListView.as_view()),
+    path('admin/jobs/export/', AdminJobExportView.as_view()),
     path('admin/jobs/<int:pk>/verify/', AdminJobVerifyView.as_view()),
+    path('admin/jobs/verify/', AdminJobBulkVerifyView.as_view()),
+    path('admin/jobs/feed-cache/', AdminFeedCacheStatsView.as_view()),
      path('jobs/', PublicJobListView.as_view()),
-
-    # path('jobs/<int:pk>/', PublicJobDetailView.as_view()),
+    path('jobs/async/', public_job_list),
+    path('jobs/facets/', PublicJobFacetsView.as_view()),
+    path('jobs/matching/', JobMatchingView.as_view()),
+    path('jobs/<int:pk>/', public_job_detail),
+    path('skills/suggest/', SkillSuggestView.as_view()),
 ]
@@ -1,11 +1,29 @@
 from django.shortcuts import render
 
 # Create your views here.
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import generics,permissions
 from rest_framework.permissions import IsAuthenticated
-from .models import Job
-from .serializers import JobSerializer,PublicJobSerializer,AdminJobSerializer,CompanyJobCreateSerializer
+from rest_framework.renderers import BrowsableAPIRenderer
+from .models import Job, PublicJob
+from .serializers import PUBLIC_ROW_FIELDS, public_feed_rows
+from .serializers import JobSerializer,PublicFeedSerializer,AdminJobSerializer,CompanyJobCreateSerializer,JobBulkVerifySerializer
 from .permissions import IsCompany, IsOwnerCompany
+from .pagination import JobPagination
+from .search import filter_public_jobs
+from .signals import jobs_changed
+from core import metrics
+from core.routers import ReplicaReadMixin
+
+from . import export, facets, feed_cache, fragments, matching, suggest
+from .conditional import (
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    not_modified,
+    set_validators,
+)
 
 
 from .permissions import IsAdminUserRole
@@ -13,12 +31,14 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+
 class AdminJobListView(generics.ListAPIView):
     serializer_class = AdminJobSerializer
     permission_classes = [IsAuthenticated, IsAdminUserRole]
+    pagination_class = JobPagination
 
     def get_queryset(self):
-        queryset = Job.objects.select_related('company')
+        queryset = Job.objects.select_related('company').order_by('-created_at', '-id')
 
         status = self.request.query_params.get('status')
         company = self.request.query_params.get('company')
@@ -32,14 +52,43 @@ class AdminJobListView(generics.ListAPIView):
         return queryset
 
 
+class AdminJobExportView(AdminJobListView):
+    """
+    Stream every job matching the admin list filters as NDJSON (default) or
+    CSV (``?output=csv``).
+    """
+    pagination_class = None
+
+    def list(self, request, *args, **kwargs):
+        output = request.query_params.get('output', 'ndjson')
+        if output not in export.FORMATS:
+            return Response(
+                {"detail": f"Unsupported output '{output}'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        encode, content_type = export.FORMATS[output]
+        response = StreamingHttpResponse(
+            encode(export.export_rows(self.get_queryset())),
+            content_type=content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="jobs.{output}"'
+        return response
+
 
-class CompanyJobListView(generics.ListAPIView):
+
+class CompanyJobListView(ConditionalListMixin, generics.ListAPIView):
     serializer_class = JobSerializer
     permission_classes = [IsAuthenticated, IsCompany]
+    pagination_class = JobPagination
 
     def get_queryset(self):
-        return Job.objects.filter(company=self.request.user)
-class CompanyJobDetailView(generics.RetrieveUpdateDestroyAPIView):
+        return (
+            Job.objects.filter(company=self.request.user)
+            .prefetch_related('skills')
+            .order_by('-created_at', '-id')
+        )
+class CompanyJobDetailView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = JobSerializer
     permission_classes = [
         IsAuthenticated,
@@ -48,14 +97,20 @@ class CompanyJobDetailView(generics.RetrieveUpdateDestroyAPIView):
     ]
 
     def get_queryset(self):
-        return Job.objects.filter(company=self.request.user)
+        return Job.objects.filter(company=self.request.user).prefetch_related('skills')
+
+ACTION_STATUSES = {
+    'approve': 'approved',
+    'reject': 'rejected',
+}
+
 
 class AdminJobVerifyView(APIView):
     permission_classes = [IsAuthenticated, IsAdminUserRole]
 
     def patch(self, request, pk):
         try:
-            job = Job.objects.get(pk=pk)
+            job = Job.objects.only('id', 'status').get(pk=pk)
         except Job.DoesNotExist:
             return Response(
                 {"detail": "Job not found"},
@@ -64,17 +119,15 @@ class AdminJobVerifyView(APIView):
 
         action = request.data.get("action")
 
-        if action == "approve":
-            job.status = "approved"
-        elif action == "reject":
-            job.status = "rejected"
-        else:
+        if action not in ACTION_STATUSES:
             return Response(
                 {"detail": "Invalid action"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        job.save()
+        job.status = ACTION_STATUSES[action]
+        job.save(update_fields=['status', 'updated_at'])
+        metrics.jobs_moderated.inc(action=action)
         return Response(
             {
                 "message": f"Job {action}d successfully",
@@ -82,35 +135,255 @@ class AdminJobVerifyView(APIView):
             }
         )
 
-class PublicJobListView(generics.ListAPIView):
-    serializer_class = PublicJobSerializer
+
+class AdminJobBulkVerifyView(APIView):
+    """
+    Approve or reject many pending jobs with one conditional UPDATE. Jobs that
+    are no longer pending are left alone and reported as skipped.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUserRole]
+
+    def post(self, request):
+        serializer = JobBulkVerifySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        action = serializer.validated_data['action']
+        new_status = ACTION_STATUSES[action]
+
+        with transaction.atomic():
+            current = dict(
+                Job.objects.select_for_update()
+                .filter(pk__in=ids)
+                .values_list('pk', 'status')
+            )
+            updated = Job.objects.filter(pk__in=ids, status='pending').update(
+                status=new_status, updated_at=timezone.now()
+            )
+
+        results = []
+        updated_ids = []
+        for pk in ids:
+            if pk not in current:
+                results.append({'id': pk, 'outcome': 'not_found'})
+            elif current[pk] == 'pending':
+                updated_ids.append(pk)
+                results.append({'id': pk, 'outcome': 'updated', 'status': new_status})
+            else:
+                results.append({'id': pk, 'outcome': 'skipped', 'status': current[pk]})
+
+        if updated_ids:
+            jobs_changed.send(sender=Job, job_ids=updated_ids)
+            metrics.jobs_moderated.inc(len(updated_ids), action=action)
+        return Response({'action': action, 'updated': updated, 'results': results})
+
+class PublicJobListView(ReplicaReadMixin, ConditionalListMixin, generics.ListAPIView):
+    """
+    Served from the ``PublicJob`` read model: one table, no joins, on a
+    replica. Rows are fetched as tuples, and each job's JSON comes from the
+    fragment cache or ``public_feed_rows()``; see ``jobs.fragments``.
+    """
+    serializer_class = PublicFeedSerializer
+    renderer_classes = [fragments.FragmentJSONRenderer, BrowsableAPIRenderer]
+    pagination_class = JobPagination
 
     def get_queryset(self):
-        queryset = Job.objects.filter(status='approved')
+        queryset = PublicJob.objects.order_by('-created_at', '-id')
+        queryset = filter_public_jobs(queryset, self.request.query_params)
+        # Named rows: pagination and the validators read id/created_at/updated_at.
+        return queryset.values_list(*PUBLIC_ROW_FIELDS, named=True)
+
+    def serialize_rows(self, rows):
+        # serializer_class still documents the response schema.
+        return fragments.rendered_rows(rows)
+
+    def get_etag_extra(self):
+        # Company renames change the feed without touching Job.updated_at.
+        return feed_cache.get_version()
 
-        job_type = self.request.query_params.get('job_type')
-        location = self.request.query_params.get('location')
-        skill = self.request.query_params.get('skill')
+    def list(self, request, *args, **kwargs):
+        key = feed_cache.make_key(request)
+        cached = feed_cache.lookup(key)
+        if cached is not None:
+            data, etag, last_modified = cached
+            response = not_modified(request, etag, last_modified)
+            if response is None:
+                response = set_validators(Response(data), etag, last_modified)
+            response['X-Cache'] = 'HIT'
+            return response
 
-        if job_type:
-            queryset = queryset.filter(job_type=job_type)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            etag, last_modified = self.validators
+            feed_cache.store(key, (response.data, etag, last_modified))
+        response['X-Cache'] = 'MISS'
+        return response
 
-        if location:
-            queryset = queryset.filter(location__icontains=location)
 
-        if skill:
-            queryset = queryset.filter(skills__name__icontains=skill)
+class PublicJobFacetsView(ReplicaReadMixin, APIView):
+    """
+    Facet counts (job type, top locations, top skills) for the jobs matching
+    the public list filters. ``?limit=`` sets how many locations and skills
+    are returned. Cached like the feed and invalidated with it.
+    """
+
+    def get(self, request):
+        key = feed_cache.make_key(request, namespace='facets')
+        data = feed_cache.lookup(key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        try:
+            limit = int(request.query_params.get('limit', facets.DEFAULT_LIMIT))
+        except ValueError:
+            limit = facets.DEFAULT_LIMIT
+        limit = min(max(limit, 1), facets.MAX_LIMIT)
+
+        queryset = filter_public_jobs(Job.objects.all(), request.query_params, rank=False)
+        data = facets.facet_counts(queryset, limit=limit)
+        feed_cache.store(key, data)
+        response = Response(data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class SkillSuggestView(ReplicaReadMixin, APIView):
+    """
+    Skills whose name, or a word in it, starts with ``?prefix=``, most used
+    by approved jobs first; ``?limit=`` caps the list. Answered from the
+    in-memory index in ``jobs.suggest`` without querying the database.
+    """
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit', suggest.DEFAULT_LIMIT))
+        except ValueError:
+            limit = suggest.DEFAULT_LIMIT
+        limit = min(max(limit, 1), suggest.MAX_LIMIT)
 
-        return queryset.distinct()
+        prefix = request.query_params.get('prefix', '')
+        return Response([
+            {'name': name, 'jobs': jobs}
+            for name, jobs in suggest.index.suggest(prefix, limit)
+        ])
+
+
+class JobMatchingView(ReplicaReadMixin, APIView):
+    """
+    Approved jobs sharing skills with ``?skills=`` (comma-separated or
+    repeated), most shared skills first and newest first among equals, with
+    the number shared in ``matched_skills``. ``count`` is the number of jobs
+    sharing at least one. Ranked by the in-memory index in ``jobs.matching``;
+    only the returned rows are read from the database.
+    """
+
+    def get(self, request):
+        names = [
+            name
+            for value in request.query_params.getlist('skills')
+            for name in value.split(',')
+            if name.strip()
+        ]
+        if not names:
+            return Response(
+                {"detail": "Pass at least one skill in ?skills=."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(names) > matching.MAX_SKILLS:
+            return Response(
+                {"detail": f"At most {matching.MAX_SKILLS} skills can be matched."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = int(request.query_params.get('limit', matching.DEFAULT_LIMIT))
+        except ValueError:
+            limit = matching.DEFAULT_LIMIT
+        limit = min(max(limit, 1), matching.MAX_LIMIT)
+
+        ranked, count = matching.index.match(names, limit)
+        rows = {
+            row[0]: row
+            for row in PublicJob.objects.filter(pk__in=[job_id for job_id, _ in ranked])
+            .values_list(*PUBLIC_ROW_FIELDS)
+        }
+        # A job that left the feed since the index was updated is skipped.
+        found = [(rows[job_id], matched) for job_id, matched in ranked if job_id in rows]
+        results = public_feed_rows(row for row, _ in found)
+        for item, (_, matched) in zip(results, found):
+            item['matched_skills'] = matched
+        return Response({'count': count, 'results': results})
+
+
+class AdminFeedCacheStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminUserRole]
+
+    def get(self, request):
+        return Response(feed_cache.stats())
 
 class CompanyJobCreateView(generics.CreateAPIView):
     queryset = Job.objects.all()
     serializer_class = CompanyJobCreateSerializer
     permission_classes = [permissions.IsAuthenticated]  
 
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        metrics.jobs_created.inc()
 
-class JobUpdateView(generics.RetrieveUpdateAPIView):
-    queryset = Job.objects.all()
+
+class CompanyJobBulkCreateView(APIView):
+    """
+    Create up to ``max_batch_size`` jobs from a JSON list. Items are validated
+    independently; valid ones are written together and invalid ones are
+    reported by their index.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_batch_size = 100
+
+    def post(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"detail": "Expected a non-empty list of jobs."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > self.max_batch_size:
+            return Response(
+                {"detail": f"At most {self.max_batch_size} jobs per request."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        context = {'request': request}
+        results = [None] * len(items)
+        valid = []
+        for index, item in enumerate(items):
+            serializer = CompanyJobCreateSerializer(data=item, context=context)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = {'index': index, 'status': 'invalid', 'errors': serializer.errors}
+
+        if valid:
+            bulk = CompanyJobCreateSerializer(many=True, context=context)
+            jobs = bulk.create([data for _, data in valid])
+            for (index, _), job in zip(valid, jobs):
+                results[index] = {'index': index, 'status': 'created', 'id': job.pk}
+            metrics.jobs_created.inc(len(jobs))
+
+        if len(valid) == len(items):
+            response_status = status.HTTP_201_CREATED
+        elif valid:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {'created': len(valid), 'failed': len(items) - len(valid), 'results': results},
+            status=response_status
+        )
+
+
+class JobUpdateView(ConditionalRetrieveMixin, generics.RetrieveUpdateAPIView):
+    queryset = Job.objects.prefetch_related('skills')
     serializer_class = JobSerializer
     permission_classes = [permissions.IsAuthenticated, IsCompany, IsOwnerCompany]
 